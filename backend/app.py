@@ -1,22 +1,55 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, FileResponse, PlainTextResponse
 import uuid
 import json
-from typing import Dict, Any
+import zipfile
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 import asyncio
 from datetime import datetime
+from contextlib import asynccontextmanager
 
 from config import config
-from services.cv_parser import CVParser
+from services.cv_parser import CVParser, CVParseProgress
 from services.interview import InterviewService
 from services.voice import VoiceService
 from services.assessment import AssessmentService
 from services.report import ReportService
+from services.llm_gateway import llm_gateway
+from services.document_extractor import document_extractor
+from services.audio_store import SessionAudioStore
+from services.task_registry import SessionTaskRegistry
+from services.event_stream import EventStream
+from services.candidate_index import candidate_index
+from services.batch_ingest import BatchIngestService
+from services.prompt_compactor import prompt_compactor
+from services.metrics import metrics
+from services.tracing import ServerTimingMiddleware, slow_requests, span
 from database.supabase_client import SupabaseClient
+from database.session_store import create_session_store
+from database.write_behind import WriteBehindPersister
 from models.session import InterviewSession
 
-app = FastAPI(title="AI Recruiter Co-Pilot", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prewarm_task = None
+    if config.TTS_PREWARM:
+        prewarm_task = asyncio.create_task(voice_service.prewarm(interview_service.static_phrases()))
+    await session_store.start()
+    await persister.start()
+    yield
+    await persister.close()
+    await session_store.close()
+    if prewarm_task:
+        prewarm_task.cancel()
+    audio_store.close()
+    background_tasks.close()
+    batch_service.close()
+    document_extractor.shutdown()
+    await voice_service.close()
+    await llm_gateway.close()
+
+app = FastAPI(title="AI Recruiter Co-Pilot", version="1.0.0", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -25,77 +58,468 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Per-request stage timings (Server-Timing header and the slow-request log)
+app.add_middleware(ServerTimingMiddleware)
+
 # Initialize services
 cv_parser = CVParser()
 interview_service = InterviewService()
 voice_service = VoiceService()
 assessment_service = AssessmentService()
-report_service = ReportService()
+report_service = ReportService(assessment_service)
+audio_store = SessionAudioStore(voice_service)
+background_tasks = SessionTaskRegistry()
 db = SupabaseClient()
 
-# In-memory session storage (for MVP - replace with Redis in production)
-sessions: Dict[str, InterviewSession] = {}
+def forget_session(session_id: str):
+    """Drop everything held for a session once the store evicts it"""
+    audio_store.discard(session_id)
+    background_tasks.discard(session_id)
+    candidate_index.remove(session_id)
+
+# Live sessions (in-process LRU by default, Redis when running several workers)
+session_store = create_session_store(on_evict=forget_session)
+
+# Database writes are coalesced and flushed in the background
+persister = WriteBehindPersister(db)
+
+# Values read from the services on each scrape
+compaction_tokens = metrics.gauge(
+    "prompt_compaction_tokens", "Estimated prompt tokens before and after compaction", ("kind", "stat")
+)
+cache_lookups = metrics.gauge(
+    "cache_lookups", "Lookups in the in-process caches by outcome", ("cache", "outcome")
+)
+index_documents = metrics.gauge(
+    "index_documents", "Entries held by the in-process indexes and banks", ("index",)
+)
+
+def collect_service_metrics():
+    for kind, stats in prompt_compactor.stats().items():
+        for stat, value in stats.items():
+            compaction_tokens.set(value, kind=kind, stat=stat)
+    
+    cv_cache = cv_parser.cache
+    questions = interview_service.question_cache
+    bank = assessment_service.bank
+    for cache, outcome, value in (
+        ("cv_parse", "memory_hit", cv_cache.memory_hits), ("cv_parse", "disk_hit", cv_cache.disk_hits),
+        ("cv_parse", "miss", cv_cache.misses),
+        ("question_set", "hit", questions.hits), ("question_set", "miss", questions.misses),
+        ("question_set", "regenerate", questions.regenerations),
+        ("assessment_bank", "hit", bank.hits), ("assessment_bank", "miss", bank.misses),
+    ):
+        cache_lookups.set(value, cache=cache, outcome=outcome)
+    
+    index_documents.set(len(candidate_index), index="candidates")
+    index_documents.set(len(cv_parser.duplicates), index="near_duplicates")
+    index_documents.set(len(bank), index="assessment_bank")
+
+metrics.add_collector(collect_service_metrics)
+
+async def create_batch_session(cv_data: Dict[str, Any], questions: List[str]) -> str:
+    """Create a ready-to-interview session for a CV from a bulk upload"""
+    session = InterviewSession(
+        session_id=str(uuid.uuid4()),
+        cv_data=cv_data,
+        status="cv_uploaded",
+        questions=questions
+    )
+    session.touch("cv")
+    await session_store.save(session)
+    persister.mark_new(session)
+    candidate_index.add(session.session_id, cv_data)
+    return session.session_id
+
+# Bulk CV uploads run through their own staged pipeline
+batch_service = BatchIngestService(cv_parser, interview_service, create_batch_session)
+
+async def get_session_or_404(session_id: str) -> InterviewSession:
+    session = await session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return session
+
+async def update_session(session_id: str,
+                         mutate: Callable[[InterviewSession], Optional[bool]]) -> Optional[InterviewSession]:
+    """Apply a change to the latest copy of a session without overwriting changes made elsewhere.
+    
+    Every write to an existing session goes through here, so with the Redis
+    store concurrent requests and background work on other workers cannot
+    overwrite each other.
+    """
+    with span("session:save"):
+        session = await session_store.update(session_id, mutate)
+    if session is not None:
+        persister.mark_dirty(session)
+    return session
+
+async def score_answer(session_id: str, answer_index: int, answer: Dict[str, Any], cv_data: Dict[str, Any]):
+    """Score one recorded answer in the background and store it on the session"""
+    evaluation = await interview_service.evaluate_answer(
+        answer.get("question", ""), answer.get("answer", ""), cv_data or {}
+    )
+    
+    # Apply to the latest copy, the interview has usually moved on while the answer was scored
+    def store_evaluation(session: InterviewSession):
+        if answer_index >= len(session.answers or []):
+            return False
+        session.answers[answer_index]["evaluation"] = evaluation
+        session.touch("interview")
+    
+    await update_session(session_id, store_evaluation)
+
+async def generate_questions_from(progress: CVParseProgress,
+                                  on_question: Callable[[str], Awaitable[None]] = None) -> List[str]:
+    profile = await progress.wait_for(*InterviewService.PROFILE_FIELDS)
+    return await interview_service.generate_questions(profile, on_question)
+
+async def generate_assessment_from(progress: CVParseProgress) -> Dict[str, Any]:
+    profile = await progress.wait_for(*AssessmentService.PROFILE_FIELDS)
+    return await assessment_service.generate_assessment(profile)
+
+async def prepare_assessment(session_id: str, progress: CVParseProgress) -> Dict[str, Any]:
+    """Build the assessment in the background and store it on the session"""
+    assessment = await generate_assessment_from(progress)
+    
+    def store_assessment(session: InterviewSession):
+        if session.assessment:
+            return False
+        session.assessment = assessment
+    
+    await update_session(session_id, store_assessment)
+    return assessment
+
+async def ensure_answers_scored(session_id: str) -> InterviewSession:
+    """Wait for in-flight answer scoring and score anything that was missed"""
+    await background_tasks.wait(session_id, prefix="enrich")
+    await background_tasks.wait(session_id, prefix="score:")
+    session = await get_session_or_404(session_id)
+    
+    answers = session.answers or []
+    missing = [i for i, ans in enumerate(answers) if "evaluation" not in ans]
+    if missing:
+        evaluations = await asyncio.gather(*[
+            interview_service.evaluate_answer(
+                answers[i].get("question", ""), answers[i].get("answer", ""), session.cv_data or {}
+            )
+            for i in missing
+        ])
+        
+        def store_evaluations(latest: InterviewSession):
+            latest_answers = latest.answers or []
+            stored = False
+            for i, evaluation in zip(missing, evaluations):
+                if i < len(latest_answers) and "evaluation" not in latest_answers[i]:
+                    latest_answers[i]["evaluation"] = evaluation
+                    stored = True
+            if not stored:
+                return False
+            latest.touch("interview")
+        
+        session = await update_session(session_id, store_evaluations)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found")
+    
+    return session
 
 @app.get("/")
 async def root():
     return {"message": "AI Recruiter Co-Pilot API", "version": "1.0.0"}
 
+@app.get("/admin/slow-requests")
+async def get_slow_requests(limit: int = 20):
+    """Most recent requests over SLOW_REQUEST_THRESHOLD_MS, with their span trees.
+    
+    Database writes happen in background write-behind flushes rather than in
+    requests, so slow flushes are listed here too, with method BACKGROUND.
+    """
+    return {
+        "threshold_ms": slow_requests.threshold_ms,
+        "requests": slow_requests.entries(max(1, min(limit, 100)))
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    """Provider latency, token, fallback and cache metrics in Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/session/start")
 async def start_session():
     """Initialize a new interview session"""
     session_id = str(uuid.uuid4())
     session = InterviewSession(session_id=session_id)
-    sessions[session_id] = session
+    await session_store.save(session)
     
     # Store in database
-    await db.create_session(session.model_dump())
+    persister.mark_new(session)
     
     return {"session_id": session_id, "status": "initialized"}
 
-@app.post("/session/{session_id}/upload-cv")
-async def upload_cv(session_id: str, file: UploadFile = File(...)):
-    """Upload and parse CV"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
+async def enrich_cv(session_id: str, content: bytes, filename: str, progress: CVParseProgress,
+                    send: Callable[[str, Any], None], reuse_parse: Optional[bool] = None,
+                    provisional_stored: asyncio.Event = None) -> Dict[str, Any]:
+    """Run the model analysis of an uploaded CV and prepare the interview from it.
+    
+    provisional_stored is set once the upload request has saved the provisional
+    profile; results are only written after that, so the provisional save
+    cannot overwrite them.
+    """
+    
+    async def on_question(question: str):
+        # Start synthesizing each question's audio as soon as its text is known
+        audio_store.schedule(session_id, [question])
+        send("question", {"question": question})
+    
+    # Questions and assessment start as soon as the fields they need are parsed.
+    # The assessment is not needed until after the interview, so it keeps running in the background.
+    questions_task = asyncio.create_task(generate_questions_from(progress, on_question))
+    assessment_task = background_tasks.spawn(session_id, "assessment", prepare_assessment(session_id, progress))
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Parse CV
-        cv_data = await cv_parser.parse_cv(content, file.filename)
-        
-        # Update session
-        session = sessions[session_id]
+        cv_data = await cv_parser.parse_cv(content, filename, progress, reuse_parse)
+        send("cv_parsed", {"cv_summary": cv_data.get("summary", ""), "role_fit": cv_data.get("role_fit")})
+        questions = await questions_task
+    except Exception:
+        assessment_task.cancel()
+        if provisional_stored:
+            await provisional_stored.wait()
+        await update_session(session_id, mark_enrichment_failed)
+        raise
+    finally:
+        questions_task.cancel()
+    
+    assessment = None
+    if assessment_task.done() and not assessment_task.cancelled() and not assessment_task.exception():
+        assessment = assessment_task.result()
+    
+    # Apply to the latest copy, the provisional profile has been saved in the meantime
+    if provisional_stored:
+        await provisional_stored.wait()
+    
+    def store_analysis(session: InterviewSession):
         session.cv_data = cv_data
         session.status = "cv_uploaded"
+        session.touch("cv")
         
-        # Generate initial questions
-        questions = await interview_service.generate_questions(cv_data)
+        # Initial questions
         session.questions = questions
+        session.enrichment_status = "ready"
         session.current_question_index = 0
+        if assessment:
+            session.assessment = assessment
+    
+    if await update_session(session_id, store_analysis) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    candidate_index.add(session_id, cv_data)
+    send("questions_ready", {"questions": questions})
+    
+    # Synthesize question audio while the candidate gets ready
+    audio_store.schedule(session_id, questions)
+    
+    return {
+        "status": "success",
+        "cv_summary": cv_data.get("summary", ""),
+        "questions_generated": len(questions),
+        "reused_parse_of": cv_data.get("reused_parse_of")
+    }
+
+def mark_enrichment_failed(session: InterviewSession):
+    if session.enrichment_status != "pending":
+        return False
+    session.enrichment_status = "failed"
+
+def mark_interview_complete(session: InterviewSession):
+    session.status = "interview_complete"
+
+async def start_cv_upload(session: InterviewSession, content: bytes, filename: str,
+                          send: Callable[[str, Any], None] = None,
+                          reuse_parse: Optional[bool] = None) -> Tuple[Dict[str, Any], asyncio.Task]:
+    """Store a provisional profile for an uploaded CV and enrich it in the background.
+    
+    Returns once the document text is extracted and the local fields are known;
+    the returned task finishes the model analysis and question generation.
+    reuse_parse takes the parse of a near-duplicate earlier CV instead of
+    analyzing this one (defaults to NEAR_DUPLICATE_AUTO_REUSE).
+    """
+    send = send or (lambda event, data: None)
+    session_id = session.session_id
+    
+    # A new CV replaces any analysis still running for the previous one
+    for name in ("enrich", "assessment"):
+        previous = background_tasks.get(session_id, name)
+        if previous:
+            previous.cancel()
+    
+    progress = CVParseProgress(on_event=send)
+    provisional_stored = asyncio.Event()
+    enrichment = background_tasks.spawn(
+        session_id, "enrich",
+        enrich_cv(session_id, content, filename, progress, send, reuse_parse, provisional_stored)
+    )
+    try:
+        cv_data = await progress.wait_provisional()
         
-        # Update database
-        await db.update_session(session_id, session.model_dump())
-        
-        return {
-            "status": "success",
-            "cv_summary": cv_data.get("summary", ""),
-            "questions_generated": len(questions)
-        }
+        if not enrichment.done():
+            def store_provisional(latest: InterviewSession):
+                latest.cv_data = cv_data
+                latest.status = "cv_uploaded"
+                latest.questions = None
+                latest.enrichment_status = "pending"
+                latest.current_question_index = 0
+                latest.assessment = None
+                latest.touch("cv")
+            
+            session = await update_session(session_id, store_provisional)
+            if session is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+            candidate_index.add(session_id, cv_data)
+        elif not enrichment.cancelled() and enrichment.exception():
+            raise enrichment.exception()
+    finally:
+        provisional_stored.set()
+    
+    return {
+        "status": "success",
+        "cv_summary": cv_data.get("summary", ""),
+        "provisional": bool(cv_data.get("provisional")),
+        "profile": {
+            field: cv_data.get(field)
+            for field in ("candidate_name", "email", "phone", "skills", "technologies", "education", "experience")
+        },
+        "questions_generated": len(session.questions or []),
+        # Questions are still being generated; GET /question waits for them here and only
+        # answers "pending" when the analysis is running on another worker
+        "questions_pending": session.questions is None,
+        "near_duplicates": progress.near_duplicates
+    }, enrichment
+
+async def wait_for_enrichment(session_id: str) -> InterviewSession:
+    """Wait for background CV analysis so the session has its full profile and questions"""
+    await background_tasks.wait(session_id, prefix="enrich")
+    return await get_session_or_404(session_id)
+
+async def recover_questions(session: InterviewSession) -> InterviewSession:
+    """Generate questions from the stored profile when the background CV analysis failed"""
+    questions = await interview_service.generate_questions(session.cv_data)
+    
+    def store_questions(latest: InterviewSession):
+        if latest.questions is not None:
+            return False
+        latest.questions = questions
+        latest.current_question_index = 0
+        latest.enrichment_status = "ready"
+    
+    latest = await update_session(session.session_id, store_questions)
+    if latest is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    audio_store.schedule(session.session_id, latest.questions)
+    return latest
+
+def stream_events(session_id: str, name: str, work: Callable[[Callable[[str, Any], None]], Awaitable[Any]],
+                  error_prefix: str) -> StreamingResponse:
+    """Run work in the background and relay its progress as Server-Sent Events.
+    
+    The work is registered with the session rather than tied to the response,
+    so a client that disconnects does not lose a half-finished result.
+    """
+    events = EventStream()
+    
+    async def run():
+        try:
+            events.send("complete", await work(events.send))
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            events.send("error", {"detail": f"{error_prefix}: {detail}"})
+        finally:
+            events.close()
+    
+    background_tasks.spawn(session_id, name, run())
+    return StreamingResponse(
+        events.events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/session/{session_id}/upload-cv")
+async def upload_cv(session_id: str, file: UploadFile = File(...), reuse_parse: Optional[bool] = None):
+    """Upload and parse CV"""
+    session = await get_session_or_404(session_id)
+    
+    try:
+        # Read file content
+        content = await file.read()
+        response, _ = await start_cv_upload(session, content, file.filename, reuse_parse=reuse_parse)
+        return response
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"CV processing failed: {str(e)}")
 
+@app.post("/session/{session_id}/upload-cv/stream")
+async def upload_cv_stream(session_id: str, file: UploadFile = File(...), reuse_parse: Optional[bool] = None):
+    """Upload and parse CV, streaming progress as Server-Sent Events"""
+    session = await get_session_or_404(session_id)
+    content = await file.read()
+    
+    async def work(send: Callable[[str, Any], None]) -> Dict[str, Any]:
+        _, enrichment = await start_cv_upload(session, content, file.filename, send, reuse_parse)
+        return await asyncio.shield(enrichment)
+    
+    return stream_events(session_id, "upload", work, "CV processing failed")
+
+@app.post("/batch/upload-cvs")
+async def upload_cv_batch(files: List[UploadFile] = File(...)):
+    """Create one interview session per CV from a zip or a set of files"""
+    try:
+        job = await batch_service.submit(files)
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Uploaded zip file is not valid")
+    
+    return {
+        "job_id": job.job_id,
+        "status": job.status,
+        "files_received": len(job.files)
+    }
+
+@app.get("/batch/{job_id}")
+async def get_batch_status(job_id: str):
+    """Per-file progress and throughput of a bulk upload"""
+    job = batch_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return job.to_dict()
+
+@app.get("/candidates/search")
+async def search_candidates(q: str, mode: str = "ranked", limit: int = 20):
+    """Search parsed CVs by skill, technology, role, company or free text.
+    
+    mode=ranked matches any term; mode=boolean accepts AND, OR, NOT and parentheses.
+    Terms can be limited to a field, e.g. skill:leadership or company:"Acme Corp".
+    """
+    try:
+        results = candidate_index.search(q, mode=mode, limit=max(1, min(limit, 100)))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {"query": q, "mode": mode, **results}
+
 @app.get("/session/{session_id}/question")
 async def get_current_question(session_id: str):
     """Get current interview question"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+    session = await get_session_or_404(session_id)
+    
+    # Questions come from the CV analysis that continues after upload
+    if session.questions is None:
+        session = await wait_for_enrichment(session_id)
+    if session.questions is None:
+        if not session.cv_data:
+            raise HTTPException(status_code=400, detail="Upload a CV before starting the interview")
+        if session.enrichment_status != "failed":
+            # Still being analyzed, possibly by another worker
+            return {"status": "pending"}
+        session = await recover_questions(session)
     
     # Check if interview is already marked as complete
     if session.status == "interview_complete":
@@ -109,8 +533,7 @@ async def get_current_question(session_id: str):
         session.current_question_index >= len(session.questions) or
         answered_questions >= max_questions):
         
-        session.status = "interview_complete"
-        await db.update_session(session_id, session.model_dump())
+        await update_session(session_id, mark_interview_complete)
         return {"status": "interview_complete"}
     
     current_question = session.questions[session.current_question_index]
@@ -126,43 +549,63 @@ async def get_current_question(session_id: str):
 @app.post("/session/{session_id}/answer")
 async def submit_answer(session_id: str, answer_data: dict):
     """Submit answer to current question"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+    await get_session_or_404(session_id)
     answer_text = answer_data.get("answer", "")
-    
-    # Store answer
-    if not session.answers:
-        session.answers = []
-    
-    session.answers.append({
-        "question": session.questions[session.current_question_index],
-        "answer": answer_text,
-        "timestamp": answer_data.get("timestamp")
-    })
-    
-    # Move to next question
-    session.current_question_index += 1
-    
-    # Check if interview should be complete
-    # Limit total questions to prevent infinite loop
     max_questions = config.MAX_QUESTIONS or 8
+    recorded = {}
+    
+    def record_answer(session: InterviewSession):
+        if not session.questions or session.current_question_index >= len(session.questions):
+            return False
+        
+        # Store answer
+        if not session.answers:
+            session.answers = []
+        
+        session.answers.append({
+            "question": session.questions[session.current_question_index],
+            "answer": answer_text,
+            "timestamp": answer_data.get("timestamp")
+        })
+        session.touch("interview")
+        recorded["answer"] = dict(session.answers[-1])
+        
+        # Move to next question
+        session.current_question_index += 1
+        
+        # Check if interview should be complete
+        # Limit total questions to prevent infinite loop
+        if (session.current_question_index >= len(session.questions) or 
+            len(session.answers) >= max_questions):
+            session.status = "interview_complete"
+    
+    session = await update_session(session_id, record_answer)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if "answer" not in recorded:
+        raise HTTPException(status_code=409, detail="No question is waiting for an answer")
     answered_questions = len(session.answers)
     
-    if (session.current_question_index >= len(session.questions) or 
-        answered_questions >= max_questions):
-        session.status = "interview_complete"
-    else:
-        # Only generate follow-up if we haven't reached the limit and answer was very short
-        if (answered_questions < max_questions - 1 and 
-            len(answer_text.split()) < 15):  # Very short answer
-            follow_up = await interview_service.generate_followup(session.answers[-1])
-            if follow_up:
-                session.questions.append(follow_up)
-    
-    # Update database
-    await db.update_session(session_id, session.model_dump())
+    # Only generate follow-up if we haven't reached the limit and answer was very short
+    if (session.status != "interview_complete" and
+        answered_questions < max_questions - 1 and 
+        len(answer_text.split()) < 15):  # Very short answer
+        follow_up = await interview_service.generate_followup(recorded["answer"])
+        if follow_up:
+            def add_follow_up(latest: InterviewSession):
+                if latest.status == "interview_complete":
+                    return False
+                latest.questions.append(follow_up)
+            
+            session = await update_session(session_id, add_follow_up) or session
+            audio_store.schedule(session_id, [follow_up])
+    
+    # Score the answer while the interview continues
+    answer_index = answered_questions - 1
+    background_tasks.spawn(
+        session_id, f"score:{answer_index}",
+        score_answer(session_id, answer_index, recorded["answer"], session.cv_data)
+    )
     
     # Return whether more questions are available
     has_next = (session.current_question_index < len(session.questions) and 
@@ -179,15 +622,10 @@ async def submit_answer(session_id: str, answer_data: dict):
 @app.post("/session/{session_id}/complete-interview")
 async def complete_interview(session_id: str):
     """Manually complete the interview"""
-    if session_id not in sessions:
+    session = await update_session(session_id, mark_interview_complete)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    session.status = "interview_complete"
-    
-    # Update database
-    await db.update_session(session_id, session.model_dump())
-    
     return {
         "status": "interview_completed_manually",
         "questions_answered": len(session.answers) if session.answers else 0
@@ -196,8 +634,7 @@ async def complete_interview(session_id: str):
 @app.post("/session/{session_id}/speech-to-text")
 async def speech_to_text(session_id: str, audio: UploadFile = File(...)):
     """Convert speech to text"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    await get_session_or_404(session_id)
     
     try:
         audio_content = await audio.read()
@@ -209,10 +646,14 @@ async def speech_to_text(session_id: str, audio: UploadFile = File(...)):
 @app.get("/session/{session_id}/text-to-speech")
 async def text_to_speech(session_id: str, text: str):
     """Convert text to speech"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    await get_session_or_404(session_id)
     
     try:
+        cached_path = (await audio_store.lookup(session_id, text) or
+                       voice_service.cached_audio_path(text))
+        if cached_path:
+            return FileResponse(cached_path, media_type="audio/mpeg")
+        
         audio_stream = await voice_service.text_to_speech(text)
         if audio_stream is None:
             # TTS failed, return an error response that frontend can handle
@@ -225,63 +666,100 @@ async def text_to_speech(session_id: str, text: str):
 @app.post("/session/{session_id}/start-assessment")
 async def start_assessment(session_id: str):
     """Start role-specific assessment"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
+    session = await get_session_or_404(session_id)
     
-    session = sessions[session_id]
+    # Use the assessment prepared in the background, waiting for it if it is still being built
+    if not session.assessment:
+        await wait_for_enrichment(session_id)
+        await background_tasks.wait(session_id, prefix="assessment")
+        session = await get_session_or_404(session_id)
     
-    # Generate assessment based on CV and role
-    assessment = await assessment_service.generate_assessment(session.cv_data)
-    session.assessment = assessment
-    session.status = "assessment_active"
+    # Generate one only if background preparation never ran or failed
+    assessment = session.assessment or await assessment_service.generate_assessment(session.cv_data)
     
-    await db.update_session(session_id, session.model_dump())
+    def activate_assessment(latest: InterviewSession):
+        # Background preparation may have stored one while this was generated
+        latest.assessment = latest.assessment or assessment
+        latest.status = "assessment_active"
+        latest.touch("assessment")
+    
+    session = await update_session(session_id, activate_assessment)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    return {"assessment": assessment}
+    return {"assessment": session.assessment}
 
 @app.post("/session/{session_id}/submit-assessment")
 async def submit_assessment(session_id: str, assessment_data: dict):
     """Submit assessment solution"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    session.assessment_result = assessment_data
-    session.status = "assessment_complete"
+    def store_submission(session: InterviewSession):
+        session.assessment_result = assessment_data
+        session.status = "assessment_complete"
+        session.touch("assessment")
     
-    await db.update_session(session_id, session.model_dump())
+    if await update_session(session_id, store_submission) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
     
     return {"status": "assessment_submitted"}
 
+async def build_report(session_id: str, send: Callable[[str, Any], None] = None) -> Dict[str, Any]:
+    """Return the session's report, regenerating only what changed since the last one"""
+    send = send or (lambda event, data: None)
+    on_section = lambda name, section: send("report_section", {"name": name, "section": section})
+    session = await ensure_answers_scored(session_id)
+    
+    # Serve the stored report if nothing changed since it was generated
+    previous_report = session.final_report
+    if previous_report is None and session.status == "completed":
+        previous_report = await db.get_report(session_id)
+    if report_service.is_current(previous_report, session):
+        for name, section in previous_report.items():
+            if name not in ("session_metadata", "report_meta"):
+                on_section(name, section)
+        return previous_report
+    
+    # Generate comprehensive report, recomputing only sections whose inputs changed
+    built_from = session.version
+    report = await report_service.generate_report(session, previous_report, on_section)
+    audio_store.discard(session_id)
+    
+    # Keep the report only if no answer or submission arrived while it was generated
+    def store_report(latest: InterviewSession):
+        if latest.version != built_from:
+            return False
+        latest.final_report = report
+        latest.status = "completed"
+    
+    latest = await update_session(session_id, store_report)
+    if latest is not None and latest.version == built_from:
+        background_tasks.spawn(session_id, f"save_report:{built_from}", db.save_report(session_id, report))
+    
+    return report
+
 @app.get("/session/{session_id}/report")
 async def generate_report(session_id: str):
     """Generate final evaluation report"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
-    
-    # Generate comprehensive report
-    report = await report_service.generate_report(session)
-    session.final_report = report
-    session.status = "completed"
+    return await build_report(session_id)
+
+@app.get("/session/{session_id}/report/stream")
+async def generate_report_stream(session_id: str):
+    """Generate final evaluation report, streaming each section as Server-Sent Events"""
+    await get_session_or_404(session_id)
     
-    await db.update_session(session_id, session.dict())
+    async def work(send: Callable[[str, Any], None]) -> Dict[str, Any]:
+        report = await build_report(session_id, send)
+        return {key: report[key] for key in ("session_metadata", "report_meta")}
     
-    return report
+    return stream_events(session_id, "report", work, "Report generation failed")
 
 @app.post("/session/{session_id}/complete-interview")
 async def complete_interview(session_id: str):
     """Manually complete the interview"""
-    if session_id not in sessions:
+    session = await update_session(session_id, mark_interview_complete)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    session.status = "interview_complete"
-    
-    # Update database
-    await db.update_session(session_id, session.model_dump())
-    
     return {
         "status": "interview_completed_manually",
         "questions_answered": len(session.answers) if session.answers else 0
@@ -290,10 +768,7 @@ async def complete_interview(session_id: str):
 @app.get("/session/{session_id}/status")
 async def get_session_status(session_id: str):
     """Get current session status"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+    session = await get_session_or_404(session_id)
     return {
         "session_id": session_id,
         "status": session.status,
@@ -309,10 +784,7 @@ async def get_session_status(session_id: str):
 @app.get("/session/{session_id}/debug")
 async def debug_session(session_id: str):
     """Debug endpoint to see session state"""
-    if session_id not in sessions:
-        raise HTTPException(status_code=404, detail="Session not found")
-    
-    session = sessions[session_id]
+    session = await get_session_or_404(session_id)
     
     return {
         "session_id": session_id,
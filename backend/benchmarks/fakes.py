@@ -0,0 +1,260 @@
+"""
+In-process stand-ins for OpenAI, ElevenLabs and Supabase used by the benchmark suite
+Each fake answers with plausible payloads after a latency drawn from a configurable distribution
+"""
+
+import json
+import math
+import time
+import random
+import asyncio
+import httpx
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+# Median milliseconds and log-normal spread per provider operation, before --time-scale
+LATENCY_PROFILES = {
+    "instant": {},
+    "realistic": {
+        "chat": (6000, 0.4),
+        "stream_first_token": (900, 0.35),
+        "stream_chunk": (35, 0.3),
+        "transcribe": (1500, 0.3),
+        "tts_first_byte": (450, 0.3),
+        "db": (80, 0.35),
+    },
+}
+
+ROLES = [
+    ("Senior Frontend Developer", ["React", "TypeScript", "CSS"], ["Testing", "Agile"]),
+    ("Backend Developer", ["Python", "Django", "PostgreSQL"], ["System Design", "Testing"]),
+    ("Full Stack Developer", ["JavaScript", "Node.js", "React"], ["Agile", "Communication"]),
+    ("Junior Backend Developer", ["Java", "Spring", "MySQL"], ["Problem Solving"]),
+    ("Data Scientist", ["Python", "Pandas", "scikit-learn"], ["Machine Learning", "Data Analysis"]),
+    ("Product Manager", ["Jira", "Figma"], ["Roadmapping", "Stakeholder Management"]),
+    ("DevOps Engineer", ["Go", "Kubernetes", "Terraform"], ["CI/CD", "Security"]),
+]
+
+class LatencyModel:
+    """Samples provider latencies from log-normal distributions"""
+
+    def __init__(self, profile: str = "realistic", time_scale: float = 0.02, seed: int = 7):
+        self.distributions = LATENCY_PROFILES[profile]
+        self.time_scale = time_scale
+        self.rng = random.Random(seed)
+
+    def sample(self, operation: str) -> float:
+        """Seconds to wait for one call"""
+        if operation not in self.distributions:
+            return 0.0
+        median_ms, sigma = self.distributions[operation]
+        return median_ms * math.exp(sigma * self.rng.gauss(0, 1)) * self.time_scale / 1000
+
+    async def wait(self, operation: str):
+        delay = self.sample(operation)
+        if delay:
+            await asyncio.sleep(delay)
+
+def sample_cv(rng: random.Random, index: int) -> str:
+    """Plain-text CV with enough variety that uploads do not hit the parse cache"""
+    role, technologies, skills = rng.choice(ROLES)
+    first = rng.choice(["Alex", "Sam", "Jordan", "Priya", "Chen", "Maria", "Tomas", "Aisha"])
+    last = rng.choice(["Smith", "Kowalski", "Okafor", "Nguyen", "Garcia", "Berg", "Haddad"])
+    years = rng.randint(1, 12)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{index}@example.com | +44 20 7946 {1000 + index % 9000}",
+        "",
+        "Summary",
+        f"{role} with {years} years of experience building products with {', '.join(technologies)}.",
+        "",
+        "Experience",
+    ]
+    for job in range(rng.randint(1, 4)):
+        start = 2024 - years + job * 2
+        lines.append(f"Company {rng.randint(1, 500)}, {role}  Jan {start} - Dec {start + 2}")
+        lines.append(f"Delivered project {index}-{job} using {rng.choice(technologies)} for {rng.randint(2, 90)}k users.")
+    lines += ["", "Skills", ", ".join(technologies + skills), "", "Education", f"BSc Computer Science {2024 - years - 3}"]
+    return "\n".join(lines)
+
+class FakeOpenAI:
+    """Replacement for the AsyncOpenAI client with the same call surface the gateway uses"""
+
+    def __init__(self, latency: LatencyModel, seed: int = 7):
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create_completion))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._transcribe))
+
+    async def close(self):
+        pass
+
+    async def _create_completion(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs):
+        prompt = messages[-1]["content"]
+        kind, content = self._respond(prompt)
+        self.calls[kind] = self.calls.get(kind, 0) + 1
+        usage = SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(content) // 4)
+
+        if stream:
+            await self.latency.wait("stream_first_token")
+            return _FakeStream(content, usage, self.latency)
+
+        await self.latency.wait("chat")
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+    async def _transcribe(self, model: str, file, **kwargs):
+        self.calls["transcribe"] = self.calls.get("transcribe", 0) + 1
+        await self.latency.wait("transcribe")
+        return "I would start by profiling the slow path, then fix the biggest cost first and measure again."
+
+    def _respond(self, prompt: str):
+        if "Analyze this CV/Resume" in prompt:
+            role, technologies, skills = self.rng.choice(ROLES)
+            return "cv_analysis", json.dumps({
+                "role_fit": role,
+                "skills": skills,
+                "technologies": technologies,
+                "experience": [{"company": "Company 1", "role": role, "duration": "2019 - 2023",
+                                "description": "Built and ran customer-facing services"}],
+                "candidate_name": "Benchmark Candidate",
+                "email": "candidate@example.com",
+                "phone": "",
+                "summary": f"{role} focused on {technologies[0]}",
+                "education": [{"degree": "BSc", "institution": "University", "year": "2015"}]
+            })
+        if "generate 6-8 interview questions" in prompt:
+            return "questions", json.dumps([
+                "Tell me about a project you are proud of and your part in it.",
+                "How do you decide what to test in a new feature?",
+                "Describe a production incident you helped resolve.",
+                "How would you design a service that handles a sudden spike in traffic?",
+                "Tell me about a disagreement with a teammate and how it ended.",
+                "How do you keep up with changes in your field?"
+            ])
+        if "Create a coding assessment" in prompt:
+            return "coding_assessment", json.dumps({
+                "type": "coding",
+                "title": f"Rate Limiter {self.rng.randint(1, 10 ** 6)}",
+                "description": "Implement a token bucket rate limiter.",
+                "requirements": ["Allow bursts up to the bucket size", "Refill at a fixed rate"],
+                "example_input": "limit=5 per second",
+                "example_output": "The sixth call within a second is rejected",
+                "evaluation_criteria": ["Correctness", "Clarity"],
+                "time_limit": 45,
+                "language": "Python",
+                "starter_code": "class RateLimiter:\n    pass"
+            })
+        if "Evaluate this coding solution" in prompt:
+            return "coding_evaluation", json.dumps({
+                "correctness_score": 4, "quality_score": 4, "efficiency_score": 3,
+                "understanding_score": 4, "feedback": "Sound approach with small gaps in edge cases."
+            })
+        if "Evaluate this written response" in prompt:
+            return "written_evaluation", json.dumps({
+                "analysis_score": 4, "solution_score": 3, "communication_score": 4,
+                "overall_score": 4, "feedback": "Clear structure, metrics could be sharper."
+            })
+        if "Evaluate this interview answer" in prompt:
+            return "answer_evaluation", json.dumps({
+                "communication_score": 4, "technical_score": self.rng.randint(2, 5),
+                "problem_solving_score": 4, "professionalism_score": 5, "culture_fit_score": 4,
+                "overall_notes": "Concrete example with a measured outcome"
+            })
+        if "Summarize this candidate's interview" in prompt:
+            return "interview_feedback", json.dumps({
+                "communication": "Clear and concise.",
+                "technical": "Solid fundamentals.",
+                "problem_solving": "Structured approach.",
+                "professionalism": "Consistently professional.",
+                "culture_fit": "Collaborative."
+            })
+        return "other", "{}"
+
+class _FakeStream:
+    """Async iterator of chat completion chunks, ending with a usage-only chunk"""
+
+    CHUNK_CHARS = 12
+
+    def __init__(self, content: str, usage, latency: LatencyModel):
+        self._parts = [content[i:i + self.CHUNK_CHARS] for i in range(0, len(content), self.CHUNK_CHARS)]
+        self._usage = usage
+        self._latency = latency
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._parts:
+            await self._latency.wait("stream_chunk")
+            delta = SimpleNamespace(content=self._parts.pop(0))
+            return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        if not self._done:
+            self._done = True
+            return SimpleNamespace(choices=[], usage=self._usage)
+        raise StopAsyncIteration
+
+    async def close(self):
+        self._parts = []
+        self._done = True
+
+def fake_tts_transport(latency: LatencyModel, calls: Dict[str, int]) -> httpx.MockTransport:
+    """ElevenLabs streaming endpoint returning a short MP3-sized payload"""
+    audio = b"\xff\xfb\x90\x00" * 4096
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls["tts"] = calls.get("tts", 0) + 1
+        await latency.wait("tts_first_byte")
+        return httpx.Response(200, content=audio, headers={"Content-Type": "audio/mpeg"})
+
+    return httpx.MockTransport(handler)
+
+class FakeSupabase:
+    """Chainable query builder with the subset of the supabase-py API the app uses.
+
+    execute() runs on the database executor threads, so its latency is a
+    blocking sleep, like the real client's HTTP call.
+    """
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.calls: Dict[str, int] = {}
+        self.rows: Dict[str, Dict[str, Any]] = {}
+
+    def table(self, name: str) -> "_FakeQuery":
+        return _FakeQuery(self, name)
+
+class _FakeQuery:
+    def __init__(self, db: FakeSupabase, table: str):
+        self.db = db
+        self.table = table
+        self.operation = "select"
+        self.payload: Any = None
+
+    def insert(self, rows):
+        self.operation, self.payload = "insert", rows
+        return self
+
+    def update(self, values):
+        self.operation, self.payload = "update", values
+        return self
+
+    def select(self, *args, **kwargs):
+        return self
+
+    def __getattr__(self, name):
+        # eq, order, limit, single and other filters just narrow the query
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        self.db.calls[self.operation] = self.db.calls.get(self.operation, 0) + 1
+        delay = self.db.latency.sample("db")
+        if delay:
+            time.sleep(delay)
+        if self.operation == "insert":
+            return SimpleNamespace(data=list(self.payload))
+        if self.operation == "update":
+            return SimpleNamespace(data=[self.payload])
+        return SimpleNamespace(data=[])
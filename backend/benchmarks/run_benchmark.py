@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the interview flow
+Drives start -> upload-cv -> questions/answers -> assessment -> report through the ASGI app in process,
+with OpenAI, ElevenLabs and Supabase replaced by fakes, and reports per-endpoint latency and throughput
+
+Run from the backend directory:
+    python -m benchmarks.run_benchmark --sessions 50 --concurrency 10
+    python -m benchmarks.run_benchmark --save baseline
+    python -m benchmarks.run_benchmark --compare baseline
+
+Latencies depend on the machine, so baselines are not committed: record one on the machine
+(or CI runner) that will run the comparison, before the change being measured
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import statistics
+import shutil
+import subprocess
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# Endpoints with fewer requests than this are reported but never gate a comparison
+MIN_SAMPLES = 10
+# Below this many requests an endpoint's p90 is one or two samples, too noisy to gate on
+TAIL_MIN_SAMPLES = 50
+
+LATENCY_STATS = ("mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms")
+
+ANSWER = (
+    "In my last role I owned the checkout service. I profiled the slow endpoints, moved the "
+    "heavy work to a queue and cut p95 latency from two seconds to three hundred milliseconds, "
+    "then added alerts so we would notice if it crept back up."
+)
+SOLUTION = (
+    "class RateLimiter:\n"
+    "    def __init__(self, rate, capacity):\n"
+    "        self.rate, self.capacity = rate, capacity\n"
+    "        self.tokens, self.updated = capacity, 0.0\n"
+)
+
+def prepare_environment(args) -> str:
+    """Point the app at throwaway keys, caches and stores before config is imported"""
+    workdir = tempfile.mkdtemp(prefix="recruiter-bench-")
+    # Fakes replace every provider, but dummy keys make sure nothing real could be called
+    os.environ["OPENAI_API_KEY"] = "sk-benchmark"
+    os.environ["ELEVENLABS_API_KEY"] = "benchmark"
+    os.environ["SUPABASE_URL"] = "https://benchmark.supabase.co"
+    os.environ["SUPABASE_KEY"] = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoiYW5vbiJ9.benchmark"
+    os.environ["SESSION_STORE_BACKEND"] = "memory"
+    os.environ["TTS_PREWARM"] = "false"
+    os.environ["CV_CACHE_DIR"] = os.path.join(workdir, "cv_parse")
+    os.environ["TTS_CACHE_DIR"] = os.path.join(workdir, "tts")
+    os.environ["ASSESSMENT_BANK_PATH"] = os.path.join(workdir, "assessment_bank.json")
+    os.environ["SLOW_REQUEST_THRESHOLD_MS"] = str(10 ** 9)
+    if args.cold:
+        os.environ["QUESTION_CACHE_REUSE_RATIO"] = "0"
+    return workdir
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Stage durations in ms from a Server-Timing header, keyed by their original names"""
+    stages = {}
+    for entry in filter(None, (part.strip() for part in header.split(","))):
+        name, *params = entry.split(";")
+        duration = None
+        for param in params:
+            key, _, value = param.partition("=")
+            if key == "desc":
+                name = value.strip('"')
+            elif key == "dur":
+                duration = float(value)
+        if duration is not None and name != "total":
+            stages[name] = stages.get(name, 0.0) + duration
+    return stages
+
+class Recorder:
+    """Per-endpoint latencies, errors and Server-Timing stages"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.stages: Dict[str, Dict[str, List[float]]] = {}
+
+    async def request(self, client, method: str, endpoint: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        await response.aread()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.latencies.setdefault(endpoint, []).append(elapsed_ms)
+        if response.status_code >= 400:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+        stages = self.stages.setdefault(endpoint, {})
+        for name, duration in parse_server_timing(response.headers.get("server-timing", "")).items():
+            stages.setdefault(name, []).append(duration)
+        return response
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+            endpoints[endpoint] = {
+                "count": len(ordered),
+                "errors": self.errors.get(endpoint, 0),
+                "mean_ms": round(statistics.fmean(ordered), 2),
+                "p50_ms": round(cuts[49], 2),
+                "p90_ms": round(cuts[89], 2),
+                "p99_ms": round(cuts[98], 2),
+                "max_ms": round(ordered[-1], 2),
+                # Mean per request, so stages that only some requests ran count as zero for the rest
+                "stages_ms": {
+                    name: round(sum(durations) / len(ordered), 2)
+                    for name, durations in sorted(self.stages.get(endpoint, {}).items())
+                }
+            }
+        return endpoints
+
+async def run_session(client, recorder: Recorder, index: int, rng: random.Random, cv_text: str):
+    """One candidate's whole visit, the way the frontend drives it"""
+    response = await recorder.request(client, "POST", "POST /session/start", "/session/start")
+    session_id = response.json()["session_id"]
+    base = f"/session/{session_id}"
+
+    await recorder.request(
+        client, "POST", "POST /session/{id}/upload-cv", f"{base}/upload-cv",
+        files={"file": (f"candidate_{index}.txt", cv_text.encode(), "text/plain")}
+    )
+
+    first_question = True
+    while True:
+        response = await recorder.request(client, "GET", "GET /session/{id}/question", f"{base}/question")
+        question = response.json()
+        if response.status_code >= 400 or question.get("status") == "interview_complete":
+            break
+
+        if first_question:
+            # The frontend plays each question and records the spoken answer; sample both once per session
+            await recorder.request(
+                client, "GET", "GET /session/{id}/text-to-speech", f"{base}/text-to-speech",
+                params={"text": question["question"]}
+            )
+            await recorder.request(
+                client, "POST", "POST /session/{id}/speech-to-text", f"{base}/speech-to-text",
+                files={"audio": ("answer.webm", os.urandom(2048), "audio/webm")}
+            )
+            first_question = False
+
+        response = await recorder.request(
+            client, "POST", "POST /session/{id}/answer", f"{base}/answer",
+            json={"answer": ANSWER, "timestamp": datetime.now().isoformat()}
+        )
+        if response.status_code >= 400 or response.json().get("interview_complete"):
+            break
+
+    response = await recorder.request(client, "POST", "POST /session/{id}/start-assessment",
+                                      f"{base}/start-assessment")
+    assessment = response.json().get("assessment", {}) if response.status_code < 400 else {}
+    await recorder.request(
+        client, "POST", "POST /session/{id}/submit-assessment", f"{base}/submit-assessment",
+        json={"type": assessment.get("type", "coding"), "solution": SOLUTION, "time_taken": rng.randint(600, 2700)}
+    )
+    await recorder.request(client, "GET", "GET /session/{id}/report", f"{base}/report")
+
+async def run_benchmark(args) -> Dict[str, Any]:
+    import httpx
+    import app as backend
+    from benchmarks.fakes import LatencyModel, FakeOpenAI, FakeSupabase, fake_tts_transport, sample_cv
+
+    latency = LatencyModel(args.profile, args.time_scale, args.seed)
+    openai_fake = FakeOpenAI(latency, args.seed)
+    supabase_fake = FakeSupabase(latency)
+    tts_calls: Dict[str, int] = {}
+
+    backend.llm_gateway.client = openai_fake
+    backend.db.client = supabase_fake
+    await backend.voice_service.http.aclose()
+    backend.voice_service.http = httpx.AsyncClient(
+        base_url=backend.voice_service.elevenlabs_url,
+        transport=fake_tts_transport(latency, tts_calls)
+    )
+
+    rng = random.Random(args.seed)
+    cvs = [sample_cv(rng, index) for index in range(args.sessions)]
+    recorder = Recorder()
+    semaphore = asyncio.Semaphore(args.concurrency)
+    failures = []
+
+    async def limited(client, index: int):
+        async with semaphore:
+            try:
+                await run_session(client, recorder, index, rng, cvs[index])
+            except Exception as e:
+                failures.append(f"session {index}: {type(e).__name__}: {e}")
+
+    async with backend.app.router.lifespan_context(backend.app):
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            if args.warmup:
+                # Import-time and first-call costs should not land in the measured sessions
+                warmup = Recorder()
+                await run_session(client, warmup, -1, random.Random(0), sample_cv(random.Random(0), 10 ** 6))
+
+            started = time.perf_counter()
+            await asyncio.gather(*[limited(client, index) for index in range(args.sessions)])
+            wall_seconds = time.perf_counter() - started
+
+    endpoints = recorder.summary()
+    requests = sum(endpoint["count"] for endpoint in endpoints.values())
+    return {
+        "name": args.save or "adhoc",
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": {
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "profile": args.profile,
+            "time_scale": args.time_scale,
+            "seed": args.seed,
+            "cold": args.cold,
+            "warmup": args.warmup,
+            "repeat": 1
+        },
+        "wall_seconds": round(wall_seconds, 3),
+        "sessions_per_second": round(args.sessions / wall_seconds, 3),
+        "requests_per_second": round(requests / wall_seconds, 2),
+        "failed_sessions": failures,
+        "endpoints": endpoints,
+        "provider_calls": {
+            "openai": dict(sorted(openai_fake.calls.items())),
+            "elevenlabs": dict(tts_calls),
+            "supabase": dict(sorted(supabase_fake.calls.items()))
+        }
+    }
+
+def run_once(args) -> Dict[str, Any]:
+    """One benchmark run in this process, against throwaway caches"""
+    workdir = prepare_environment(args)
+    try:
+        return asyncio.run(run_benchmark(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def run_repeated(args) -> Dict[str, Any]:
+    """Run the benchmark args.repeat times, each in a fresh process so caches start cold every time"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="recruiter-bench-runs-") as runs_dir:
+        for run in range(args.repeat):
+            output = os.path.join(runs_dir, f"run_{run}.json")
+            command = [
+                sys.executable, "-m", "benchmarks.run_benchmark", "--repeat", "1",
+                "--sessions", str(args.sessions), "--concurrency", str(args.concurrency),
+                "--profile", args.profile, "--time-scale", str(args.time_scale),
+                "--seed", str(args.seed), "--output", output
+            ]
+            if args.cold:
+                command.append("--cold")
+            if not args.warmup:
+                command.append("--no-warmup")
+
+            print(f"   run {run + 1}/{args.repeat}...")
+            completed = subprocess.run(command, cwd=Path(__file__).parent.parent, capture_output=True, text=True)
+            if not os.path.exists(output):
+                print(completed.stdout + completed.stderr)
+                raise RuntimeError(f"Benchmark run {run + 1} exited with {completed.returncode}")
+            results.append(json.loads(Path(output).read_text()))
+    return combine(results)
+
+def combine(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One result from repeated runs: the median of every latency and rate, with counts summed"""
+    endpoints = {}
+    for endpoint in sorted({endpoint for result in results for endpoint in result["endpoints"]}):
+        runs = [result["endpoints"][endpoint] for result in results if endpoint in result["endpoints"]]
+        stages = sorted({name for run in runs for name in run["stages_ms"]})
+        endpoints[endpoint] = {
+            "count": sum(run["count"] for run in runs),
+            "errors": sum(run["errors"] for run in runs),
+            **{stat: round(statistics.median(run[stat] for run in runs), 2) for stat in LATENCY_STATS},
+            "stages_ms": {
+                name: round(statistics.median(run["stages_ms"].get(name, 0.0) for run in runs), 2)
+                for name in stages
+            }
+        }
+
+    provider_calls: Dict[str, Dict[str, int]] = {}
+    for result in results:
+        for provider, calls in result["provider_calls"].items():
+            totals = provider_calls.setdefault(provider, {})
+            for kind, count in calls.items():
+                totals[kind] = totals.get(kind, 0) + count
+
+    first = results[0]
+    return {
+        **first,
+        "settings": {**first["settings"], "repeat": len(results)},
+        "wall_seconds": round(statistics.median(result["wall_seconds"] for result in results), 3),
+        "sessions_per_second": round(statistics.median(result["sessions_per_second"] for result in results), 3),
+        "requests_per_second": round(statistics.median(result["requests_per_second"] for result in results), 2),
+        "failed_sessions": [
+            f"run {run + 1}, {failure}"
+            for run, result in enumerate(results) for failure in result["failed_sessions"]
+        ],
+        "endpoints": endpoints,
+        "provider_calls": {provider: dict(sorted(calls.items())) for provider, calls in provider_calls.items()}
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Regressions of current against baseline: latency percentiles up or throughput down beyond tolerance"""
+    regressions = []
+    if current["settings"] != baseline["settings"]:
+        print(f"⚠️  Settings differ from the baseline ({baseline['settings']}), comparison is approximate")
+
+    print(f"\n{'endpoint':<38} {'p50 base':>9} {'p50 now':>9} {'p90 base':>9} {'p90 now':>9}")
+    for endpoint, stats in current["endpoints"].items():
+        base = baseline["endpoints"].get(endpoint)
+        if base is None:
+            print(f"{endpoint:<38} {'-':>9} {stats['p50_ms']:>9} {'-':>9} {stats['p90_ms']:>9}")
+            continue
+        print(f"{endpoint:<38} {base['p50_ms']:>9} {stats['p50_ms']:>9} {base['p90_ms']:>9} {stats['p90_ms']:>9}")
+        # Per run, since each run's percentiles come only from its own requests
+        samples = min(stats["count"] / current["settings"]["repeat"], base["count"] / baseline["settings"]["repeat"])
+        if samples < MIN_SAMPLES:
+            continue
+        keys = ("p50_ms", "p90_ms") if samples >= TAIL_MIN_SAMPLES else ("p50_ms",)
+        for key in keys:
+            # Relative and absolute thresholds, so sub-millisecond endpoints do not flap on noise
+            if (stats[key] > base[key] * (1 + tolerance) and
+                    stats[key] - base[key] > min_delta_ms):
+                regressions.append(f"{endpoint} {key}: {base[key]} -> {stats[key]}")
+
+    if current["sessions_per_second"] < baseline["sessions_per_second"] * (1 - tolerance):
+        regressions.append(
+            f"sessions_per_second: {baseline['sessions_per_second']} -> {current['sessions_per_second']}"
+        )
+    return regressions
+
+def print_report(result: Dict[str, Any]):
+    settings = result["settings"]
+    print(f"\n📊 {settings['sessions']} sessions at concurrency {settings['concurrency']} "
+          f"({settings['profile']} latencies x{settings['time_scale']}) on {result['git_commit']}, "
+          f"median of {settings['repeat']} run(s)")
+    print(f"   {result['wall_seconds']}s wall, {result['sessions_per_second']} sessions/s, "
+          f"{result['requests_per_second']} requests/s")
+
+    print(f"\n{'endpoint':<38} {'count':>6} {'err':>4} {'mean':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for endpoint, stats in result["endpoints"].items():
+        print(f"{endpoint:<38} {stats['count']:>6} {stats['errors']:>4} {stats['mean_ms']:>9} "
+              f"{stats['p50_ms']:>9} {stats['p90_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}")
+
+    print(f"\nProvider calls: {json.dumps(result['provider_calls'])}")
+    for failure in result["failed_sessions"]:
+        print(f"❌ {failure}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the interview flow in process against provider fakes")
+    parser.add_argument("--sessions", type=int, default=20, help="Candidate sessions to run")
+    parser.add_argument("--concurrency", type=int, default=5, help="Sessions running at once")
+    parser.add_argument("--profile", default="realistic", choices=["realistic", "instant"],
+                        help="Provider latency distributions")
+    parser.add_argument("--time-scale", type=float, default=0.02,
+                        help="Multiplier on provider latencies (1.0 is production-like)")
+    parser.add_argument("--seed", type=int, default=7, help="Seed for CVs, fake responses and latencies")
+    parser.add_argument("--cold", action="store_true", help="Disable question set reuse")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false", help="Skip the unmeasured first session")
+    parser.add_argument("--save", metavar="NAME", help="Write the results to baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="Compare against baselines/NAME.json")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs to take the median of, each in its own process")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="Allowed relative slowdown when comparing")
+    parser.add_argument("--min-delta-ms", type=float, default=10.0,
+                        help="Slowdowns smaller than this are never regressions")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    result = run_repeated(args) if args.repeat > 1 else run_once(args)
+    if args.save:
+        result["name"] = args.save
+    print_report(result)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    if args.save:
+        BASELINE_DIR.mkdir(exist_ok=True)
+        path = BASELINE_DIR / f"{args.save}.json"
+        path.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\n💾 Saved baseline to {path}")
+
+    if args.compare:
+        baseline = json.loads((BASELINE_DIR / f"{args.compare}.json").read_text())
+        print(f"\n🔍 Comparing with {args.compare} ({baseline['git_commit']}, {baseline['created_at']})")
+        regressions = compare(result, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\n❌ Regressions:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+    if result["failed_sessions"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
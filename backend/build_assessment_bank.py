@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Offline job that fills the assessment bank
+Generates coding assessments for each (role, technology, difficulty) until every key holds --per-key items
+"""
+
+import argparse
+import asyncio
+from services.assessment import AssessmentService
+from services.assessment_bank import DIFFICULTIES
+
+# Role families and the technologies their candidates most often lead with
+DEFAULT_GRID = {
+    "Frontend Developer": ["JavaScript", "TypeScript", "React", "Angular", "Vue"],
+    "Backend Developer": ["Python", "Java", "Go", "Node.js", "C#", "PHP", "Ruby"],
+    "Full Stack Developer": ["JavaScript", "TypeScript", "Python", "React", "Node.js"],
+    "Mobile Developer": ["Swift", "Kotlin", "Java", "React Native", "Flutter"],
+    "Software Engineer": ["Python", "Java", "C++", "Go", "JavaScript", "C#", "Rust"],
+    "Data Engineer": ["Python", "Scala", "Java"],
+    "Machine Learning Engineer": ["Python"],
+    "DevOps Engineer": ["Python", "Go", "Bash"],
+}
+
+async def build_bank(grid, per_key: int, concurrency: int):
+    """Generate assessments for every key below per_key items"""
+
+    service = AssessmentService()
+    bank = service.bank
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fill(role: str, technology: str, difficulty: str):
+        # A bounded number of attempts, since duplicate titles and failed generations are not stored
+        attempts = 0
+        while bank.count(role, technology, difficulty) < per_key and attempts < per_key * 2:
+            attempts += 1
+            async with semaphore:
+                await service._generate_coding_assessment(
+                    role, [technology], difficulty, bank_role=role
+                )
+        print(f"   {role} / {technology} / {difficulty}: {bank.count(role, technology, difficulty)} items")
+
+    await asyncio.gather(*[
+        fill(role, technology, difficulty)
+        for role, technologies in grid.items()
+        for technology in technologies
+        for difficulty in DIFFICULTIES
+    ])
+
+    print(f"✅ Assessment bank at {bank.path} holds {len(bank)} items")
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill the assessment bank with pre-generated coding assessments")
+    parser.add_argument("--per-key", type=int, default=3, help="Assessments to keep per (role, technology, difficulty)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Generations running at once")
+    parser.add_argument("--role", action="append", help="Only build these roles (repeatable)")
+    parser.add_argument("--technology", action="append", help="Only build these technologies (repeatable)")
+    args = parser.parse_args()
+
+    grid = {
+        role: [tech for tech in technologies if not args.technology or tech in args.technology]
+        for role, technologies in DEFAULT_GRID.items()
+        if not args.role or role in args.role
+    }
+
+    print("🏗️  Building assessment bank")
+    asyncio.run(build_bank(grid, args.per_key, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,17 @@ class Config:
     SUPABASE_URL = os.getenv("SUPABASE_URL")
     SUPABASE_KEY = os.getenv("SUPABASE_KEY")
     
+    # Session Store
+    SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")  # memory or redis
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    SESSION_MAX_ACTIVE = int(os.getenv("SESSION_MAX_ACTIVE", "10000"))  # per process, memory backend
+    SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", str(2 * 60 * 60)))  # seconds
+    SESSION_SWEEP_INTERVAL = float(os.getenv("SESSION_SWEEP_INTERVAL", "60"))  # seconds
+    
+    # Database
+    DB_FLUSH_INTERVAL = float(os.getenv("DB_FLUSH_INTERVAL", "2"))  # seconds between write-behind flushes
+    DB_MAX_WORKERS = int(os.getenv("DB_MAX_WORKERS", "8"))
+    
     # Voice Settings
     ELEVENLABS_VOICE_ID = "21m00Tcm4TlvDq8ikWAM"  # Default voice
     
@@ -19,6 +30,78 @@ class Config:
     MAX_QUESTIONS = 8  # Maximum number of questions including follow-ups
     ASSESSMENT_TIME_LIMIT = 45  # minutes
     
+    # Reports
+    REPORT_BRANCH_TIMEOUT = float(os.getenv("REPORT_BRANCH_TIMEOUT", "45"))  # seconds per LLM evaluation branch
+    
+    # LLM Gateway
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))  # seconds per call, including queueing
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+    LLM_DEFAULT_CONCURRENCY = int(os.getenv("LLM_DEFAULT_CONCURRENCY", "16"))
+    LLM_MODEL_CONCURRENCY = {
+        "gpt-4": int(os.getenv("LLM_GPT4_CONCURRENCY", "16")),
+        "whisper-1": int(os.getenv("LLM_WHISPER_CONCURRENCY", "8")),
+    }
+    
+    # CV Parse Cache
+    CV_CACHE_DIR = os.getenv("CV_CACHE_DIR", ".cache/cv_parse")
+    CV_CACHE_MEMORY_ENTRIES = int(os.getenv("CV_CACHE_MEMORY_ENTRIES", "256"))
+    
+    # Document Extraction
+    EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 2)))
+    EXTRACTION_CPU_TIMEOUT = float(os.getenv("EXTRACTION_CPU_TIMEOUT", "10"))  # CPU seconds per document
+    EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "30"))  # wall-clock seconds per document
+    EXTRACTION_MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", "30"))
+    
+    # Server-Sent Events
+    SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))  # seconds between keep-alive comments
+    
+    # Prompt Compaction (token budgets, estimated at four characters per token)
+    PROMPT_CV_TOKEN_BUDGET = int(os.getenv("PROMPT_CV_TOKEN_BUDGET", "2500"))
+    PROMPT_ANSWER_TOKEN_BUDGET = int(os.getenv("PROMPT_ANSWER_TOKEN_BUDGET", "600"))
+    PROMPT_NOTES_TOKEN_BUDGET = int(os.getenv("PROMPT_NOTES_TOKEN_BUDGET", "600"))
+    
+    # Question Set Cache
+    QUESTION_CACHE_TTL = int(os.getenv("QUESTION_CACHE_TTL", str(7 * 24 * 3600)))  # seconds
+    QUESTION_CACHE_MAX_ENTRIES = int(os.getenv("QUESTION_CACHE_MAX_ENTRIES", "1000"))
+    QUESTION_CACHE_VARIANTS = int(os.getenv("QUESTION_CACHE_VARIANTS", "5"))  # question sets kept per profile signature
+    QUESTION_CACHE_REUSE_RATIO = float(os.getenv("QUESTION_CACHE_REUSE_RATIO", "0.8"))  # 0 disables reuse
+    QUESTION_CACHE_TOP_SKILLS = int(os.getenv("QUESTION_CACHE_TOP_SKILLS", "4"))
+    
+    # Assessment Bank
+    ASSESSMENT_BANK_PATH = os.getenv(
+        "ASSESSMENT_BANK_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "assessment_bank.json")
+    )
+    ASSESSMENT_BANK_MAX_PER_KEY = int(os.getenv("ASSESSMENT_BANK_MAX_PER_KEY", "12"))
+    
+    # Near-Duplicate Detection
+    NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))  # estimated Jaccard similarity
+    NEAR_DUPLICATE_NUM_PERM = int(os.getenv("NEAR_DUPLICATE_NUM_PERM", "128"))
+    NEAR_DUPLICATE_MAX_DOCUMENTS = int(os.getenv("NEAR_DUPLICATE_MAX_DOCUMENTS", "50000"))
+    NEAR_DUPLICATE_AUTO_REUSE = os.getenv("NEAR_DUPLICATE_AUTO_REUSE", "false").lower() == "true"
+    
+    # Batch Ingestion
+    BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+    BATCH_MAX_FILE_BYTES = int(os.getenv("BATCH_MAX_FILE_BYTES", str(10 * 1024 * 1024)))
+    BATCH_QUEUE_SIZE = int(os.getenv("BATCH_QUEUE_SIZE", "8"))  # items buffered between stages
+    BATCH_EXTRACT_CONCURRENCY = int(os.getenv("BATCH_EXTRACT_CONCURRENCY", str(os.cpu_count() or 2)))
+    BATCH_PARSE_CONCURRENCY = int(os.getenv("BATCH_PARSE_CONCURRENCY", "4"))
+    BATCH_QUESTION_CONCURRENCY = int(os.getenv("BATCH_QUESTION_CONCURRENCY", "4"))
+    BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", "50"))  # finished jobs kept for status queries
+    
+    # Request Tracing
+    SLOW_REQUEST_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "2000"))
+    SLOW_REQUEST_LOG_SIZE = int(os.getenv("SLOW_REQUEST_LOG_SIZE", "100"))
+    
+    # Text-to-Speech
+    TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", "30"))
+    TTS_MAX_CONNECTIONS = int(os.getenv("TTS_MAX_CONNECTIONS", "20"))
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", ".cache/tts")
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+    TTS_PREWARM = os.getenv("TTS_PREWARM", "true").lower() == "true"
+    TTS_PRESYNTH_CONCURRENCY = int(os.getenv("TTS_PRESYNTH_CONCURRENCY", "4"))
+    
     @classmethod
     def validate(cls):
         required = [cls.OPENAI_API_KEY, cls.ELEVENLABS_API_KEY, cls.SUPABASE_URL, cls.SUPABASE_KEY]
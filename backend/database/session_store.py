@@ -0,0 +1,242 @@
+from config import config
+from models.session import InterviewSession
+from collections import OrderedDict
+from typing import Callable, Optional, Set, Tuple
+import asyncio
+import time
+
+# Applies a change to a session in place; returning False skips the write
+SessionMutation = Callable[[InterviewSession], Optional[bool]]
+
+class SessionStore:
+    """Where live interview sessions are kept between requests"""
+
+    async def get(self, session_id: str) -> Optional[InterviewSession]:
+        raise NotImplementedError
+
+    async def save(self, session: InterviewSession):
+        raise NotImplementedError
+
+    async def delete(self, session_id: str):
+        raise NotImplementedError
+
+    async def update(self, session_id: str, mutate: SessionMutation) -> Optional[InterviewSession]:
+        """Apply mutate to the latest stored copy of a session and save it atomically.
+
+        Background work that reloads a session after a long await should use
+        this rather than get() then save(), so it cannot overwrite changes made
+        by requests in the meantime. Returns the updated session, or None if it
+        no longer exists.
+        """
+        raise NotImplementedError
+
+    async def start(self):
+        """Start any background maintenance"""
+
+    async def close(self):
+        """Stop background maintenance and release connections"""
+
+class InMemorySessionStore(SessionStore):
+    """Bounded per-process LRU with idle-TTL expiry.
+
+    Sessions are kept in access order, so both the size bound and the sweeper
+    only ever look at the least recently used end.
+    """
+
+    def __init__(self, max_sessions: int = None, idle_ttl: float = None,
+                 sweep_interval: float = None,
+                 on_evict: Callable[[str], None] = None):
+        self.max_sessions = max_sessions or config.SESSION_MAX_ACTIVE
+        self.idle_ttl = idle_ttl or config.SESSION_IDLE_TTL
+        self.sweep_interval = sweep_interval or config.SESSION_SWEEP_INTERVAL
+        self.on_evict = on_evict
+        self._sessions: "OrderedDict[str, Tuple[InterviewSession, float]]" = OrderedDict()
+        self._sweeper: asyncio.Task = None
+
+    async def get(self, session_id: str) -> Optional[InterviewSession]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+
+        session, last_access = entry
+        if time.monotonic() - last_access > self.idle_ttl:
+            self._evict(session_id)
+            return None
+
+        self._touch(session_id, session)
+        return session
+
+    async def save(self, session: InterviewSession):
+        self._touch(session.session_id, session)
+        while len(self._sessions) > self.max_sessions:
+            self._evict(next(iter(self._sessions)))
+
+    async def delete(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    async def update(self, session_id: str, mutate: SessionMutation) -> Optional[InterviewSession]:
+        # Every caller shares the stored object and nothing awaits in between, so this is already atomic
+        session = await self.get(session_id)
+        if session is not None and mutate(session) is not False:
+            await self.save(session)
+        return session
+
+    async def start(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+
+    def sweep(self) -> int:
+        """Evict every session idle for longer than the TTL"""
+        cutoff = time.monotonic() - self.idle_ttl
+        expired = 0
+        while self._sessions:
+            session_id, (_, last_access) = next(iter(self._sessions.items()))
+            if last_access > cutoff:
+                break
+            self._evict(session_id)
+            expired += 1
+        return expired
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.sweep()
+
+    def _touch(self, session_id: str, session: InterviewSession):
+        self._sessions[session_id] = (session, time.monotonic())
+        self._sessions.move_to_end(session_id)
+
+    def _evict(self, session_id: str):
+        self._sessions.pop(session_id, None)
+        if self.on_evict:
+            self.on_evict(session_id)
+
+class RedisSessionStore(SessionStore):
+    """Sessions shared across workers through any Redis-protocol server.
+
+    Each read refreshes the key's expiry, so Redis itself enforces the idle TTL.
+    Redis returns a fresh copy on every read, so read-modify-write from
+    background work goes through update(), which retries on a WATCH conflict.
+    Keys expire inside Redis without telling this worker, so a sweeper checks
+    the sessions this worker has touched and calls on_evict for the ones gone.
+    """
+
+    UPDATE_RETRIES = 10
+
+    def __init__(self, url: str = None, idle_ttl: float = None, key_prefix: str = "session:",
+                 sweep_interval: float = None, on_evict: Callable[[str], None] = None):
+        # Imported here so the in-memory backend works without the redis package
+        import redis.asyncio as redis
+        from redis.exceptions import WatchError
+
+        self.redis = redis.from_url(url or config.REDIS_URL)
+        self.idle_ttl = int(idle_ttl or config.SESSION_IDLE_TTL)
+        self.key_prefix = key_prefix
+        self.sweep_interval = sweep_interval or config.SESSION_SWEEP_INTERVAL
+        self.on_evict = on_evict
+        self._watch_error = WatchError
+        # Sessions this worker may hold local state for (audio, background tasks)
+        self._local: Set[str] = set()
+        self._sweeper: asyncio.Task = None
+
+    async def get(self, session_id: str) -> Optional[InterviewSession]:
+        key = self._key(session_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.expire(key, self.idle_ttl)
+            data, _ = await pipe.execute()
+
+        if data is None:
+            return None
+        self._local.add(session_id)
+        return InterviewSession.model_validate_json(data)
+
+    async def save(self, session: InterviewSession):
+        await self.redis.set(
+            self._key(session.session_id), session.model_dump_json(), ex=self.idle_ttl
+        )
+        self._local.add(session.session_id)
+
+    async def delete(self, session_id: str):
+        await self.redis.delete(self._key(session_id))
+        self._local.discard(session_id)
+
+    async def update(self, session_id: str, mutate: SessionMutation) -> Optional[InterviewSession]:
+        key = self._key(session_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for _ in range(self.UPDATE_RETRIES):
+                try:
+                    await pipe.watch(key)
+                    data = await pipe.get(key)
+                    if data is None:
+                        return None
+                    session = InterviewSession.model_validate_json(data)
+                    if mutate(session) is False:
+                        return session
+
+                    pipe.multi()
+                    pipe.set(key, session.model_dump_json(), ex=self.idle_ttl)
+                    await pipe.execute()
+                    self._local.add(session_id)
+                    return session
+                except self._watch_error:
+                    # Another writer changed the session; apply the change to its version instead
+                    continue
+                finally:
+                    await pipe.reset()
+        raise RuntimeError(f"Session {session_id} kept changing, update abandoned")
+
+    async def start(self):
+        if self._sweeper is None and self.on_evict:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def close(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        await self.redis.aclose()
+
+    async def sweep(self) -> int:
+        """Call on_evict for every locally known session whose key has expired"""
+        session_ids = list(self._local)
+        if not session_ids:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                pipe.exists(self._key(session_id))
+            exists = await pipe.execute()
+
+        expired = [session_id for session_id, found in zip(session_ids, exists) if not found]
+        for session_id in expired:
+            self._local.discard(session_id)
+            if self.on_evict:
+                self.on_evict(session_id)
+        return len(expired)
+
+    async def _sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"Session sweep error: {str(e)}")
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+def create_session_store(on_evict: Callable[[str], None] = None) -> SessionStore:
+    """Build the session store selected by SESSION_STORE_BACKEND"""
+    backend = config.SESSION_STORE_BACKEND.lower()
+    if backend == "redis":
+        return RedisSessionStore(on_evict=on_evict)
+    if backend == "memory":
+        return InMemorySessionStore(on_evict=on_evict)
+    raise ValueError(f"Unknown session store backend: {config.SESSION_STORE_BACKEND}")
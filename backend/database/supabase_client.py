@@ -1,21 +1,35 @@
 from supabase import create_client, Client
 from config import config
 from typing import Dict, Any, List
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
+from services.metrics import track_call
 
 class SupabaseClient:
     def __init__(self):
         self.client: Client = create_client(config.SUPABASE_URL, config.SUPABASE_KEY)
         self.sessions_table = "interview_sessions"
         self.reports_table = "evaluation_reports"
+        # Dedicated threads so database I/O never queues behind other executor work
+        self._executor = ThreadPoolExecutor(max_workers=config.DB_MAX_WORKERS, thread_name_prefix="supabase")
     
-    async def create_session(self, session_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Create new interview session"""
+    async def _execute(self, query, operation: str, table: str):
+        """Run a blocking Supabase query without stalling the event loop"""
+        loop = asyncio.get_running_loop()
+        # db.update_session -> db:update
+        stage = "db:" + operation.split(".")[-1].split("_")[0]
+        async with track_call("supabase", operation, table, stage):
+            return await loop.run_in_executor(self._executor, query.execute)
+    
+    async def create_session(self, session_data: Dict[str, Any], raise_errors: bool = False) -> Dict[str, Any]:
+        """Create new interview session; with raise_errors, failures raise instead of returning session_data"""
         try:
             # Convert datetime objects to strings
             session_data = self._serialize_data(session_data)
             
-            result = self.client.table(self.sessions_table).insert([session_data]).execute()
+            query = self.client.table(self.sessions_table).insert([session_data])
+            result = await self._execute(query, "db.create_session", self.sessions_table)
             
             if hasattr(result, 'data') and result.data:
                 return result.data[0]
@@ -24,18 +38,27 @@ class SupabaseClient:
                 
         except Exception as e:
             print(f"Database error creating session: {str(e)}")
+            if raise_errors:
+                raise
             return session_data  # Return original data as fallback
     
-    async def update_session(self, session_id: str, session_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Update existing interview session"""
+    async def update_session(self, session_id: str, session_data: Dict[str, Any],
+                             raise_errors: bool = False) -> Dict[str, Any]:
+        """Update existing interview session; with raise_errors, failures raise instead of returning session_data.
+        
+        The row is only changed while its stored version is not newer than
+        session_data's, so a stale copy from another worker never overwrites it.
+        """
         try:
             # Convert datetime objects to strings
             session_data = self._serialize_data(session_data)
             
-            result = self.client.table(self.sessions_table)\
+            query = self.client.table(self.sessions_table)\
                 .update(session_data)\
-                .eq('session_id', session_id)\
-                .execute()
+                .eq('session_id', session_id)
+            if session_data.get('version') is not None:
+                query = query.lte('version', session_data['version'])
+            result = await self._execute(query, "db.update_session", self.sessions_table)
             
             if hasattr(result, 'data') and result.data:
                 return result.data[0]
@@ -44,15 +67,17 @@ class SupabaseClient:
                 
         except Exception as e:
             print(f"Database error updating session: {str(e)}")
+            if raise_errors:
+                raise
             return session_data  # Return original data as fallback
     
     async def get_session(self, session_id: str) -> Dict[str, Any]:
         """Get interview session by ID"""
         try:
-            result = self.client.table(self.sessions_table)\
+            query = self.client.table(self.sessions_table)\
                 .select("*")\
-                .eq('session_id', session_id)\
-                .execute()
+                .eq('session_id', session_id)
+            result = await self._execute(query, "db.get_session", self.sessions_table)
             
             if hasattr(result, 'data') and result.data:
                 return result.data[0]
@@ -72,7 +97,8 @@ class SupabaseClient:
                 "created_at": report_data.get("candidate_info", {}).get("evaluation_date")
             }
             
-            result = self.client.table(self.reports_table).insert([report_record]).execute()
+            query = self.client.table(self.reports_table).insert([report_record])
+            result = await self._execute(query, "db.save_report", self.reports_table)
             
             if hasattr(result, 'data') and result.data:
                 return result.data[0]
@@ -84,12 +110,14 @@ class SupabaseClient:
             return report_record
     
     async def get_report(self, session_id: str) -> Dict[str, Any]:
-        """Get evaluation report by session ID"""
+        """Get the latest evaluation report by session ID"""
         try:
-            result = self.client.table(self.reports_table)\
+            query = self.client.table(self.reports_table)\
                 .select("*")\
                 .eq('session_id', session_id)\
-                .execute()
+                .order('created_at', desc=True)\
+                .limit(1)
+            result = await self._execute(query, "db.get_report", self.reports_table)
             
             if hasattr(result, 'data') and result.data:
                 report_json = result.data[0].get('report_data', '{}')
@@ -104,11 +132,11 @@ class SupabaseClient:
     async def list_sessions(self, limit: int = 50) -> List[Dict[str, Any]]:
         """List recent interview sessions"""
         try:
-            result = self.client.table(self.sessions_table)\
+            query = self.client.table(self.sessions_table)\
                 .select("session_id, created_at, status, candidate_name, role")\
                 .order('created_at', desc=True)\
-                .limit(limit)\
-                .execute()
+                .limit(limit)
+            result = await self._execute(query, "db.list_sessions", self.sessions_table)
             
             if hasattr(result, 'data'):
                 return result.data
@@ -127,7 +155,7 @@ class SupabaseClient:
             if hasattr(value, 'isoformat'):  # datetime objects
                 serialized[key] = value.isoformat()
             elif isinstance(value, (dict, list)):
-                serialized[key] = json.dumps(value) if key in ['cv_data', 'questions', 'answers', 'assessment', 'assessment_result', 'final_report'] else value
+                serialized[key] = json.dumps(value) if key in ['cv_data', 'questions', 'answers', 'assessment', 'assessment_result', 'final_report', 'section_versions'] else value
             else:
                 serialized[key] = value
         
@@ -148,11 +176,14 @@ class SupabaseClient:
             role VARCHAR(255),
             cv_data JSONB,
             questions JSONB,
+            enrichment_status VARCHAR(50),
             current_question_index INTEGER DEFAULT 0,
             answers JSONB,
             assessment JSONB,
             assessment_result JSONB,
-            final_report JSONB
+            final_report JSONB,
+            version INTEGER DEFAULT 0,
+            section_versions JSONB
         );
         """
         
@@ -0,0 +1,110 @@
+from config import config
+from models.session import InterviewSession
+from services.tracing import background_trace
+from typing import Dict, Set
+import asyncio
+
+class WriteBehindPersister:
+    """Coalesces session writes to the database off the request path.
+
+    Handlers mark a session dirty and return immediately. A background loop
+    writes the latest state of each dirty session once per flush interval, so
+    several mutations in one interval cost a single write. Sessions reaching a
+    final status wake the loop straight away.
+    
+    A failed write is queued again for the next flush, and a session stays
+    pending insert until its insert succeeds. Copies are ordered by
+    session.version, so an older copy never replaces a newer one in the queue
+    or, through a conditional update, in the database.
+    """
+
+    URGENT_STATUSES = {"interview_complete", "assessment_complete", "completed"}
+
+    def __init__(self, db, flush_interval: float = None):
+        self.db = db
+        self.flush_interval = flush_interval or config.DB_FLUSH_INTERVAL
+        self._dirty: Dict[str, InterviewSession] = {}
+        self._new: Set[str] = set()
+        self._wakeup: asyncio.Event = None
+        self._lock: asyncio.Lock = None
+        self._task: asyncio.Task = None
+        self._closing = False
+        self.writes = 0
+        self.coalesced = 0
+        self.failures = 0
+
+    def mark_new(self, session: InterviewSession):
+        """Queue the initial insert for a session"""
+        self._new.add(session.session_id)
+        self.mark_dirty(session)
+
+    def mark_dirty(self, session: InterviewSession, urgent: bool = False):
+        """Queue the session's current state to be written on the next flush"""
+        queued = self._dirty.get(session.session_id)
+        if queued is not None:
+            if queued.version > session.version:
+                return
+            self.coalesced += 1
+        self._dirty[session.session_id] = session
+
+        if (urgent or session.status in self.URGENT_STATUSES) and self._wakeup:
+            self._wakeup.set()
+
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._lock = asyncio.Lock()
+            self._task = asyncio.create_task(self._flush_forever())
+
+    async def close(self):
+        """Stop the background loop and write whatever is still pending"""
+        # Let an in-progress flush finish rather than cancelling it mid-write
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self):
+        """Write every dirty session now"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            pending, self._dirty = self._dirty, {}
+            if not pending:
+                return
+            # Writes run outside any request, so their db:<op> stages are traced under the flush
+            with background_trace("write-behind flush"):
+                await asyncio.gather(*[
+                    self._write(session_id, session) for session_id, session in pending.items()
+                ])
+
+    async def _write(self, session_id: str, session: InterviewSession):
+        session_data = session.model_dump()
+        try:
+            if session_id in self._new:
+                await self.db.create_session(session_data, raise_errors=True)
+                self._new.discard(session_id)
+            else:
+                await self.db.update_session(session_id, session_data, raise_errors=True)
+        except Exception as e:
+            print(f"Write-behind write error for session {session_id}, retrying on the next flush: {str(e)}")
+            self.failures += 1
+            # A copy marked while this write was in flight is newer, so it wins
+            self._dirty.setdefault(session_id, session)
+            return
+        self.writes += 1
+
+    async def _flush_forever(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"Write-behind flush error: {str(e)}")
@@ -12,6 +12,7 @@ class InterviewSession(BaseModel):
     
     # Interview Data
     questions: Optional[List[str]] = None
+    enrichment_status: Optional[str] = None  # pending, ready, failed: the background CV analysis that produces the questions
     current_question_index: int = 0
     answers: Optional[List[Dict[str, Any]]] = None
     
@@ -27,6 +28,16 @@ class InterviewSession(BaseModel):
     candidate_email: Optional[str] = None
     role: Optional[str] = None
     
+    # Change tracking (used to tell whether a cached report is still current)
+    version: int = 0
+    section_versions: Dict[str, int] = {}  # cv, interview, assessment -> version of last change
+    
+    def touch(self, *sections: str):
+        """Record a change to the given report inputs"""
+        self.version += 1
+        for section in sections:
+            self.section_versions[section] = self.version
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
@@ -1,11 +1,19 @@
-import openai
 from config import config
+from services.llm_gateway import llm_gateway
+from services.skill_taxonomy import skill_taxonomy
+from services.assessment_bank import assessment_bank, difficulty_for
+from services.metrics import fallbacks
 import json
 from typing import Dict, Any
 
 class AssessmentService:
+    # CV fields assessment generation needs before it can start
+    PROFILE_FIELDS = ("role_fit", "technologies", "experience")
+    
     def __init__(self):
-        self.client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
+        self.llm = llm_gateway
+        self.taxonomy = skill_taxonomy
+        self.bank = assessment_bank
     
     async def generate_assessment(self, cv_data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate role-specific assessment based on CV"""
@@ -14,16 +22,25 @@ class AssessmentService:
         technologies = cv_data.get('technologies', [])
         experience = cv_data.get('experience', [])
         
+        # Pre-generated assessments cover the common profiles without a model call
+        role = self.taxonomy.canonical_role(role_fit)
+        primary_tech = self.taxonomy.primary_coding_technology(technologies)
+        difficulty = difficulty_for(role_fit, experience)
+        banked = self.bank.select(role, primary_tech, difficulty)
+        if banked is not None:
+            return banked
+        
         # Determine assessment type based on role
-        if any(tech.lower() in ['python', 'javascript', 'java', 'react', 'node'] for tech in technologies):
-            return await self._generate_coding_assessment(role_fit, technologies)
+        if primary_tech:
+            return await self._generate_coding_assessment(role_fit, [primary_tech], difficulty, bank_role=role)
         elif 'product' in role_fit.lower() or 'manager' in role_fit.lower():
             return await self._generate_business_assessment(role_fit, experience)
         else:
             return await self._generate_general_assessment(role_fit, cv_data)
     
-    async def _generate_coding_assessment(self, role: str, technologies: list) -> Dict[str, Any]:
-        """Generate coding assessment"""
+    async def _generate_coding_assessment(self, role: str, technologies: list, difficulty: str = "mid",
+                                          bank_role: str = None) -> Dict[str, Any]:
+        """Generate coding assessment, adding it to the bank under bank_role when given"""
         
         primary_tech = technologies[0] if technologies else 'JavaScript'
         
@@ -31,7 +48,7 @@ class AssessmentService:
         Create a coding assessment for a {role} position focusing on {primary_tech}.
         
         Generate a practical coding problem that:
-        1. Can be completed in 30-45 minutes
+        1. Can be completed in 30-45 minutes by a {difficulty}-level candidate
         2. Tests core programming concepts
         3. Is relevant to real-world scenarios
         4. Has clear requirements and expected output
@@ -52,8 +69,10 @@ class AssessmentService:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            result = await self.llm.chat(
                 model="gpt-4",
+                operation="assessment.generate_coding_assessment",
+                stage="llm:assessment",
                 messages=[
                     {"role": "system", "content": "You are a senior technical interviewer creating practical coding assessments."},
                     {"role": "user", "content": prompt}
@@ -61,11 +80,20 @@ class AssessmentService:
                 temperature=0.7
             )
             
-            result = response.choices[0].message.content
-            return json.loads(result)
+            # Clean the result - sometimes GPT returns markdown code blocks
+            if result.startswith("```json"):
+                result = result.replace("```json", "").replace("```", "").strip()
+            elif result.startswith("```"):
+                result = result.replace("```", "").strip()
+            
+            assessment = json.loads(result)
+            if bank_role:
+                await self.bank.add(bank_role, primary_tech, difficulty, assessment)
+            return assessment
             
         except Exception as e:
             # Fallback coding assessment
+            fallbacks.inc(service="assessment", method="generate_coding_assessment")
             return {
                 "type": "coding",
                 "title": "Array Manipulation Challenge",
@@ -166,7 +194,8 @@ class AssessmentService:
     async def _evaluate_coding_submission(self, assessment: Dict[str, Any], submission: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate coding assessment submission"""
         
-        code = submission.get('code', '')
+        # The frontend submits the editor contents as 'solution'
+        code = submission.get('code') or submission.get('solution', '')
         
         prompt = f"""
         Evaluate this coding solution:
@@ -183,12 +212,21 @@ class AssessmentService:
         - Efficiency
         - Problem Understanding
         
-        Return JSON with scores and feedback.
+        Return JSON with scores and feedback:
+        {{
+            "correctness_score": 4,
+            "quality_score": 3,
+            "efficiency_score": 4,
+            "understanding_score": 4,
+            "feedback": "Constructive feedback on the solution"
+        }}
         """
         
         try:
-            response = self.client.chat.completions.create(
+            result = await self.llm.chat(
                 model="gpt-4",
+                operation="assessment.evaluate_coding_submission",
+                stage="llm:assessment_eval",
                 messages=[
                     {"role": "system", "content": "You are a technical assessor. Provide constructive feedback."},
                     {"role": "user", "content": prompt}
@@ -196,10 +234,16 @@ class AssessmentService:
                 temperature=0.3
             )
             
-            result = response.choices[0].message.content
+            # Clean the result - sometimes GPT returns markdown code blocks
+            if result.startswith("```json"):
+                result = result.replace("```json", "").replace("```", "").strip()
+            elif result.startswith("```"):
+                result = result.replace("```", "").strip()
+            
             return json.loads(result)
             
         except Exception as e:
+            fallbacks.inc(service="assessment", method="evaluate_coding_submission")
             return {
                 "correctness_score": 3,
                 "quality_score": 3,
@@ -211,10 +255,60 @@ class AssessmentService:
     async def _evaluate_written_submission(self, assessment: Dict[str, Any], submission: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate written assessment submission"""
         
-        return {
+        response_text = submission.get('solution') or submission.get('response', '')
+        
+        prompt = f"""
+        Evaluate this written response to a {assessment.get('type', 'analytical')} assessment:
+        
+        Problem: {assessment.get('title', '')}
+        Scenario: {json.dumps(assessment.get('scenario', {}))}
+        Requirements: {assessment.get('requirements', [])}
+        
+        Candidate Response:
+        {response_text}
+        
+        Rate on scale 1-5 for:
+        - Problem Analysis
+        - Solution Quality
+        - Communication
+        - Overall
+        
+        Return JSON with scores and feedback:
+        {{
             "analysis_score": 4,
-            "solution_score": 4,
+            "solution_score": 3,
             "communication_score": 4,
             "overall_score": 4,
-            "feedback": "Well-structured response with clear reasoning. Good problem identification and practical solutions."
-        }
\ No newline at end of file
+            "feedback": "Constructive feedback on the response"
+        }}
+        """
+        
+        try:
+            result = await self.llm.chat(
+                model="gpt-4",
+                operation="assessment.evaluate_written_submission",
+                stage="llm:assessment_eval",
+                messages=[
+                    {"role": "system", "content": "You are a business and analytical skills assessor. Provide constructive feedback."},
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.3
+            )
+            
+            # Clean the result - sometimes GPT returns markdown code blocks
+            if result.startswith("```json"):
+                result = result.replace("```json", "").replace("```", "").strip()
+            elif result.startswith("```"):
+                result = result.replace("```", "").strip()
+            
+            return json.loads(result)
+            
+        except Exception as e:
+            fallbacks.inc(service="assessment", method="evaluate_written_submission")
+            return {
+                "analysis_score": 3,
+                "solution_score": 3,
+                "communication_score": 3,
+                "overall_score": 3,
+                "feedback": "Assessment evaluation failed - manual review required"
+            }
\ No newline at end of file
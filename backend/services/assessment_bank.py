@@ -0,0 +1,152 @@
+from config import config
+import os
+import re
+import copy
+import json
+import uuid
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+BANK_FORMAT = 1
+
+DIFFICULTIES = ("junior", "mid", "senior")
+SENIORITY_WORDS = {
+    "junior": ("junior", "jr", "intern", "graduate", "entry", "trainee", "associate"),
+    "senior": ("senior", "sr", "lead", "principal", "staff", "head", "architect", "director"),
+}
+
+# Fields a bank item must have to be served, per assessment type
+REQUIRED_FIELDS = {
+    "coding": ("title", "description", "requirements", "language"),
+    "business_case": ("title", "description", "scenario", "requirements"),
+    "analytical": ("title", "description", "scenario", "requirements"),
+}
+
+def difficulty_for(role: str, experience: list = None) -> str:
+    """Difficulty from the role's seniority words, else from the number of past positions"""
+    words = set(re.findall(r"[a-z]+", str(role or "").lower()))
+    for difficulty, markers in SENIORITY_WORDS.items():
+        if words & set(markers):
+            return difficulty
+    positions = len(experience or [])
+    if positions <= 1:
+        return "junior"
+    return "mid" if positions <= 3 else "senior"
+
+class AssessmentBank:
+    """Pre-generated assessments indexed by (canonical role, primary technology, difficulty).
+
+    The whole bank is a dict of lists loaded from one JSON file, so selection
+    is a dictionary probe plus a per-key cursor that rotates through the
+    items. New items are appended by the offline build script and by the
+    generation miss path, and the file is rewritten atomically.
+    """
+
+    def __init__(self, path: str = None, max_per_key: int = None):
+        self.path = path or config.ASSESSMENT_BANK_PATH
+        self.max_per_key = max_per_key or config.ASSESSMENT_BANK_MAX_PER_KEY
+        self._items: Dict[str, List[Dict[str, Any]]] = self._load()
+        self._cursors: Dict[str, int] = {}
+        self._write_lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._items.values())
+
+    @staticmethod
+    def key(role: str, technology: Optional[str], difficulty: str) -> str:
+        return f"{role}|{technology or '-'}|{difficulty}"
+
+    @staticmethod
+    def validate(assessment: Dict[str, Any]) -> bool:
+        """Whether an assessment has every field its type needs to be served as-is"""
+        if not isinstance(assessment, dict):
+            return False
+        required = REQUIRED_FIELDS.get(assessment.get("type"))
+        return bool(required) and all(assessment.get(field) for field in required)
+
+    def count(self, role: str, technology: Optional[str], difficulty: str) -> int:
+        return len(self._items.get(self.key(role, technology, difficulty), ()))
+
+    def select(self, role: str, technology: Optional[str], difficulty: str) -> Optional[Dict[str, Any]]:
+        """The next banked assessment for the key, rotating so consecutive candidates get different tasks"""
+        key = self.key(role, technology, difficulty)
+        items = self._items.get(key)
+        if not items:
+            self.misses += 1
+            return None
+
+        cursor = self._cursors.get(key, 0)
+        self._cursors[key] = cursor + 1
+        self.hits += 1
+        return copy.deepcopy(items[cursor % len(items)])
+
+    async def add(self, role: str, technology: Optional[str], difficulty: str,
+                  assessment: Dict[str, Any]) -> bool:
+        """Store a validated assessment under the key; returns False if it was rejected"""
+        if not self.validate(assessment):
+            return False
+
+        key = self.key(role, technology, difficulty)
+        items = self._items.setdefault(key, [])
+        title = str(assessment.get("title", "")).strip().lower()
+        if any(str(item.get("title", "")).strip().lower() == title for item in items):
+            return False
+        if len(items) >= self.max_per_key:
+            return False
+
+        items.append({**copy.deepcopy(assessment), "difficulty": difficulty})
+        async with self._write_lock:
+            snapshot = copy.deepcopy(self._items)
+            try:
+                await asyncio.to_thread(self._write, snapshot)
+            except OSError as e:
+                print(f"Assessment bank write error: {str(e)}")
+        return True
+
+    def keys(self) -> List[Tuple[str, str, str]]:
+        return [tuple(key.split("|")) for key in self._items]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "keys": len(self._items),
+            "items": len(self),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Assessment bank load error: {str(e)}")
+            return {}
+
+        if data.get("format") != BANK_FORMAT:
+            print(f"Assessment bank {self.path} has an unknown format, ignoring it")
+            return {}
+        return {
+            key: [item for item in items if self.validate(item)]
+            for key, items in data.get("items", {}).items()
+        }
+
+    def _write(self, items: Dict[str, List[Dict[str, Any]]]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Unique per writer, so workers saving at the same time never share a temp file
+        temp_path = f"{self.path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"format": BANK_FORMAT, "items": items}, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+assessment_bank = AssessmentBank()
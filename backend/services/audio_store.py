@@ -0,0 +1,70 @@
+from config import config
+import os
+import asyncio
+from typing import Dict, List, Optional
+
+class SessionAudioStore:
+    """Pre-synthesized interview audio, tracked per session.
+
+    Each scheduled text is synthesized once into the TTS cache in the
+    background; concurrent requests for the same text share one task.
+    """
+
+    def __init__(self, voice_service, concurrency: int = None):
+        self.voice = voice_service
+        self.concurrency = concurrency or config.TTS_PRESYNTH_CONCURRENCY
+        self._semaphore: asyncio.Semaphore = None
+        self._sessions: Dict[str, Dict[str, asyncio.Task]] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def schedule(self, session_id: str, texts: List[str]):
+        """Start synthesizing texts for a session without waiting"""
+        clips = self._sessions.setdefault(session_id, {})
+        for text in texts:
+            if text and text not in clips:
+                clips[text] = self._task_for(text)
+
+    async def lookup(self, session_id: str, text: str) -> Optional[str]:
+        """Cached clip path for a scheduled text, waiting if it is still in flight"""
+        task = self._sessions.get(session_id, {}).get(text)
+        if task is None:
+            return None
+
+        try:
+            # Shielded so a dropped client does not cancel shared synthesis
+            path = await asyncio.shield(task)
+        except Exception:
+            return None
+
+        if path and os.path.exists(path):
+            return path
+        return None
+
+    def discard(self, session_id: str):
+        """Forget a session's clips; the audio itself stays in the TTS cache"""
+        self._sessions.pop(session_id, None)
+
+    def close(self):
+        """Cancel synthesis still in flight"""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._sessions.clear()
+
+    def _task_for(self, text: str) -> asyncio.Task:
+        key = self.voice.cache.normalize_text(text)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._synthesize(text))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    async def _synthesize(self, text: str) -> Optional[str]:
+        cached_path = self.voice.cached_audio_path(text)
+        if cached_path:
+            return cached_path
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            return await self.voice.synthesize_to_cache(text)
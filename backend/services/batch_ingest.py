@@ -0,0 +1,305 @@
+from config import config
+import os
+import time
+import uuid
+import shutil
+import asyncio
+import zipfile
+import tempfile
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+SUPPORTED_EXTENSIONS = (".pdf", ".txt")
+
+def _spool_uploads(uploads: List[Any], dest_dir: str, max_files: int, max_file_bytes: int) -> List["BatchFile"]:
+    """Copy uploaded CVs (or the members of uploaded zips) to files in dest_dir.
+
+    Runs in a worker thread. Files are copied in chunks, so no CV is ever held
+    in memory as a whole here.
+    """
+    files = []
+
+    def add(name: str, source, size: Optional[int]):
+        batch_file = BatchFile(os.path.basename(name))
+        files.append(batch_file)
+        if not batch_file.filename.lower().endswith(SUPPORTED_EXTENSIONS):
+            batch_file.fail("unsupported file type")
+            return
+        if size is not None and size > max_file_bytes:
+            batch_file.fail(f"file larger than {max_file_bytes} bytes")
+            return
+        batch_file.path = os.path.join(dest_dir, f"{len(files)}_{uuid.uuid4().hex}")
+        with open(batch_file.path, "wb") as out:
+            shutil.copyfileobj(source, out, 64 * 1024)
+
+    for upload in uploads:
+        if len(files) >= max_files:
+            break
+        if upload.filename.lower().endswith(".zip"):
+            with zipfile.ZipFile(upload.file) as archive:
+                for member in archive.infolist():
+                    if len(files) >= max_files:
+                        break
+                    if member.is_dir() or member.filename.startswith("__MACOSX/"):
+                        continue
+                    with archive.open(member) as source:
+                        add(member.filename, source, member.file_size)
+        else:
+            upload.file.seek(0, os.SEEK_END)
+            size = upload.file.tell()
+            upload.file.seek(0)
+            add(upload.filename, upload.file, size)
+
+    return files
+
+class BatchFile:
+    """One CV moving through the ingestion pipeline"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.path: Optional[str] = None
+        self.status = "queued"
+        self.session_id: Optional[str] = None
+        self.error: Optional[str] = None
+        self.cache_hit = False
+        self.near_duplicates: List[Dict[str, Any]] = []
+        self.timings: Dict[str, float] = {}
+        # Intermediate results, dropped as soon as the next stage has used them
+        self.cache_key: Optional[str] = None
+        self.text_content: Optional[str] = None
+        self.signature: Optional[List[int]] = None
+        self.cv_data: Optional[Dict[str, Any]] = None
+
+    def fail(self, error: str):
+        self.status = "failed"
+        self.error = error
+        self.text_content = None
+        self.cv_data = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filename": self.filename,
+            "status": self.status,
+            "session_id": self.session_id,
+            "error": self.error,
+            "cache_hit": self.cache_hit,
+            "near_duplicates": self.near_duplicates,
+            "timings": {stage: round(seconds, 3) for stage, seconds in self.timings.items()}
+        }
+
+class BatchJob:
+    """Progress of one bulk upload"""
+
+    def __init__(self, job_id: str, files: List[BatchFile], temp_dir: str):
+        self.job_id = job_id
+        self.files = files
+        self.temp_dir = temp_dir
+        self.status = "running"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._started = time.monotonic()
+        self._elapsed: Optional[float] = None
+
+    def finish(self):
+        self.status = "completed"
+        self.finished_at = time.time()
+        self._elapsed = time.monotonic() - self._started
+
+    def to_dict(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for batch_file in self.files:
+            counts[batch_file.status] = counts.get(batch_file.status, 0) + 1
+
+        elapsed = self._elapsed if self._elapsed is not None else time.monotonic() - self._started
+        processed = counts.get("done", 0) + counts.get("failed", 0)
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "total_files": len(self.files),
+            "processed_files": processed,
+            "status_counts": counts,
+            "elapsed_seconds": round(elapsed, 2),
+            "files_per_minute": round(processed / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "files": [batch_file.to_dict() for batch_file in self.files]
+        }
+
+class BatchIngestService:
+    """Turns a bulk upload into interview sessions through a staged pipeline.
+
+    Extraction, CV analysis and question generation each run with their own
+    worker count, connected by bounded queues so a slow stage holds back the
+    ones before it instead of letting intermediate results pile up.
+    """
+
+    def __init__(self, cv_parser, interview_service,
+                 create_session: Callable[[Dict[str, Any], List[str]], Awaitable[str]]):
+        self.cv_parser = cv_parser
+        self.interview = interview_service
+        self.create_session = create_session
+        self.jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, uploads: List[Any]) -> BatchJob:
+        """Spool the uploads to disk and start processing them in the background"""
+        temp_dir = tempfile.mkdtemp(prefix="cv_batch_")
+        try:
+            files = await asyncio.to_thread(
+                _spool_uploads, uploads, temp_dir, config.BATCH_MAX_FILES, config.BATCH_MAX_FILE_BYTES
+            )
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        job = BatchJob(str(uuid.uuid4()), files, temp_dir)
+        self.jobs[job.job_id] = job
+        self._forget_old_jobs()
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self.jobs.get(job_id)
+
+    def close(self):
+        for task in list(self._tasks.values()):
+            task.cancel()
+
+    async def _run(self, job: BatchJob):
+        extract_queue: asyncio.Queue = asyncio.Queue(config.BATCH_QUEUE_SIZE)
+        parse_queue: asyncio.Queue = asyncio.Queue(config.BATCH_QUEUE_SIZE)
+        question_queue: asyncio.Queue = asyncio.Queue(config.BATCH_QUEUE_SIZE)
+
+        stages = [
+            (extract_queue, parse_queue, self._extract, config.BATCH_EXTRACT_CONCURRENCY),
+            (parse_queue, question_queue, self._parse, config.BATCH_PARSE_CONCURRENCY),
+            (question_queue, None, self._generate_questions, config.BATCH_QUESTION_CONCURRENCY),
+        ]
+        workers = [
+            [asyncio.create_task(self._worker(inbox, outbox, handler)) for _ in range(count)]
+            for inbox, outbox, handler, count in stages
+        ]
+
+        try:
+            for batch_file in job.files:
+                if batch_file.status != "failed":
+                    await extract_queue.put(batch_file)
+
+            # Close each stage once everything before it has drained
+            for (inbox, _, _, count), stage_workers in zip(stages, workers):
+                for _ in range(count):
+                    await inbox.put(None)
+                await asyncio.gather(*stage_workers)
+        finally:
+            for stage_workers in workers:
+                for worker in stage_workers:
+                    worker.cancel()
+            shutil.rmtree(job.temp_dir, ignore_errors=True)
+            job.finish()
+
+    async def _worker(self, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                      handler: Callable[[BatchFile], Awaitable[None]]):
+        while True:
+            batch_file = await inbox.get()
+            if batch_file is None:
+                return
+
+            try:
+                await handler(batch_file)
+            except Exception as e:
+                print(f"Batch ingestion error for {batch_file.filename}: {str(e)}")
+                batch_file.fail(str(e))
+
+            if outbox is not None and batch_file.status != "failed":
+                await outbox.put(batch_file)
+
+    async def _extract(self, batch_file: BatchFile):
+        batch_file.status = "extracting"
+        started = time.monotonic()
+        try:
+            file_content = await asyncio.to_thread(_read_file, batch_file.path)
+            batch_file.cache_key = self.cv_parser.cache.key(file_content)
+
+            cached = await self.cv_parser.cached_parse(batch_file.cache_key, batch_file.filename)
+            if cached is not None:
+                batch_file.cache_hit = True
+                batch_file.cv_data = cached
+                earlier = self.cv_parser.duplicates.get(batch_file.cache_key)
+                if earlier is not None:
+                    batch_file.near_duplicates = [{"document_id": batch_file.cache_key, "similarity": 1.0, **earlier}]
+            else:
+                batch_file.text_content = await self.cv_parser.extractor.extract_text(
+                    file_content, batch_file.filename
+                )
+                await self._check_duplicates(batch_file)
+        finally:
+            await asyncio.to_thread(_remove_file, batch_file.path)
+            batch_file.timings["extract"] = time.monotonic() - started
+
+    async def _check_duplicates(self, batch_file: BatchFile):
+        """Match the extracted text against earlier CVs and index it straight away.
+
+        Indexing before the model parse lets duplicates within the same bulk
+        upload find each other; the entry gets the parsed details once known.
+        """
+        batch_file.signature = await self.cv_parser.near_duplicate_signature(batch_file.text_content)
+        if batch_file.signature is None:
+            return
+        batch_file.near_duplicates = self.cv_parser.duplicates.query(
+            batch_file.signature, exclude=batch_file.cache_key
+        )
+        self.cv_parser.index_near_duplicate(
+            batch_file.cache_key, batch_file.signature, {"original_filename": batch_file.filename}
+        )
+
+    async def _parse(self, batch_file: BatchFile):
+        if batch_file.cv_data is not None:
+            return
+
+        batch_file.status = "parsing"
+        started = time.monotonic()
+        parsed = False
+        try:
+            batch_file.cv_data = await self.cv_parser.analyze_text(
+                batch_file.text_content, batch_file.filename, batch_file.cache_key
+            )
+            batch_file.text_content = None
+            parsed = not batch_file.cv_data.get("error")
+        finally:
+            if batch_file.signature is not None:
+                # Only CVs with a stored parse stay matchable, as in the single-upload path
+                if parsed:
+                    self.cv_parser.index_near_duplicate(
+                        batch_file.cache_key, batch_file.signature, batch_file.cv_data
+                    )
+                else:
+                    self.cv_parser.duplicates.remove(batch_file.cache_key)
+                batch_file.signature = None
+            batch_file.timings["parse"] = time.monotonic() - started
+
+    async def _generate_questions(self, batch_file: BatchFile):
+        batch_file.status = "generating_questions"
+        started = time.monotonic()
+        try:
+            questions = await self.interview.generate_questions(batch_file.cv_data)
+            batch_file.session_id = await self.create_session(batch_file.cv_data, questions)
+            batch_file.cv_data = None
+            batch_file.status = "done"
+        finally:
+            batch_file.timings["questions"] = time.monotonic() - started
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.status == "completed"]
+        for job_id in finished[:max(0, len(self.jobs) - config.BATCH_MAX_JOBS)]:
+            del self.jobs[job_id]
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
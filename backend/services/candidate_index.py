@@ -0,0 +1,264 @@
+import re
+import math
+import time
+import heapq
+from collections import Counter
+from typing import Any, Dict, List, Optional, Set, Tuple
+from services.skill_taxonomy import SkillTaxonomy, skill_taxonomy, normalize
+
+# Indexed fields and how much a match in each counts towards the ranking
+FIELD_WEIGHTS = {
+    "skill": 3.0,
+    "technology": 3.0,
+    "role": 2.0,
+    "company": 1.5,
+    "text": 1.0,
+}
+FIELD_ALIASES = {
+    "skills": "skill", "tech": "technology", "technologies": "technology",
+    "role_fit": "role", "companies": "company",
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+QUERY_PATTERN = re.compile(r'\(|\)|(?:[A-Za-z_]+:)?"[^"]*"|[^\s()]+')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+class CandidateIndex:
+    """In-process inverted index over parsed CVs, keyed by session id.
+
+    Each field keeps its own posting lists (term -> {session_id: term
+    frequency}) and document lengths, so queries only touch the postings of
+    their terms and are ranked with BM25 summed over fields.
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy = None):
+        self.taxonomy = taxonomy or skill_taxonomy
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {field: {} for field in FIELD_WEIGHTS}
+        self._lengths: Dict[str, Dict[str, int]] = {field: {} for field in FIELD_WEIGHTS}
+        self._total_lengths: Dict[str, int] = {field: 0 for field in FIELD_WEIGHTS}
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        # Distinct terms per document and field, so removal only visits its own postings
+        self._document_fields: Dict[str, Dict[str, Set[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, session_id: str, cv_data: Dict[str, Any]):
+        """Index a session's CV, replacing whatever was indexed for it before"""
+        self.remove(session_id)
+
+        fields = self._document_terms(cv_data)
+        for field, terms in fields.items():
+            counts = Counter(terms)
+            postings = self._postings[field]
+            for term, count in counts.items():
+                postings.setdefault(term, {})[session_id] = count
+            self._lengths[field][session_id] = len(terms)
+            self._total_lengths[field] += len(terms)
+
+        self._documents[session_id] = {
+            "candidate_name": cv_data.get("candidate_name", "Unknown"),
+            "role_fit": cv_data.get("role_fit", "General"),
+            "provisional": bool(cv_data.get("provisional")),
+            "indexed_at": time.time()
+        }
+        self._document_fields[session_id] = {field: set(terms) for field, terms in fields.items()}
+
+    def remove(self, session_id: str):
+        if self._documents.pop(session_id, None) is None:
+            return
+
+        for field in FIELD_WEIGHTS:
+            length = self._lengths[field].pop(session_id, 0)
+            self._total_lengths[field] -= length
+        for field, terms in self._document_fields.pop(session_id).items():
+            postings = self._postings[field]
+            for term in terms:
+                docs = postings.get(term)
+                if docs is not None:
+                    docs.pop(session_id, None)
+                    if not docs:
+                        del postings[term]
+
+    def search(self, query: str, mode: str = "ranked", limit: int = 20) -> Dict[str, Any]:
+        """Run a ranked (any term) or boolean (AND/OR/NOT, parentheses) query"""
+        started = time.perf_counter()
+        tokens = QUERY_PATTERN.findall(query or "")
+
+        if mode == "boolean":
+            parser = _BooleanQuery(tokens, self)
+            matches = parser.parse()
+            atoms = parser.positive_atoms
+        elif mode == "ranked":
+            atoms = [self._atom(token) for token in tokens if token.upper() not in ("AND", "OR", "NOT")]
+            matches = None
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        scores = self._score(atoms, matches)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+        return {
+            "total": len(scores),
+            "took_ms": round((time.perf_counter() - started) * 1000, 3),
+            "results": [
+                {
+                    "session_id": session_id,
+                    "score": round(score, 4),
+                    "candidate_name": self._documents[session_id]["candidate_name"],
+                    "role_fit": self._documents[session_id]["role_fit"],
+                    "provisional": self._documents[session_id]["provisional"]
+                }
+                for session_id, score in top
+            ]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self._documents),
+            "terms": {field: len(postings) for field, postings in self._postings.items()}
+        }
+
+    def _document_terms(self, cv_data: Dict[str, Any]) -> Dict[str, List[str]]:
+        companies = " ".join(
+            str(job.get("company", "")) for job in cv_data.get("experience") or [] if isinstance(job, dict)
+        )
+        fields = {
+            "skill": [normalize(name) for name in self.taxonomy.canonicalize(cv_data.get("skills") or [])],
+            "technology": [normalize(name) for name in self.taxonomy.canonicalize(cv_data.get("technologies") or [])],
+            "role": self._tokenize(cv_data.get("role_fit", "")),
+            "company": self._tokenize(companies),
+            "text": self._tokenize(f"{cv_data.get('summary', '')} {cv_data.get('raw_text', '')}"),
+        }
+        return fields
+
+    def _tokenize(self, text: str) -> List[str]:
+        tokens = []
+        for token in TOKEN_PATTERN.findall(str(text).lower()):
+            token = token.rstrip(".")
+            # Spellings of a known skill share one term, so 'ReactJS' in the text matches 'react'
+            skill = self.taxonomy.lookup(token)
+            tokens.append(normalize(skill.name) if skill else token)
+        return tokens
+
+    def _atom(self, token: str) -> List[Tuple[str, List[str]]]:
+        """Per-field terms for one query atom; a multi-word atom needs all its words in a field"""
+        field = None
+        if ":" in token and not token.startswith('"'):
+            prefix, token = token.split(":", 1)
+            prefix = prefix.lower()
+            field = FIELD_ALIASES.get(prefix, prefix)
+            if field not in FIELD_WEIGHTS:
+                raise ValueError(f"Unknown search field: {prefix}")
+        value = token.strip('"')
+
+        skill = self.taxonomy.lookup(value)
+        skill_terms = [normalize(skill.name if skill else value)]
+        text_terms = self._tokenize(value)
+        return [
+            (name, skill_terms if name in ("skill", "technology") else text_terms)
+            for name in ([field] if field else FIELD_WEIGHTS)
+            if (skill_terms if name in ("skill", "technology") else text_terms)
+        ]
+
+    def _match(self, atom: List[Tuple[str, List[str]]]) -> Set[str]:
+        matched: Set[str] = set()
+        for field, terms in atom:
+            postings = self._postings[field]
+            docs = None
+            for term in terms:
+                found = set(postings.get(term, ()))
+                docs = found if docs is None else docs & found
+            matched |= docs or set()
+        return matched
+
+    def _score(self, atoms: List[List[Tuple[str, List[str]]]], matches: Optional[Set[str]]) -> Dict[str, float]:
+        total_docs = len(self._documents)
+        scores: Dict[str, float] = {}
+        if not total_docs:
+            return scores
+
+        for atom in atoms:
+            for field, terms in atom:
+                postings = self._postings[field]
+                lengths = self._lengths[field]
+                average_length = self._total_lengths[field] / total_docs or 1.0
+                for term in terms:
+                    docs = postings.get(term)
+                    if not docs:
+                        continue
+                    idf = math.log(1 + (total_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for session_id, frequency in docs.items():
+                        if matches is not None and session_id not in matches:
+                            continue
+                        norm = 1 - BM25_B + BM25_B * lengths.get(session_id, 0) / average_length
+                        score = idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                        scores[session_id] = scores.get(session_id, 0.0) + FIELD_WEIGHTS[field] * score
+
+        # Boolean matches made only of negations still count, with a zero score
+        if matches is not None:
+            for session_id in matches:
+                scores.setdefault(session_id, 0.0)
+        return scores
+
+class _BooleanQuery:
+    """Recursive-descent parser for AND/OR/NOT queries; adjacent terms mean AND"""
+
+    def __init__(self, tokens: List[str], index: CandidateIndex):
+        self.tokens = tokens
+        self.position = 0
+        self.index = index
+        self.positive_atoms: List[List[Tuple[str, List[str]]]] = []
+
+    def parse(self) -> Set[str]:
+        if not self.tokens:
+            return set()
+        result = self._or(negated=False)
+        if self.position < len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.position]}' in query")
+        return result
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _or(self, negated: bool) -> Set[str]:
+        result = self._and(negated)
+        while (self._peek() or "").upper() == "OR":
+            self.position += 1
+            result = result | self._and(negated)
+        return result
+
+    def _and(self, negated: bool) -> Set[str]:
+        result = self._not(negated)
+        while self._peek() not in (None, ")") and self._peek().upper() != "OR":
+            if self._peek().upper() == "AND":
+                self.position += 1
+            result = result & self._not(negated)
+        return result
+
+    def _not(self, negated: bool) -> Set[str]:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Query ends unexpectedly")
+        if token.upper() == "NOT":
+            self.position += 1
+            return set(self.index._documents) - self._not(not negated)
+        if token == "(":
+            self.position += 1
+            result = self._or(negated)
+            if self._peek() != ")":
+                raise ValueError("Missing closing parenthesis in query")
+            self.position += 1
+            return result
+        if token == ")":
+            raise ValueError("Unexpected ')' in query")
+
+        self.position += 1
+        atom = self.index._atom(token)
+        if not negated:
+            self.positive_atoms.append(atom)
+        return self.index._match(atom)
+
+candidate_index = CandidateIndex()
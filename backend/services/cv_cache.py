@@ -0,0 +1,121 @@
+from config import config
+import os
+import json
+import uuid
+import copy
+import shutil
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class CVParseCache:
+    """Content-addressed cache of parsed CV data.
+
+    Entries live in an in-process LRU backed by JSON files on disk, grouped in
+    one directory per prompt version so a prompt change never serves stale
+    parses.
+    """
+
+    def __init__(self, version: str, cache_dir: str = None, max_memory_entries: int = None):
+        self.version = version
+        self.root_dir = cache_dir or config.CV_CACHE_DIR
+        self.cache_dir = os.path.join(self.root_dir, version)
+        self.max_memory_entries = max_memory_entries or config.CV_CACHE_MEMORY_ENTRIES
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.invalidate_stale_versions()
+
+    def key(self, file_content: bytes) -> str:
+        """SHA-256 of the uploaded bytes"""
+        return hashlib.sha256(file_content).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached parse, or None on a miss"""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return copy.deepcopy(self._memory[key])
+
+        cv_data = await asyncio.to_thread(self._read, key)
+        if cv_data is None:
+            self.misses += 1
+            return None
+
+        self.disk_hits += 1
+        self._remember(key, cv_data)
+        return copy.deepcopy(cv_data)
+
+    async def put(self, key: str, cv_data: Dict[str, Any]):
+        """Store a successful parse in both tiers"""
+        cv_data = copy.deepcopy(cv_data)
+        self._remember(key, cv_data)
+        try:
+            await asyncio.to_thread(self._write, key, cv_data)
+        except OSError as e:
+            print(f"CV cache write error: {str(e)}")
+
+    def invalidate(self, key: str = None):
+        """Drop one entry, or every entry for the current prompt version"""
+        if key is None:
+            self._memory.clear()
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            os.makedirs(self.cache_dir, exist_ok=True)
+        else:
+            self._memory.pop(key, None)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def invalidate_stale_versions(self):
+        """Delete on-disk entries written by other prompt versions"""
+        for name in os.listdir(self.root_dir):
+            path = os.path.join(self.root_dir, name)
+            if name != self.version and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "version": self.version,
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _remember(self, key: str, cv_data: Dict[str, Any]):
+        self._memory[key] = cv_data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write(self, key: str, cv_data: Dict[str, Any]):
+        path = self._path(key)
+        # Unique per writer, so concurrent writes of one key never share a temp file
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cv_data, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
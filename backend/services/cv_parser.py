@@ -1,30 +1,28 @@
-import openai
 from config import config
+from services.llm_gateway import llm_gateway
 import json
-import PyPDF2
-import io
-from typing import Dict, Any
+import asyncio
+import copy
+import hashlib
+from typing import Callable, Dict, Any, List, Optional
+from services.cv_cache import CVParseCache
+from services.document_extractor import document_extractor
+from services.local_extractor import local_extractor
+from services.metrics import fallbacks
+from services.tracing import span
+from services.near_duplicates import near_duplicate_index, minhash_signature
+from services.streaming_json import IncrementalJSONObject
+from services.prompt_compactor import prompt_compactor, COMPACTION_VERSION
 
-class CVParser:
-    def __init__(self):
-        openai.api_key = config.OPENAI_API_KEY
-        self.client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
-    
-    async def parse_cv(self, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Parse CV and extract structured information"""
-        
-        # Extract text from PDF
-        text_content = self._extract_text_from_pdf(file_content, filename)
-        
-        # Use OpenAI to analyze CV
-        analysis_prompt = f"""
-        Analyze this CV/Resume and extract structured information. Return a JSON object with the following structure:
+CV_MODEL = "gpt-4"
+CV_SYSTEM_PROMPT = "You are an expert CV analyzer. Extract information accurately and return valid JSON."
+CV_ANALYSIS_PROMPT = """
+        Analyze this CV/Resume and extract structured information. Return a JSON object with the following structure, keeping the keys in this order:
         
         {{
-            "candidate_name": "Full name",
-            "email": "email@example.com",
-            "phone": "phone number",
-            "summary": "Brief professional summary (2-3 sentences)",
+            "role_fit": "Suggested role type based on experience (e.g., 'Senior Frontend Developer', 'Product Manager', etc.)",
+            "skills": ["skill1", "skill2", "skill3"],
+            "technologies": ["tech1", "tech2", "tech3"],
             "experience": [
                 {{
                     "company": "Company name",
@@ -33,7 +31,10 @@ class CVParser:
                     "description": "Key responsibilities and achievements"
                 }}
             ],
-            "skills": ["skill1", "skill2", "skill3"],
+            "candidate_name": "Full name",
+            "email": "email@example.com",
+            "phone": "phone number",
+            "summary": "Brief professional summary (2-3 sentences)",
             "education": [
                 {{
                     "institution": "School/University",
@@ -41,26 +42,204 @@ class CVParser:
                     "field": "Field of study",
                     "year": "Graduation year"
                 }}
-            ],
-            "technologies": ["tech1", "tech2", "tech3"],
-            "role_fit": "Suggested role type based on experience (e.g., 'Senior Frontend Developer', 'Product Manager', etc.)"
+            ]
         }}
         
         CV Content:
         {text_content}
+"""
+
+# Cached parses are only valid for the prompt, model and compaction settings that produced them
+PROMPT_VERSION = hashlib.sha256(
+    f"{CV_MODEL}\n{CV_SYSTEM_PROMPT}\n{CV_ANALYSIS_PROMPT}\n"
+    f"{COMPACTION_VERSION}:{config.PROMPT_CV_TOKEN_BUDGET}".encode("utf-8")
+).hexdigest()[:16]
+
+class CVParseProgress:
+    """Fields of an in-flight CV parse, published as soon as each one is complete.
+    
+    on_event, if given, is called with (event, data) for each parse stage and
+    each completed field, e.g. to relay progress to a client.
+    """
+    
+    def __init__(self, on_event: Callable[[str, Dict[str, Any]], None] = None):
+        self.fields: Dict[str, Any] = {}
+        self.provisional: Optional[Dict[str, Any]] = None
+        self.near_duplicates: List[Dict[str, Any]] = []
+        self.done = False
+        self.on_event = on_event
+        self._changed = asyncio.Condition()
+    
+    def emit(self, event: str, data: Dict[str, Any]):
+        if self.on_event:
+            self.on_event(event, data)
+    
+    async def update(self, fields: Dict[str, Any]):
+        async with self._changed:
+            self.fields.update(fields)
+            self._changed.notify_all()
+        for name, value in fields.items():
+            self.emit("cv_field", {"name": name, "value": value})
+    
+    async def set_provisional(self, cv_data: Dict[str, Any]):
+        """Publish the locally extracted profile, available before the model has answered"""
+        async with self._changed:
+            self.provisional = cv_data
+            self._changed.notify_all()
+        self.emit("cv_provisional", cv_data)
+    
+    async def wait_provisional(self) -> Dict[str, Any]:
+        """Wait for the provisional profile (or the finished parse) and return it"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.done or self.provisional is not None)
+            return dict(self.fields if self.done else self.provisional)
+    
+    async def finish(self, cv_data: Dict[str, Any]):
+        async with self._changed:
+            self.fields = dict(cv_data)
+            self.done = True
+            self._changed.notify_all()
+    
+    async def wait_for(self, *names: str) -> Dict[str, Any]:
+        """Wait until the named fields are parsed (or the parse ends) and return what is known"""
+        async with self._changed:
+            await self._changed.wait_for(
+                lambda: self.done or all(name in self.fields for name in names)
+            )
+            return dict(self.fields)
+
+class CVParser:
+    def __init__(self):
+        self.llm = llm_gateway
+        self.cache = CVParseCache(PROMPT_VERSION)
+        self.extractor = document_extractor
+        self.local = local_extractor
+        self.duplicates = near_duplicate_index
+    
+    async def parse_cv(self, file_content: bytes, filename: str, progress: CVParseProgress = None,
+                       reuse_near_duplicate: bool = None) -> Dict[str, Any]:
+        """Parse CV and extract structured information.
+        
+        When progress is given, top-level fields are published to it while the
+        model response is still streaming. CVs near-identical to an earlier
+        upload are reported on progress.near_duplicates; with
+        reuse_near_duplicate the earlier parse is reused instead of calling
+        the model again.
         """
+        progress = progress or CVParseProgress()
+        if reuse_near_duplicate is None:
+            reuse_near_duplicate = config.NEAR_DUPLICATE_AUTO_REUSE
+        cv_data = {}
+        try:
+            cv_data = await self._parse_cv(file_content, filename, progress, reuse_near_duplicate)
+            return cv_data
+        finally:
+            await progress.finish(cv_data)
+    
+    async def _parse_cv(self, file_content: bytes, filename: str, progress: CVParseProgress,
+                        reuse_near_duplicate: bool) -> Dict[str, Any]:
+        # Identical uploads reuse the stored parse
+        cache_key = self.cache.key(file_content)
+        cached = await self.cached_parse(cache_key, filename)
+        if cached is not None:
+            progress.emit("extraction_done", {"cache_hit": True})
+            earlier = self.duplicates.get(cache_key)
+            if earlier is not None:
+                progress.near_duplicates = [{"document_id": cache_key, "similarity": 1.0, **earlier}]
+            await progress.set_provisional(cached)
+            return cached
         
+        # Extract text from PDF in the worker pool
+        with span("extract"):
+            text_content = await self.extractor.extract_text(file_content, filename)
+        progress.emit("extraction_done", {"cache_hit": False, "characters": len(text_content)})
+        
+        signature = await self.near_duplicate_signature(text_content)
+        if signature is not None:
+            progress.near_duplicates = self.duplicates.query(signature, exclude=cache_key)
+            if progress.near_duplicates:
+                progress.emit("near_duplicates", {"matches": progress.near_duplicates})
+        
+        # Regex-level fields are enough to show the candidate something straight away
+        await progress.set_provisional({
+            **self.local.extract(text_content),
+            "raw_text": text_content[:1000],
+            "original_filename": filename,
+            "provisional": True
+        })
+        
+        if reuse_near_duplicate:
+            for match in progress.near_duplicates:
+                earlier = await self.cache.get(match["document_id"])
+                if earlier is None:
+                    continue
+                # The earlier parse stands in for this one, with this upload's own text
+                cv_data = copy.deepcopy(earlier)
+                cv_data["original_filename"] = filename
+                cv_data["raw_text"] = text_content[:1000]
+                cv_data["reused_parse_of"] = match["document_id"]
+                await self.cache.put(cache_key, cv_data)
+                self.index_near_duplicate(cache_key, signature, cv_data)
+                return cv_data
+        
+        cv_data = await self.analyze_text(text_content, filename, cache_key, progress)
+        if signature is not None and not cv_data.get("error"):
+            self.index_near_duplicate(cache_key, signature, cv_data)
+        return cv_data
+    
+    async def near_duplicate_signature(self, text_content: str) -> Optional[List[int]]:
+        """MinHash signature of the extracted text, computed in the extraction pool"""
+        if text_content.startswith("Failed to extract text"):
+            return None
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4",
+            with span("minhash"):
+                return await self.extractor.run(minhash_signature, text_content, self.duplicates.num_perm)
+        except Exception as e:
+            print(f"Near-duplicate signature error: {str(e)}")
+            fallbacks.inc(service="cv_parser", method="minhash")
+            return None
+    
+    def index_near_duplicate(self, cache_key: str, signature: List[int], cv_data: Dict[str, Any]):
+        self.duplicates.add(cache_key, signature, {
+            "candidate_name": cv_data.get("candidate_name", "Unknown"),
+            "original_filename": cv_data.get("original_filename")
+        })
+    
+    async def cached_parse(self, cache_key: str, filename: str) -> Optional[Dict[str, Any]]:
+        """Stored parse for a cache key, if any"""
+        cached = await self.cache.get(cache_key)
+        if cached is not None:
+            cached["original_filename"] = filename
+        return cached
+    
+    async def analyze_text(self, text_content: str, filename: str, cache_key: str = None,
+                           progress: CVParseProgress = None) -> Dict[str, Any]:
+        """Analyze already extracted CV text, caching the result under cache_key"""
+        # Strip page furniture and low-value sections before paying for the tokens
+        compacted = prompt_compactor.compact_cv(text_content)
+        
+        # Use OpenAI to analyze CV
+        analysis_prompt = CV_ANALYSIS_PROMPT.format(text_content=compacted.text)
+        
+        result = ""
+        try:
+            parts = []
+            partial = IncrementalJSONObject()
+            async for delta in self.llm.stream_chat(
+                model=CV_MODEL,
+                operation="cv_parser.analyze_text",
+                stage="llm:cv",
                 messages=[
-                    {"role": "system", "content": "You are an expert CV analyzer. Extract information accurately and return valid JSON."},
+                    {"role": "system", "content": CV_SYSTEM_PROMPT},
                     {"role": "user", "content": analysis_prompt}
                 ],
                 temperature=0.3
-            )
-            
-            result = response.choices[0].message.content
+            ):
+                parts.append(delta)
+                completed = partial.feed(delta)
+                if completed and progress:
+                    await progress.update(completed)
+            result = "".join(parts).strip()
             
             # Clean the result - sometimes GPT returns markdown code blocks
             if result.startswith("```json"):
@@ -75,6 +254,8 @@ class CVParser:
             cv_data["original_filename"] = filename
             cv_data["raw_text"] = text_content[:1000]  # First 1000 chars for reference
             
+            if cache_key:
+                await self.cache.put(cache_key, cv_data)
             return cv_data
             
         except json.JSONDecodeError as e:
@@ -86,43 +267,12 @@ class CVParser:
             print(f"CV analysis error: {str(e)}")
             return self._create_fallback_cv_data(text_content, filename, str(e))
     
-    def _extract_text_from_pdf(self, file_content: bytes, filename: str) -> str:
-        """Extract text from PDF file"""
-        try:
-            if filename.lower().endswith('.pdf'):
-                pdf_file = io.BytesIO(file_content)
-                pdf_reader = PyPDF2.PdfReader(pdf_file)
-                
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                
-                return text
-            else:
-                # Assume it's a text file
-                return file_content.decode('utf-8')
-                
-        except Exception as e:
-            return f"Failed to extract text: {str(e)}"
-    
-    def _extract_email(self, text: str) -> str:
-        """Basic email extraction fallback"""
-        import re
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        matches = re.findall(email_pattern, text)
-        return matches[0] if matches else "unknown@example.com"
-    
     def _create_fallback_cv_data(self, text_content: str, filename: str, error: str) -> dict:
-        """Create fallback CV data when parsing fails"""
+        """Create fallback CV data from local extraction when parsing fails"""
+        fallbacks.inc(service="cv_parser", method="create_fallback_cv_data")
         return {
-            "candidate_name": "Unknown",
-            "email": self._extract_email(text_content),
+            **self.local.extract(text_content),
             "summary": "CV analysis failed - manual review required",
-            "experience": [],
-            "skills": [],
-            "education": [],
-            "technologies": [],
-            "role_fit": "General",
             "raw_text": text_content[:1000],
             "original_filename": filename,
             "error": f"CV parsing failed: {error}"
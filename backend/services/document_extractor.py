@@ -0,0 +1,134 @@
+from config import config
+import io
+import math
+import signal
+import asyncio
+import PyPDF2
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Windows: no CPU limits, only the wall-clock timeout
+    resource = None
+
+class CPUBudgetExceeded(Exception):
+    """Raised inside a worker when a task has used up its CPU seconds"""
+
+# Set while a task runs under a CPU limit, so a late signal never lands outside one
+_limit_armed = False
+
+def _on_cpu_limit(signum, frame):
+    if _limit_armed:
+        raise CPUBudgetExceeded()
+
+def _init_worker():
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+@contextmanager
+def _cpu_limit(seconds: float):
+    """Have the kernel signal this worker once it spends `seconds` more CPU time.
+
+    RLIMIT_CPU counts the whole process, so the soft limit is set to the CPU
+    used so far plus the budget, and put back when the task ends.
+    """
+    global _limit_armed
+    if resource is None:
+        yield
+        return
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    limit = math.ceil(usage.ru_utime + usage.ru_stime + seconds)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+
+    _limit_armed = True
+    resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+    try:
+        yield
+    finally:
+        _limit_armed = False
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+def _run_limited(cpu_budget: float, fn, *args):
+    """Run fn in a worker, raising CPUBudgetExceeded if it spends more than cpu_budget CPU seconds"""
+    with _cpu_limit(cpu_budget):
+        return fn(*args)
+
+def _extract_pdf_text(file_content: bytes, max_pages: int, cpu_budget: float) -> str:
+    """Extract text from a PDF inside a worker process.
+
+    A document that spends the CPU budget is cut off mid-page and returns the
+    pages extracted up to then.
+    """
+    pages = []
+    try:
+        with _cpu_limit(cpu_budget):
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+            for index, page in enumerate(pdf_reader.pages):
+                if index >= max_pages:
+                    break
+                pages.append((page.extract_text() or "") + "\n")
+    except CPUBudgetExceeded:
+        print(f"PDF extraction stopped after {cpu_budget}s of CPU at page {len(pages) + 1}")
+
+    return "".join(pages)
+
+class DocumentExtractor:
+    """Runs CPU-bound document text extraction in a process pool"""
+
+    def __init__(self, max_workers: int = None, cpu_timeout: float = None,
+                 timeout: float = None, max_pages: int = None):
+        self.max_workers = max_workers or config.EXTRACTION_WORKERS
+        self.cpu_timeout = cpu_timeout or config.EXTRACTION_CPU_TIMEOUT
+        self.timeout = timeout or config.EXTRACTION_TIMEOUT
+        self.max_pages = max_pages or config.EXTRACTION_MAX_PAGES
+        self._pool: ProcessPoolExecutor = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        return self._pool
+
+    async def extract_text(self, file_content: bytes, filename: str) -> str:
+        """Extract text from an uploaded document without blocking the event loop"""
+        try:
+            if not filename.lower().endswith('.pdf'):
+                # Assume it's a text file
+                return file_content.decode('utf-8')
+
+            loop = asyncio.get_running_loop()
+            job = loop.run_in_executor(
+                self._get_pool(), _extract_pdf_text,
+                file_content, self.max_pages, self.cpu_timeout
+            )
+            return await asyncio.wait_for(job, timeout=self.timeout)
+
+        except asyncio.TimeoutError:
+            return f"Failed to extract text: extraction exceeded {self.timeout}s"
+        except BrokenProcessPool as e:
+            # A crashed worker poisons the pool; start a fresh one for the next upload
+            self._pool = None
+            return f"Failed to extract text: {str(e)}"
+        except Exception as e:
+            return f"Failed to extract text: {str(e)}"
+
+    async def run(self, fn, *args):
+        """Run another CPU-bound function in the extraction pool, with the same CPU and wall-clock limits"""
+        loop = asyncio.get_running_loop()
+        try:
+            job = loop.run_in_executor(self._get_pool(), _run_limited, self.cpu_timeout, fn, *args)
+            return await asyncio.wait_for(job, timeout=self.timeout)
+        except BrokenProcessPool:
+            self._pool = None
+            raise
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+document_extractor = DocumentExtractor()
@@ -0,0 +1,39 @@
+from config import config
+import json
+import asyncio
+from typing import Any, AsyncIterator
+
+class EventStream:
+    """Server-Sent Events relayed from background work.
+
+    Producers call send() from anywhere in the request's work; the response
+    iterates events(). A comment line goes out whenever nothing else has been
+    sent for the heartbeat interval, so idle-timeout proxies keep the
+    connection open during long model calls.
+    """
+
+    def __init__(self, heartbeat: float = None):
+        self.heartbeat = heartbeat or config.SSE_HEARTBEAT_INTERVAL
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def send(self, event: str, data: Any):
+        self._queue.put_nowait((event, data))
+
+    def close(self):
+        self._queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[str]:
+        # Flush headers straight away so the client knows the stream is live
+        yield ": stream opened\n\n"
+
+        while True:
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=self.heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            if item is None:
+                return
+            event, data = item
+            yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
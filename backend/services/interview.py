@@ -1,14 +1,56 @@
-import openai
 from config import config
+from services.llm_gateway import llm_gateway
+from services.prompt_compactor import prompt_compactor
+from services.question_cache import question_cache
+from services.metrics import fallbacks
+from services.streaming_json import IncrementalJSONArray
 import json
-from typing import List, Dict, Any
+from typing import Awaitable, Callable, List, Dict, Any
 
 class InterviewService:
+    # Fixed interviewer lines, shared by every candidate
+    OPENING_QUESTION = "Hi! Thanks for joining this interview session. Let's start with you telling me a bit about yourself and your current role."
+    CLOSING_QUESTION = "That covers the main questions I had. Do you have any questions about the role, company, or anything else you'd like to discuss?"
+    FALLBACK_QUESTIONS = [
+        "Hi! Thanks for joining this interview session. Tell me about yourself and your background.",
+        "What interests you most about this opportunity?",
+        "Describe a challenging project you've worked on recently.",
+        "How do you approach problem-solving in your work?",
+        "Tell me about a time you had to learn something new quickly.",
+        "How do you handle working under pressure or tight deadlines?",
+        "What are your career goals for the next few years?",
+        "Do you have any questions for me about the role or company?"
+    ]
+    FOLLOWUP_PROMPTS = {
+        "project": "Could you elaborate on the specific challenges you faced in that project?",
+        "situation": "Can you give me a specific example of how you handled that situation?",
+        "experience": "What was the outcome of that experience?",
+        "default": "Could you provide more details about that?"
+    }
+    
+    # CV fields question generation needs before it can start
+    PROFILE_FIELDS = ("role_fit", "skills", "technologies", "experience")
+    
     def __init__(self):
-        self.client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
+        self.llm = llm_gateway
+        self.question_cache = question_cache
     
-    async def generate_questions(self, cv_data: Dict[str, Any]) -> List[str]:
-        """Generate tailored interview questions based on CV"""
+    async def generate_questions(self, cv_data: Dict[str, Any],
+                                 on_question: Callable[[str], Awaitable[None]] = None) -> List[str]:
+        """Generate tailored interview questions based on CV.
+        
+        When on_question is given it is called with each question as soon as
+        the model has finished writing it. Candidates with the same profile
+        signature mostly get a cached question set instead of a new generation.
+        """
+        
+        signature = self.question_cache.signature(cv_data)
+        cached = self.question_cache.get(signature)
+        if cached is not None:
+            if on_question:
+                for question in cached:
+                    await on_question(question)
+            return cached
         
         prompt = f"""
         Based on this candidate's CV, generate 6-8 interview questions that cover:
@@ -35,16 +77,27 @@ class InterviewService:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            parts = []
+            partial = IncrementalJSONArray()
+            opening_sent = False
+            async for delta in self.llm.stream_chat(
                 model="gpt-4",
+                operation="interview.generate_questions",
+                stage="llm:questions",
                 messages=[
                     {"role": "system", "content": "You are an expert technical recruiter. Generate thoughtful, relevant interview questions."},
                     {"role": "user", "content": prompt}
                 ],
                 temperature=0.7
-            )
-            
-            result = response.choices[0].message.content
+            ):
+                parts.append(delta)
+                for question in partial.feed(delta):
+                    if on_question:
+                        if not opening_sent:
+                            opening_sent = True
+                            await on_question(self.OPENING_QUESTION)
+                        await on_question(question)
+            result = "".join(parts).strip()
             
             # Clean the result - sometimes GPT returns markdown code blocks
             if result.startswith("```json"):
@@ -53,12 +106,19 @@ class InterviewService:
                 result = result.replace("```", "").strip()
             
             questions = json.loads(result)
+            if on_question:
+                # Relay any question the incremental parser could not pick out of the stream
+                for question in [q for q in questions if q not in partial.items]:
+                    if not opening_sent:
+                        opening_sent = True
+                        await on_question(self.OPENING_QUESTION)
+                    await on_question(question)
+                await on_question(self.CLOSING_QUESTION)
             
             # Add opening and closing questions
-            opening = "Hi! Thanks for joining this interview session. Let's start with you telling me a bit about yourself and your current role."
-            closing = "That covers the main questions I had. Do you have any questions about the role, company, or anything else you'd like to discuss?"
-            
-            return [opening] + questions + [closing]
+            questions = [self.OPENING_QUESTION] + questions + [self.CLOSING_QUESTION]
+            self.question_cache.put(signature, questions, cv_data)
+            return questions
             
         except json.JSONDecodeError as e:
             print(f"JSON parsing error in question generation: {str(e)}")
@@ -69,16 +129,14 @@ class InterviewService:
     
     def _get_fallback_questions(self) -> List[str]:
         """Get fallback generic questions when AI generation fails"""
-        return [
-            "Hi! Thanks for joining this interview session. Tell me about yourself and your background.",
-            "What interests you most about this opportunity?",
-            "Describe a challenging project you've worked on recently.",
-            "How do you approach problem-solving in your work?",
-            "Tell me about a time you had to learn something new quickly.",
-            "How do you handle working under pressure or tight deadlines?",
-            "What are your career goals for the next few years?",
-            "Do you have any questions for me about the role or company?"
-        ]
+        fallbacks.inc(service="interview", method="get_fallback_questions")
+        return list(self.FALLBACK_QUESTIONS)
+    
+    def static_phrases(self) -> List[str]:
+        """Every interviewer line that does not depend on the candidate"""
+        return ([self.OPENING_QUESTION, self.CLOSING_QUESTION] +
+                self.FALLBACK_QUESTIONS +
+                list(self.FOLLOWUP_PROMPTS.values()))
     
     async def generate_followup(self, answer_data: Dict[str, Any]) -> str:
         """Generate follow-up question based on candidate's answer"""
@@ -96,19 +154,22 @@ class InterviewService:
         
         # Simple follow-up prompts based on question type
         if "project" in question.lower():
-            return "Could you elaborate on the specific challenges you faced in that project?"
+            return self.FOLLOWUP_PROMPTS["project"]
         elif "team" in question.lower() or "work" in question.lower():
-            return "Can you give me a specific example of how you handled that situation?"
+            return self.FOLLOWUP_PROMPTS["situation"]
         elif "experience" in question.lower():
-            return "What was the outcome of that experience?"
+            return self.FOLLOWUP_PROMPTS["experience"]
         else:
-            return "Could you provide more details about that?"
+            return self.FOLLOWUP_PROMPTS["default"]
         
         return None  # No follow-up needed
     
     async def evaluate_answer(self, question: str, answer: str, cv_data: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate answer quality for reporting"""
         
+        # Long spoken answers are mostly filler and repetition
+        answer = prompt_compactor.compact_transcript(answer).text
+        
         prompt = f"""
         Evaluate this interview answer based on the MERIT AI rubric:
         
@@ -136,8 +197,10 @@ class InterviewService:
         """
         
         try:
-            response = self.client.chat.completions.create(
+            result = await self.llm.chat(
                 model="gpt-4",
+                operation="interview.evaluate_answer",
+                stage="llm:evaluate",
                 messages=[
                     {"role": "system", "content": "You are an expert interviewer using the MERIT AI evaluation rubric. Be fair but thorough in your assessment."},
                     {"role": "user", "content": prompt}
@@ -145,15 +208,22 @@ class InterviewService:
                 temperature=0.3
             )
             
-            result = response.choices[0].message.content
+            # Clean the result - sometimes GPT returns markdown code blocks
+            if result.startswith("```json"):
+                result = result.replace("```json", "").replace("```", "").strip()
+            elif result.startswith("```"):
+                result = result.replace("```", "").strip()
+            
             return json.loads(result)
             
         except Exception as e:
+            fallbacks.inc(service="interview", method="evaluate_answer")
             return {
                 "communication_score": 3,
                 "technical_score": 3,
                 "problem_solving_score": 3,
                 "professionalism_score": 3,
                 "culture_fit_score": 3,
-                "overall_notes": f"Auto-evaluation failed: {str(e)}"
+                "overall_notes": f"Auto-evaluation failed: {str(e)}",
+                "evaluation_failed": True
             }
\ No newline at end of file
@@ -0,0 +1,130 @@
+import openai
+import httpx
+import asyncio
+from config import config
+from services.metrics import track_call, record_usage
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+class LLMGateway:
+    """Single pooled async OpenAI client shared by every service.
+
+    Calls are bounded per model by a semaphore so one busy endpoint cannot
+    starve the others, and every call (including time spent queueing for a
+    slot) is capped by a timeout. Each call is timed and its token usage
+    counted under the operation name the calling service passes in.
+    """
+
+    def __init__(self):
+        self.client = openai.AsyncOpenAI(
+            api_key=config.OPENAI_API_KEY,
+            max_retries=config.LLM_MAX_RETRIES,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=config.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=config.LLM_MAX_CONNECTIONS
+                )
+            )
+        )
+        self.default_timeout = config.LLM_TIMEOUT
+        self._limits = dict(config.LLM_MODEL_CONCURRENCY)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphore(self, model: str) -> asyncio.Semaphore:
+        if model not in self._semaphores:
+            limit = self._limits.get(model, config.LLM_DEFAULT_CONCURRENCY)
+            self._semaphores[model] = asyncio.Semaphore(limit)
+        return self._semaphores[model]
+
+    async def _call(self, model: str, request, timeout: Optional[float], operation: str, stage: Optional[str]):
+        async def run():
+            async with self._semaphore(model):
+                async with track_call("openai", operation, model, stage):
+                    return await request()
+
+        return await asyncio.wait_for(run(), timeout=timeout or self.default_timeout)
+
+    async def chat(self, messages: List[Dict[str, str]], model: str = "gpt-4",
+                   temperature: float = 0.7, timeout: Optional[float] = None,
+                   operation: str = "chat", stage: Optional[str] = None, **kwargs: Any) -> str:
+        """Run a chat completion and return the message content"""
+        response = await self._call(
+            model,
+            lambda: self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **kwargs
+            ),
+            timeout,
+            operation,
+            stage
+        )
+        record_usage(operation, model, getattr(response, "usage", None))
+        return response.choices[0].message.content
+
+    async def stream_chat(self, messages: List[Dict[str, str]], model: str = "gpt-4",
+                          temperature: float = 0.7, timeout: Optional[float] = None,
+                          operation: str = "stream_chat", stage: Optional[str] = None,
+                          **kwargs: Any) -> AsyncIterator[str]:
+        """Run a streaming chat completion and yield content deltas as they arrive.
+
+        The model slot is held until the stream is exhausted or closed, and the
+        timeout bounds the whole stream rather than each chunk.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or self.default_timeout)
+
+        def remaining() -> float:
+            return max(deadline - loop.time(), 0)
+
+        semaphore = self._semaphore(model)
+        await asyncio.wait_for(semaphore.acquire(), timeout=remaining())
+        try:
+            async with track_call("openai", operation, model, stage):
+                stream = await asyncio.wait_for(
+                    self.client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        temperature=temperature,
+                        stream=True,
+                        # The final chunk then carries the token usage
+                        stream_options={"include_usage": True},
+                        **kwargs
+                    ),
+                    timeout=remaining()
+                )
+                try:
+                    chunks = stream.__aiter__()
+                    while True:
+                        try:
+                            chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                        except StopAsyncIteration:
+                            break
+                        record_usage(operation, model, getattr(chunk, "usage", None))
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                finally:
+                    await stream.close()
+        finally:
+            semaphore.release()
+
+    async def transcribe(self, file, model: str = "whisper-1",
+                         timeout: Optional[float] = None, operation: str = "transcribe",
+                         stage: Optional[str] = None, **kwargs: Any) -> Any:
+        """Transcribe an audio file-like object"""
+        return await self._call(
+            model,
+            lambda: self.client.audio.transcriptions.create(
+                model=model,
+                file=file,
+                **kwargs
+            ),
+            timeout,
+            operation,
+            stage
+        )
+
+    async def close(self):
+        await self.client.close()
+
+llm_gateway = LLMGateway()
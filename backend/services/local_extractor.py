@@ -0,0 +1,138 @@
+import re
+from typing import Any, Dict, List, Optional
+from services.skill_taxonomy import SkillTaxonomy, skill_taxonomy
+
+# Terms that are also everyday words only count when capitalized as written here
+CASE_SENSITIVE_TERMS = {"C", "R", "Go", "REST", "Express", "Spring", "Excel", "Rails", "Swift"}
+
+# Taxonomy aliases too ambiguous to match in free text
+UNMATCHED_ALIASES = {
+    "node", "shell", "torch", "analytics", "coaching", "experimentation", "py", "ts", "ui",
+    "ml", "dl", "roadmaps", "unix", "mongo"
+}
+
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_PATTERN = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d{2,4}(?:[\s.-]?\d{2,4}){2,4}(?!\w)")
+
+MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+)?(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}"
+DATE_RANGE_PATTERN = re.compile(
+    rf"({DATE})\s*(?:-|–|—|to|until)\s*({DATE}|present|current|now|today)", re.IGNORECASE
+)
+YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+DEGREE_PATTERN = re.compile(
+    r"\b(ph\.?\s?d|doctorate|master(?:'s)?|m\.?\s?sc|mba|m\.?\s?eng|bachelor(?:'s)?|b\.?\s?sc"
+    r"|b\.?\s?eng|b\.?\s?a\b|b\.?\s?s\b|associate(?:'s)? degree|diploma)",
+    re.IGNORECASE
+)
+NAME_WORD = re.compile(r"^[A-Z][A-Za-z'\-]+\.?$|^[A-Z]\.$")
+NOT_A_NAME = {"curriculum", "vitae", "resume", "cv", "profile", "summary", "contact"}
+
+def _term_pattern(terms: List[str], flags: int) -> re.Pattern:
+    # Longest first, so "React Native" wins over "React" at the same position
+    alternation = "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"(?<![\w+#.])(?:{alternation})(?![\w+#])", flags)
+
+class LocalCVExtractor:
+    """Deterministic CV field extraction that runs in milliseconds.
+
+    Gives a provisional profile while the model analyzes the CV, and the
+    profile of last resort when that analysis fails. Every taxonomy alias
+    goes into one compiled alternation per case mode, so matching is a single
+    pass over the text however large the taxonomy gets.
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy = None):
+        self.taxonomy = taxonomy or skill_taxonomy
+        terms = [alias for alias in self.taxonomy.aliases if alias not in UNMATCHED_ALIASES]
+        self._term_pattern = _term_pattern(
+            [term for term in terms if term not in CASE_SENSITIVE_TERMS], re.IGNORECASE
+        )
+        self._exact_term_pattern = _term_pattern(
+            [term for term in terms if term in CASE_SENSITIVE_TERMS], 0
+        )
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        skills, technologies = self.match_terms(text)
+        return {
+            "candidate_name": self.extract_name(text) or "Unknown",
+            "email": self.extract_email(text) or "unknown@example.com",
+            "phone": self.extract_phone(text) or "",
+            "summary": "",
+            "experience": self.extract_experience(text),
+            "skills": skills,
+            "education": self.extract_education(text),
+            "technologies": technologies,
+            "role_fit": "General"
+        }
+
+    def extract_email(self, text: str) -> Optional[str]:
+        match = EMAIL_PATTERN.search(text)
+        return match.group(0) if match else None
+
+    def extract_phone(self, text: str) -> Optional[str]:
+        for match in PHONE_PATTERN.finditer(text):
+            digits = re.sub(r"\D", "", match.group(0))
+            if 7 <= len(digits) <= 15 and not DATE_RANGE_PATTERN.search(match.group(0)):
+                return match.group(0).strip()
+        return None
+
+    def extract_name(self, text: str) -> Optional[str]:
+        """The first short line near the top that reads like a personal name"""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        for line in lines[:8]:
+            # Names often share the first line with contact details
+            candidate = re.split(r"\s*[|,•·–—]\s*", line)[0].strip()
+            words = candidate.split()
+            if not 2 <= len(words) <= 4 or len(candidate) > 50:
+                continue
+            if any(word.lower().strip(".") in NOT_A_NAME for word in words):
+                continue
+            if all(NAME_WORD.match(word.title() if word.isupper() else word) for word in words):
+                return candidate.title() if candidate.isupper() else candidate
+        return None
+
+    def extract_experience(self, text: str) -> List[Dict[str, str]]:
+        """One entry per dated line, e.g. 'Acme Corp, Engineer  Jan 2019 - Present'"""
+        experience = []
+        for line in text.splitlines():
+            match = DATE_RANGE_PATTERN.search(line)
+            if not match or DEGREE_PATTERN.search(line):
+                continue
+            description = (line[:match.start()] + line[match.end():]).strip(" ,|-–—()\t")
+            experience.append({
+                "duration": f"{match.group(1)} - {match.group(2)}",
+                "description": description[:150]
+            })
+        return experience
+
+    def extract_education(self, text: str) -> List[Dict[str, str]]:
+        education = []
+        for line in text.splitlines():
+            match = DEGREE_PATTERN.search(line)
+            if not match:
+                continue
+            years = YEAR_PATTERN.findall(line)
+            education.append({
+                "degree": match.group(0),
+                "details": line.strip()[:150],
+                "year": years[-1] if years else ""
+            })
+        return education
+
+    def match_terms(self, text: str):
+        """Canonical skills and technologies named in the text, in order of first mention"""
+        found = {}
+        for pattern in (self._term_pattern, self._exact_term_pattern):
+            for match in pattern.finditer(text):
+                skill = self.taxonomy.lookup(match.group(0))
+                if skill:
+                    found.setdefault(skill, match.start())
+
+        ordered = sorted(found, key=found.get)
+        skills = [skill.name for skill in ordered if not skill.is_technology]
+        technologies = [skill.name for skill in ordered if skill.is_technology]
+        return skills, technologies
+
+local_extractor = LocalCVExtractor()
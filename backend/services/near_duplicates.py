@@ -0,0 +1,137 @@
+from config import config
+import re
+import zlib
+import random
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+SHINGLE_SIZE = 3
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int, seed: int) -> Tuple[Tuple[int, int], ...]:
+    generator = random.Random(seed)
+    return tuple(
+        (generator.randrange(1, MERSENNE_PRIME), generator.randrange(0, MERSENNE_PRIME))
+        for _ in range(num_perm)
+    )
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hashed word n-grams, so reordered sections and reformatting barely move the set"""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(" ".join(words).encode())} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode())
+        for i in range(len(words) - size + 1)
+    }
+
+def minhash_signature(text: str, num_perm: int, seed: int = 1) -> List[int]:
+    """MinHash signature of the text's shingles.
+
+    Module level so it can run in the extraction process pool; the cost is
+    one multiply-add per shingle and permutation.
+    """
+    hashed = shingles(text)
+    if not hashed:
+        return [MAX_HASH] * num_perm
+    return [
+        min((a * value + b) % MERSENNE_PRIME for value in hashed) & MAX_HASH
+        for a, b in _permutations(num_perm, seed)
+    ]
+
+def _choose_bands(num_perm: int, threshold: float, recall: float = 0.95) -> Tuple[int, int]:
+    """The most selective bands x rows split that still buckets a pair at the threshold together.
+
+    A pair with similarity s shares at least one bucket with probability
+    1 - (1 - s^rows)^bands; candidates are verified afterwards, so recall at
+    the threshold matters more than a few extra comparisons.
+    """
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    catching = [
+        (bands, rows) for bands, rows in options
+        if 1 - (1 - threshold ** rows) ** bands >= recall
+    ]
+    return max(catching, key=lambda option: option[1]) if catching else (num_perm, 1)
+
+class NearDuplicateIndex:
+    """Locality-sensitive hashing index of CV MinHash signatures.
+
+    Each signature is cut into bands and every band is a bucket key, so a
+    query only compares against documents sharing at least one bucket instead
+    of every CV seen. Candidates are confirmed on their estimated Jaccard
+    similarity before being reported.
+    """
+
+    def __init__(self, threshold: float = None, num_perm: int = None, max_documents: int = None):
+        self.threshold = threshold or config.NEAR_DUPLICATE_THRESHOLD
+        self.num_perm = num_perm or config.NEAR_DUPLICATE_NUM_PERM
+        self.max_documents = max_documents or config.NEAR_DUPLICATE_MAX_DOCUMENTS
+        self.bands, self.rows = _choose_bands(self.num_perm, self.threshold)
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(self.bands)]
+        self._documents: "OrderedDict[str, Tuple[List[int], Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def signature(self, text: str) -> List[int]:
+        return minhash_signature(text, self.num_perm)
+
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._documents.get(document_id)
+        return entry[1] if entry else None
+
+    def add(self, document_id: str, signature: List[int], metadata: Dict[str, Any] = None):
+        self.remove(document_id)
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(document_id)
+        self._documents[document_id] = (signature, metadata or {})
+
+        while len(self._documents) > self.max_documents:
+            self.remove(next(iter(self._documents)))
+
+    def remove(self, document_id: str):
+        entry = self._documents.pop(document_id, None)
+        if entry is None:
+            return
+        for band, key in enumerate(self._band_keys(entry[0])):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(document_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def query(self, signature: List[int], exclude: str = None) -> List[Dict[str, Any]]:
+        """Indexed documents whose estimated similarity reaches the threshold, most similar first"""
+        candidates: Set[str] = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates |= self._buckets[band].get(key, set())
+        candidates.discard(exclude)
+
+        matches = []
+        for document_id in candidates:
+            other, metadata = self._documents[document_id]
+            similarity = sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+            if similarity >= self.threshold:
+                matches.append({"document_id": document_id, "similarity": round(similarity, 3), **metadata})
+
+        matches.sort(key=lambda match: match["similarity"], reverse=True)
+        return matches
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self._documents),
+            "threshold": self.threshold,
+            "bands": self.bands,
+            "rows": self.rows
+        }
+
+    def _band_keys(self, signature: List[int]):
+        for band in range(self.bands):
+            yield tuple(signature[band * self.rows:(band + 1) * self.rows])
+
+near_duplicate_index = NearDuplicateIndex()
@@ -0,0 +1,216 @@
+from config import config
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Bump when the compaction rules change, so prompts built from compacted text are re-keyed
+COMPACTION_VERSION = "2"
+
+# Section headings seen in CVs, mapped to a section name and how much it is worth keeping.
+# Sections with the lowest value are dropped first when a CV is over budget.
+SECTION_HEADINGS = {
+    "summary": ("summary", 3), "profile": ("summary", 3), "about me": ("summary", 3),
+    "objective": ("summary", 2), "career objective": ("summary", 2),
+    "experience": ("experience", 5), "work experience": ("experience", 5),
+    "professional experience": ("experience", 5), "employment": ("experience", 5),
+    "employment history": ("experience", 5), "work history": ("experience", 5),
+    "skills": ("skills", 5), "technical skills": ("skills", 5), "core skills": ("skills", 5),
+    "technologies": ("skills", 5), "tech stack": ("skills", 5), "competencies": ("skills", 4),
+    "projects": ("projects", 4), "personal projects": ("projects", 3),
+    "education": ("education", 4), "academic background": ("education", 4),
+    "certifications": ("certifications", 2), "certificates": ("certifications", 2),
+    "courses": ("certifications", 2), "training": ("certifications", 2),
+    "languages": ("languages", 2), "awards": ("awards", 1), "achievements": ("awards", 2),
+    "publications": ("publications", 1), "volunteering": ("volunteering", 1),
+    "volunteer experience": ("volunteering", 1), "interests": ("interests", 0),
+    "hobbies": ("interests", 0), "hobbies and interests": ("interests", 0),
+    "references": ("references", 0), "referees": ("references", 0),
+}
+HEADER_VALUE = 5  # text before the first heading: name and contact details
+
+# Section values that are never dropped outright, only shortened
+CORE_VALUE = 4
+
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^page\s*\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE),
+    re.compile(r"^(-\s*)?\d{1,3}(\s*-)?$"),
+    re.compile(r"^\d{1,3}\s*(of|/)\s*\d{1,3}$", re.IGNORECASE),
+    re.compile(r"^(curriculum vitae|resume|résumé|cv)$", re.IGNORECASE),
+    re.compile(r"^references (are )?available (up)?on request\.?$", re.IGNORECASE),
+    re.compile(r"^(confidential|private (and|&) confidential)$", re.IGNORECASE),
+]
+
+FILLER_WORDS = re.compile(r"\b(?:um+|uh+|erm+|hmm+|ah+)\b[,.]?\s*", re.IGNORECASE)
+REPEATED_WORD = re.compile(r"\b(\w+)(?:\s+\1\b)+", re.IGNORECASE)
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+class CompactionResult:
+    def __init__(self, text: str, original_tokens: int):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.tokens = estimate_tokens(text)
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English prompt text (about four characters per token)"""
+    return (len(text) + 3) // 4
+
+class PromptCompactor:
+    """Shrinks CV text, answer transcripts and evaluator notes to a token budget.
+
+    Cheap, lossless clean-up runs first (whitespace, page furniture, repeated
+    lines, filler words). Only if the text is still over budget is content
+    removed: whole low-value sections first, then the tail of each remaining
+    section, longest sections giving up the most.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def compact_cv(self, text: str, budget_tokens: int = None) -> CompactionResult:
+        budget_tokens = budget_tokens or config.PROMPT_CV_TOKEN_BUDGET
+        original_tokens = estimate_tokens(text)
+
+        lines = self._clean_lines(text)
+        sections = self._split_sections(lines)
+        budget_chars = budget_tokens * 4
+
+        # Drop whole sections, least valuable first, until the rest fits
+        for section in sorted(sections, key=lambda s: s[1]):
+            if self._size(sections) <= budget_chars or section[1] >= CORE_VALUE:
+                break
+            sections.remove(section)
+
+        sections = self._fit_sections(sections, budget_chars)
+        compacted = "\n\n".join("\n".join(section_lines) for _, _, section_lines in sections)
+        return self._record("cv", compacted, original_tokens)
+
+    def compact_transcript(self, text: str, budget_tokens: int = None) -> CompactionResult:
+        budget_tokens = budget_tokens or config.PROMPT_ANSWER_TOKEN_BUDGET
+        original_tokens = estimate_tokens(text)
+
+        text = FILLER_WORDS.sub("", text)
+        text = REPEATED_WORD.sub(r"\1", text)
+        text = re.sub(r"\s+", " ", text).strip()
+
+        # Speech-to-text sometimes repeats a whole sentence
+        sentences = []
+        for sentence in SENTENCE_SPLIT.split(text):
+            if not sentences or sentence.lower() != sentences[-1].lower():
+                sentences.append(sentence)
+        text = " ".join(sentences)
+
+        budget_chars = budget_tokens * 4
+        if len(text) > budget_chars:
+            # Keep the opening and the conclusion of the answer
+            head = budget_chars * 2 // 3
+            tail = budget_chars - head
+            text = f"{text[:head].rstrip()} [...] {text[-tail:].lstrip()}"
+
+        return self._record("transcript", text, original_tokens)
+
+    def compact_lines(self, lines: List[str], budget_tokens: int = None) -> CompactionResult:
+        """Deduplicate short notes and shorten the longest ones until they fit"""
+        budget_tokens = budget_tokens or config.PROMPT_NOTES_TOKEN_BUDGET
+        original_tokens = estimate_tokens("\n".join(lines))
+
+        unique, seen = [], set()
+        for line in lines:
+            line = re.sub(r"\s+", " ", str(line)).strip()
+            if line and line.lower() not in seen:
+                seen.add(line.lower())
+                unique.append(line)
+
+        allowances = self._allocate([len(line) for line in unique], budget_tokens * 4)
+        fitted = [
+            line if len(line) <= allowance else line[:max(0, allowance - 3)].rstrip() + "..."
+            for line, allowance in zip(unique, allowances) if allowance > 0
+        ]
+        return self._record("notes", "\n".join(fitted), original_tokens)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {kind: dict(values) for kind, values in self._stats.items()}
+
+    def _clean_lines(self, text: str) -> List[str]:
+        lines = [re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines()]
+        lines = [
+            line for line in lines
+            if line and not any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS)
+        ]
+        counts = Counter(line.lower() for line in lines)
+
+        # Page headers, footers and copied bullets keep only their first occurrence.
+        # Short lines such as a job title legitimately appear twice, so they need more repeats.
+        kept, seen = [], set()
+        for line in lines:
+            key = line.lower()
+            if key in seen and (len(line) >= 20 or counts[key] >= 3):
+                continue
+            seen.add(key)
+            kept.append(line)
+        return kept
+
+    def _split_sections(self, lines: List[str]) -> List[Tuple[str, int, List[str]]]:
+        sections = [("header", HEADER_VALUE, [])]
+        for line in lines:
+            heading = self._heading(line)
+            if heading:
+                sections.append((heading[0], heading[1], [line]))
+            else:
+                sections[-1][2].append(line)
+        return [section for section in sections if section[2]]
+
+    def _heading(self, line: str):
+        if len(line) > 40:
+            return None
+        return SECTION_HEADINGS.get(line.rstrip(":").strip().lower())
+
+    def _fit_sections(self, sections, budget_chars: int):
+        # Sections are joined by a blank line, which counts against the budget too
+        budget_chars = max(0, budget_chars - 2 * (len(sections) - 1))
+        allowances = self._allocate([len("\n".join(lines)) for _, _, lines in sections], budget_chars)
+        fitted = []
+        for (name, value, lines), allowance in zip(sections, allowances):
+            kept, used = [], 0
+            for line in lines:
+                room = allowance - used - (1 if kept else 0)
+                if len(line) > room:
+                    # PDF extraction often puts a whole section on one line, so cut inside it
+                    if room > 3:
+                        kept.append(line[:room - 3].rstrip() + "...")
+                    break
+                kept.append(line)
+                used += len(line) + (1 if len(kept) > 1 else 0)
+            if kept:
+                fitted.append((name, value, kept))
+        return fitted
+
+    def _allocate(self, sizes: List[int], budget: int) -> List[int]:
+        """Split a character budget so small items stay whole and large ones share the rest"""
+        allowances = [0] * len(sizes)
+        remaining = budget
+        order = sorted(range(len(sizes)), key=lambda i: sizes[i])
+        for position, index in enumerate(order):
+            share = remaining // (len(order) - position)
+            allowances[index] = min(sizes[index], share)
+            remaining -= allowances[index]
+        return allowances
+
+    def _size(self, sections) -> int:
+        return sum(len("\n".join(lines)) + 2 for _, _, lines in sections)
+
+    def _record(self, kind: str, text: str, original_tokens: int) -> CompactionResult:
+        result = CompactionResult(text, original_tokens)
+        stats = self._stats.setdefault(
+            kind, {"calls": 0, "original_tokens": 0, "compacted_tokens": 0, "tokens_saved": 0}
+        )
+        stats["calls"] += 1
+        stats["original_tokens"] += original_tokens
+        stats["compacted_tokens"] += result.tokens
+        stats["tokens_saved"] += result.tokens_saved
+        return result
+
+prompt_compactor = PromptCompactor()
@@ -0,0 +1,109 @@
+from config import config
+import re
+import time
+import random
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from services.skill_taxonomy import SkillTaxonomy, skill_taxonomy
+
+class QuestionSetCache:
+    """Generated interview question sets shared between similar candidates.
+
+    Sets are keyed by a profile signature: the canonical role family plus the
+    candidate's top canonical skills, sorted so their order on the CV does not
+    matter. Each signature keeps a few variants; a lookup reuses one with
+    probability reuse_ratio and otherwise asks for a fresh generation, which
+    is added as another variant. Entries expire after the TTL and the least
+    recently used signatures are evicted beyond max_entries.
+    """
+
+    def __init__(self, taxonomy: SkillTaxonomy = None, ttl: float = None, max_entries: int = None,
+                 variants: int = None, reuse_ratio: float = None, top_skills: int = None,
+                 rng: random.Random = None):
+        self.taxonomy = taxonomy or skill_taxonomy
+        self.ttl = ttl or config.QUESTION_CACHE_TTL
+        self.max_entries = max_entries or config.QUESTION_CACHE_MAX_ENTRIES
+        self.variants = variants or config.QUESTION_CACHE_VARIANTS
+        self.reuse_ratio = config.QUESTION_CACHE_REUSE_RATIO if reuse_ratio is None else reuse_ratio
+        self.top_skills = top_skills or config.QUESTION_CACHE_TOP_SKILLS
+        self.rng = rng or random.Random()
+        self._entries: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.regenerations = 0
+
+    def signature(self, cv_data: Dict[str, Any]) -> str:
+        role = self.taxonomy.canonical_role(cv_data.get("role_fit", "General"))
+        skills = self.taxonomy.canonicalize(
+            list(cv_data.get("technologies") or []) + list(cv_data.get("skills") or [])
+        )
+        top = sorted(skill.lower() for skill in skills[:self.top_skills])
+        return f"{role}|{','.join(top)}"
+
+    def get(self, signature: str) -> Optional[List[str]]:
+        """A cached question set to reuse, or None when the caller should generate one"""
+        variants = self._live_variants(signature)
+        if not variants:
+            self.misses += 1
+            return None
+
+        # Keep some traffic regenerating, so signatures build up variety and old sets rotate out
+        if self.rng.random() >= self.reuse_ratio:
+            self.regenerations += 1
+            return None
+
+        self._entries.move_to_end(signature)
+        self.hits += 1
+        return list(self.rng.choice(variants)["questions"])
+
+    def put(self, signature: str, questions: List[str], cv_data: Dict[str, Any] = None):
+        """Store a generated set, unless it names this candidate's details and so cannot be shared"""
+        if cv_data and self._is_personal(questions, cv_data):
+            return
+
+        variants = self._live_variants(signature)
+        variants.append({"questions": list(questions), "created_at": time.time()})
+        self._entries[signature] = variants[-self.variants:]
+        self._entries.move_to_end(signature)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.regenerations
+        return {
+            "signatures": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "regenerations": self.regenerations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _live_variants(self, signature: str) -> List[Dict[str, Any]]:
+        variants = self._entries.get(signature)
+        if not variants:
+            return []
+        cutoff = time.time() - self.ttl
+        live = [variant for variant in variants if variant["created_at"] >= cutoff]
+        if live:
+            self._entries[signature] = live
+        else:
+            del self._entries[signature]
+        return live
+
+    def _is_personal(self, questions: List[str], cv_data: Dict[str, Any]) -> bool:
+        """Whether the questions mention the candidate's name or past employers"""
+        names = []
+        candidate_name = str(cv_data.get("candidate_name") or "")
+        if candidate_name and candidate_name != "Unknown":
+            names.extend(word for word in candidate_name.split() if len(word) > 2)
+        for job in cv_data.get("experience") or []:
+            if isinstance(job, dict) and job.get("company"):
+                names.append(str(job["company"]))
+
+        text = " ".join(questions).lower()
+        return any(
+            re.search(rf"(?<!\w){re.escape(name.lower())}(?!\w)", text)
+            for name in names if name.strip()
+        )
+
+question_cache = QuestionSetCache()
@@ -1,133 +1,288 @@
-import openai
 from config import config
+from services.llm_gateway import llm_gateway
+from services.prompt_compactor import prompt_compactor
+from services.skill_taxonomy import skill_taxonomy
+from services.assessment import AssessmentService
+from services.metrics import fallbacks
 import json
-from typing import Dict, Any
+import asyncio
+from typing import Any, Callable, Dict
 from datetime import datetime
+from statistics import mean
 from models.session import InterviewSession
 
 class ReportService:
-    def __init__(self):
-        self.client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
+    MERIT_DIMENSIONS = [
+        "communication_score",
+        "technical_score",
+        "problem_solving_score",
+        "professionalism_score",
+        "culture_fit_score"
+    ]
     
-    async def generate_report(self, session: InterviewSession) -> Dict[str, Any]:
-        """Generate comprehensive evaluation report"""
+    # Expensive report sections and the session inputs they are computed from
+    SECTION_DEPENDENCIES = {
+        "interview_evaluation": ["cv", "interview"],
+        "assessment_evaluation": ["assessment"]
+    }
+    
+    def __init__(self, assessment_service: AssessmentService = None):
+        self.llm = llm_gateway
+        self.taxonomy = skill_taxonomy
+        self.assessment_service = assessment_service or AssessmentService()
+        self.branch_timeout = config.REPORT_BRANCH_TIMEOUT
+    
+    def is_current(self, report: Dict[str, Any], session: InterviewSession) -> bool:
+        """Whether a previously generated report reflects the session as it is now"""
+        if not report or "report_meta" not in report:
+            return False
+        meta = report["report_meta"]
+        # A report with fallback sections is retried on the next request
+        return meta.get("session_version") == session.version and not meta.get("fallback_sections")
+    
+    async def generate_report(self, session: InterviewSession, previous_report: Dict[str, Any] = None,
+                              on_section: Callable[[str, Any], None] = None) -> Dict[str, Any]:
+        """Generate comprehensive evaluation report, reusing unchanged sections of previous_report.
+        
+        When on_section is given it is called with each section as soon as it is final.
+        """
+        emit = on_section or (lambda name, section: None)
         
         # Gather all session data
         cv_data = session.cv_data or {}
         answers = session.answers or []
         assessment_result = session.assessment_result or {}
+        reusable = self._reusable_sections(session, previous_report)
+        sections = {}
+        fell_back = set()
+        
+        def finalize(name: str, section: Any):
+            sections[name] = section
+            emit(name, section)
+        
+        finalize("candidate_info", {
+            "name": cv_data.get('candidate_name', 'Unknown'),
+            "email": cv_data.get('email', 'Unknown'),
+            "role_applied": cv_data.get('role_fit', 'General'),
+            "evaluation_date": datetime.now().isoformat()
+        })
+        finalize("cv_analysis", {
+            "summary": cv_data.get('summary', ''),
+            "experience_years": self._calculate_experience_years(cv_data.get('experience', [])),
+            "key_skills": self.taxonomy.canonicalize(cv_data.get('skills', []))[:8],  # Top 8 skills
+            "technologies": self.taxonomy.canonicalize(cv_data.get('technologies', []))[:10],  # Top 10 technologies
+            "skill_categories": self.taxonomy.categorize(
+                (cv_data.get('technologies') or []) + (cv_data.get('skills') or [])
+            ),
+            "education_level": self._determine_education_level(cv_data.get('education', []))
+        })
+        
+        builders = {
+            "interview_evaluation": lambda scores: {
+                "questions_answered": len(answers),
+                "scores": scores,
+                "strengths": self._identify_strengths(scores),
+                "areas_for_improvement": self._identify_improvements(scores),
+                "notable_responses": self._extract_notable_responses(answers)
+            },
+            "assessment_evaluation": lambda scores: {
+                "completed": bool(assessment_result),
+                "scores": scores,
+                "performance_summary": self._summarize_assessment_performance(scores)
+            }
+        }
+        
+        # Independent LLM evaluations run concurrently, each with its own timeout and fallback
+        branches = {}
+        if "interview_evaluation" not in reusable:
+            branches["interview_evaluation"] = self._run_branch(
+                "interview_evaluation",
+                self._evaluate_interview_performance(answers, cv_data),
+                self._default_interview_scores,
+                fell_back
+            )
+        if "assessment_evaluation" not in reusable:
+            branches["assessment_evaluation"] = self._run_branch(
+                "assessment_evaluation",
+                self._evaluate_assessment(session.assessment or {}, assessment_result),
+                lambda: self._timed_out_assessment_scores(assessment_result),
+                fell_back
+            )
+        
+        for name in sorted(reusable):
+            finalize(name, builders[name](previous_report[name]["scores"]))
+        
+        async def run_branch(name: str, branch):
+            finalize(name, builders[name](await branch))
+        
+        await asyncio.gather(*[run_branch(name, branch) for name, branch in branches.items()])
         
-        # Generate individual section scores
-        interview_scores = await self._evaluate_interview_performance(answers, cv_data)
-        assessment_scores = self._process_assessment_scores(assessment_result)
         overall_evaluation = self._generate_overall_evaluation(
-            cv_data, interview_scores, assessment_scores
+            cv_data, sections["interview_evaluation"]["scores"], sections["assessment_evaluation"]["scores"]
         )
+        finalize("overall_evaluation", overall_evaluation)
+        finalize("recommendation", self._generate_recommendation(overall_evaluation))
+        finalize("next_steps", self._suggest_next_steps(overall_evaluation))
         
         # Compile final report
         report = {
-            "candidate_info": {
-                "name": cv_data.get('candidate_name', 'Unknown'),
-                "email": cv_data.get('email', 'Unknown'),
-                "role_applied": cv_data.get('role_fit', 'General'),
-                "evaluation_date": datetime.now().isoformat()
-            },
-            "cv_analysis": {
-                "summary": cv_data.get('summary', ''),
-                "experience_years": self._calculate_experience_years(cv_data.get('experience', [])),
-                "key_skills": cv_data.get('skills', [])[:8],  # Top 8 skills
-                "technologies": cv_data.get('technologies', [])[:10],  # Top 10 technologies
-                "education_level": self._determine_education_level(cv_data.get('education', []))
-            },
-            "interview_evaluation": {
-                "questions_answered": len(answers),
-                "scores": interview_scores,
-                "strengths": self._identify_strengths(interview_scores),
-                "areas_for_improvement": self._identify_improvements(interview_scores),
-                "notable_responses": self._extract_notable_responses(answers)
-            },
-            "assessment_evaluation": {
-                "completed": bool(assessment_result),
-                "scores": assessment_scores,
-                "performance_summary": self._summarize_assessment_performance(assessment_scores)
-            },
-            "overall_evaluation": overall_evaluation,
-            "recommendation": self._generate_recommendation(overall_evaluation),
-            "next_steps": self._suggest_next_steps(overall_evaluation),
-            "session_metadata": {
-                "session_id": session.session_id,
-                "duration_minutes": self._calculate_session_duration(session),
-                "completion_status": session.status
-            }
+            name: sections[name] for name in (
+                "candidate_info", "cv_analysis", "interview_evaluation", "assessment_evaluation",
+                "overall_evaluation", "recommendation", "next_steps"
+            )
+        }
+        report["session_metadata"] = {
+            "session_id": session.session_id,
+            "duration_minutes": self._calculate_session_duration(session),
+            "completion_status": session.status
+        }
+        report["report_meta"] = {
+            "session_version": session.version,
+            "section_versions": dict(session.section_versions),
+            "reused_sections": sorted(reusable),
+            "fallback_sections": sorted(fell_back)
         }
         
         return report
     
+    def _reusable_sections(self, session: InterviewSession, previous_report: Dict[str, Any]) -> set:
+        """Sections of previous_report whose inputs have not changed since it was built"""
+        if not previous_report or "report_meta" not in previous_report:
+            return set()
+        
+        built_from = previous_report["report_meta"].get("section_versions", {})
+        fell_back = set(previous_report["report_meta"].get("fallback_sections", []))
+        return {
+            section for section, inputs in self.SECTION_DEPENDENCIES.items()
+            if section in previous_report and section not in fell_back and all(
+                built_from.get(name, 0) == session.section_versions.get(name, 0) for name in inputs
+            )
+        }
+    
     async def _evaluate_interview_performance(self, answers: list, cv_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Evaluate interview responses using MERIT rubric"""
+        """Aggregate the per-answer MERIT scores recorded during the interview"""
         
-        if not answers:
+        evaluations = [
+            ans['evaluation'] for ans in answers
+            if ans.get('evaluation') and not ans['evaluation'].get('evaluation_failed')
+        ]
+        if not evaluations:
             return self._default_interview_scores()
         
+        scores = {
+            dimension: round(mean(self._score_value(ev.get(dimension)) for ev in evaluations), 2)
+            for dimension in self.MERIT_DIMENSIONS
+        }
+        scores["overall_interview_score"] = round(mean(scores.values()), 2)
+        scores["detailed_feedback"] = await self._synthesize_interview_feedback(scores, evaluations, cv_data)
+        
+        return scores
+    
+    async def _synthesize_interview_feedback(self, scores: Dict[str, Any], evaluations: list, cv_data: Dict[str, Any]) -> Dict[str, str]:
+        """Turn aggregated scores and per-answer notes into per-dimension feedback"""
+        
+        # Bounded prompt size regardless of interview length
+        compacted = prompt_compactor.compact_lines([ev.get('overall_notes', '') for ev in evaluations])
+        notes = "\n".join(f"- {line}" for line in compacted.text.splitlines())
+        
+        prompt = f"""
+        Summarize this candidate's interview using the MERIT AI rubric.
+        
+        Role: {cv_data.get('role_fit', 'General')}
+        Average scores (1-5): {json.dumps(scores)}
+        
+        Per-answer evaluator notes:
+        {notes}
+        
+        Return JSON with one or two sentences per dimension:
+        {{
+            "communication": "...",
+            "technical": "...",
+            "problem_solving": "...",
+            "professionalism": "...",
+            "culture_fit": "..."
+        }}
+        """
+        
         try:
-            # Compile all Q&A for evaluation
-            qa_text = "\n\n".join([f"Q: {ans.get('question', '')}\nA: {ans.get('answer', '')}" for ans in answers])
-            
-            prompt = f"""
-            Evaluate this interview performance using the MERIT AI rubric:
-            
-            Candidate Background: {cv_data.get('summary', '')}
-            Role: {cv_data.get('role_fit', 'General')}
-            
-            Interview Q&A:
-            {qa_text}
-            
-            Rate on scale 1-5 for each MERIT dimension:
-            1. Communication & English Proficiency
-            2. Technical Knowledge & Role Fit  
-            3. Problem Solving & Thinking
-            4. Professionalism & Digital Presence
-            5. Culture & Work Ethic Alignment
-            
-            Return JSON with:
-            {{
-                "communication_score": 4,
-                "technical_score": 3,
-                "problem_solving_score": 4,
-                "professionalism_score": 5,
-                "culture_fit_score": 4,
-                "overall_interview_score": 4.0,
-                "detailed_feedback": {{
-                    "communication": "Clear and articulate responses...",
-                    "technical": "Good technical knowledge but...",
-                    "problem_solving": "Shows structured thinking...",
-                    "professionalism": "Professional demeanor throughout...",
-                    "culture_fit": "Demonstrates good cultural alignment..."
-                }}
-            }}
-            """
-            
-            response = self.client.chat.completions.create(
+            result = await self.llm.chat(
                 model="gpt-4",
+                operation="report.synthesize_interview_feedback",
+                stage="llm:report",
                 messages=[
-                    {"role": "system", "content": "You are an expert interviewer using the MERIT AI evaluation rubric. Be thorough and fair."},
+                    {"role": "system", "content": "You are an expert interviewer using the MERIT AI evaluation rubric. Be concise and fair."},
                     {"role": "user", "content": prompt}
                 ],
-                temperature=0.3
+                temperature=0.3,
+                max_tokens=400
             )
             
-            result = response.choices[0].message.content
+            # Clean the result - sometimes GPT returns markdown code blocks
+            if result.startswith("```json"):
+                result = result.replace("```json", "").replace("```", "").strip()
+            elif result.startswith("```"):
+                result = result.replace("```", "").strip()
+            
             return json.loads(result)
             
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error in interview evaluation: {str(e)}")
-            return self._default_interview_scores()
         except Exception as e:
-            print(f"Interview evaluation error: {str(e)}")
-            return self._default_interview_scores()
+            print(f"Interview feedback synthesis error: {str(e)}")
+            fallbacks.inc(service="report", method="synthesize_interview_feedback")
+            return {
+                dimension.replace('_score', ''): f"Average score {scores[dimension]}/5 across {len(evaluations)} answers"
+                for dimension in self.MERIT_DIMENSIONS
+            }
+    
+    def _score_value(self, value: Any) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 3.0
+    
+    async def _run_branch(self, name: str, coro, fallback, fell_back: set) -> Dict[str, Any]:
+        """Run one report branch, falling back on its own if it fails or times out.
+        
+        Branches that fall back are added to fell_back so the report is not cached as final.
+        """
+        try:
+            return await asyncio.wait_for(coro, timeout=self.branch_timeout)
+        except asyncio.TimeoutError:
+            print(f"Report branch {name} timed out after {self.branch_timeout}s")
+        except Exception as e:
+            print(f"Report branch {name} failed: {str(e)}")
+        fell_back.add(name)
+        return fallback()
+    
+    async def _evaluate_assessment(self, assessment: Dict[str, Any], assessment_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Score the raw assessment submission"""
+        if not assessment_result or self._has_assessment_scores(assessment_result):
+            return self._process_assessment_scores(assessment_result)
+        
+        if not assessment.get('type'):
+            assessment = {**assessment, "type": assessment_result.get('type', 'general')}
+        
+        evaluation = await self.assessment_service.evaluate_assessment(assessment, assessment_result)
+        scores = self._process_assessment_scores(evaluation)
+        scores["feedback"] = evaluation.get('feedback', '')
+        return scores
+    
+    def _has_assessment_scores(self, assessment_result: Dict[str, Any]) -> bool:
+        return 'correctness_score' in assessment_result or 'overall_score' in assessment_result
+    
+    def _timed_out_assessment_scores(self, assessment_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Neutral scores when the submission could not be evaluated in time"""
+        fallbacks.inc(service="report", method="timed_out_assessment_scores")
+        if not assessment_result:
+            return self._process_assessment_scores(assessment_result)
+        return {
+            "completed": True,
+            "overall_score": 3,
+            "feedback": "Assessment evaluation timed out - manual review required"
+        }
     
     def _default_interview_scores(self) -> Dict[str, Any]:
         """Default scores when evaluation fails"""
+        fallbacks.inc(service="report", method="default_interview_scores")
         return {
             "communication_score": 3,
             "technical_score": 3,
@@ -0,0 +1,227 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Canonical skill -> (category, aliases). Aliases are written the way CVs spell them;
+# the index stores their normalized form, so spacing, dots and case never matter.
+TAXONOMY = {
+    # Programming languages
+    "Python": ("language", ["python3", "py"]),
+    "JavaScript": ("language", ["js", "ecmascript", "es6", "vanilla js"]),
+    "TypeScript": ("language", ["ts"]),
+    "Java": ("language", ["java8", "j2ee", "java ee"]),
+    "Kotlin": ("language", []),
+    "Swift": ("language", []),
+    "Go": ("language", ["golang"]),
+    "Rust": ("language", []),
+    "C": ("language", []),
+    "C++": ("language", ["cpp", "cplusplus"]),
+    "C#": ("language", ["csharp", "c sharp"]),
+    "Ruby": ("language", []),
+    "PHP": ("language", []),
+    "Scala": ("language", []),
+    "R": ("language", []),
+    "Bash": ("language", ["shell", "shell scripting"]),
+    # Frontend
+    "React": ("frontend", ["reactjs", "react.js"]),
+    "Angular": ("frontend", ["angularjs", "angular.js"]),
+    "Vue": ("frontend", ["vuejs", "vue.js"]),
+    "Next.js": ("frontend", ["nextjs"]),
+    "HTML": ("frontend", ["html5"]),
+    "CSS": ("frontend", ["css3", "sass", "scss"]),
+    "Tailwind CSS": ("frontend", ["tailwind"]),
+    # Backend
+    "Node.js": ("backend", ["node", "nodejs"]),
+    "Express": ("backend", ["expressjs", "express.js"]),
+    "Django": ("backend", []),
+    "Flask": ("backend", []),
+    "FastAPI": ("backend", []),
+    "Spring": ("backend", ["spring boot", "springboot", "spring framework"]),
+    "Ruby on Rails": ("backend", ["Rails", "RoR"]),
+    ".NET": ("backend", ["dotnet", "asp.net", ".net core"]),
+    "Laravel": ("backend", []),
+    "GraphQL": ("backend", []),
+    "REST": ("backend", ["rest api", "rest apis", "restful", "restful apis"]),
+    "gRPC": ("backend", []),
+    # Mobile
+    "React Native": ("mobile", []),
+    "Flutter": ("mobile", []),
+    "iOS": ("mobile", []),
+    "Android": ("mobile", []),
+    # Databases and messaging
+    "SQL": ("database", []),
+    "PostgreSQL": ("database", ["postgres", "postgre sql"]),
+    "MySQL": ("database", []),
+    "MongoDB": ("database", ["mongo"]),
+    "Redis": ("database", []),
+    "Elasticsearch": ("database", ["elastic search", "elk"]),
+    "Supabase": ("database", []),
+    "Firebase": ("database", []),
+    "Kafka": ("database", ["apache kafka"]),
+    "RabbitMQ": ("database", []),
+    # Cloud and DevOps
+    "AWS": ("cloud", ["amazon web services"]),
+    "Azure": ("cloud", ["microsoft azure"]),
+    "Google Cloud": ("cloud", ["gcp", "google cloud platform"]),
+    "Docker": ("devops", []),
+    "Kubernetes": ("devops", ["k8s"]),
+    "Terraform": ("devops", []),
+    "Ansible": ("devops", []),
+    "Jenkins": ("devops", []),
+    "GitHub Actions": ("devops", []),
+    "Git": ("devops", ["github", "gitlab"]),
+    "Linux": ("devops", ["unix"]),
+    # Data and machine learning
+    "Spark": ("data", ["apache spark", "pyspark"]),
+    "Hadoop": ("data", []),
+    "Airflow": ("data", ["apache airflow"]),
+    "Pandas": ("data", []),
+    "NumPy": ("data", []),
+    "Tableau": ("data", []),
+    "Power BI": ("data", ["powerbi"]),
+    "Excel": ("data", ["microsoft excel", "ms excel"]),
+    "TensorFlow": ("ml", []),
+    "PyTorch": ("ml", ["torch"]),
+    "scikit-learn": ("ml", ["sklearn", "scikit learn"]),
+    # Tools
+    "Figma": ("tools", []),
+    "Jira": ("tools", []),
+    "Salesforce": ("tools", []),
+    # Practices and domains
+    "Machine Learning": ("data_practice", ["ml"]),
+    "Deep Learning": ("data_practice", ["dl"]),
+    "Data Analysis": ("data_practice", ["data analytics", "analytics"]),
+    "Data Science": ("data_practice", []),
+    "Data Engineering": ("data_practice", ["etl"]),
+    "DevOps": ("practice", []),
+    "CI/CD": ("practice", ["continuous integration", "continuous delivery", "continuous deployment"]),
+    "Microservices": ("practice", ["microservice architecture"]),
+    "System Design": ("practice", ["software architecture", "systems design"]),
+    "Distributed Systems": ("practice", []),
+    "Testing": ("practice", ["unit testing", "test automation", "automated testing", "tdd"]),
+    "Security": ("practice", ["cybersecurity", "application security"]),
+    "Performance Optimization": ("practice", ["performance tuning"]),
+    "Cloud Architecture": ("practice", []),
+    "UX Design": ("design", ["ux", "user experience"]),
+    "UI Design": ("design", ["ui", "user interface design"]),
+    "A/B Testing": ("design", ["ab testing", "experimentation"]),
+    # Management and soft skills
+    "Agile": ("management", ["scrum", "kanban"]),
+    "Project Management": ("management", ["pmp"]),
+    "Product Management": ("management", ["product strategy"]),
+    "Stakeholder Management": ("management", []),
+    "Roadmapping": ("management", ["product roadmap", "roadmaps"]),
+    "Leadership": ("soft_skill", ["team leadership", "people management"]),
+    "Mentoring": ("soft_skill", ["coaching"]),
+    "Communication": ("soft_skill", ["communication skills"]),
+    "Problem Solving": ("soft_skill", ["problem-solving"]),
+}
+
+# Categories reported as technologies; everything else is a skill
+TECHNOLOGY_CATEGORIES = {
+    "language", "frontend", "backend", "mobile", "database", "cloud", "devops", "data", "ml", "tools"
+}
+
+# Categories that mean the candidate writes code, so gets a coding assessment
+CODING_CATEGORIES = {"language", "frontend", "backend", "mobile"}
+
+# Entries in those categories that analysts, PMs and designers list too: markup, styling,
+# API styles and platform names are not something to set a coding exercise in
+NOT_ASSESSABLE = {"HTML", "CSS", "Tailwind CSS", "REST", "GraphQL", "gRPC", "iOS", "Android"}
+
+VERSION_SUFFIX = re.compile(r"v?\d+(\.\d+)*x?$")
+
+# Canonical role families, checked in order against the lowercased role; the first keyword hit wins
+ROLE_FAMILIES = [
+    ("Full Stack Developer", ["full stack", "fullstack", "full-stack"]),
+    ("Mobile Developer", ["mobile", "ios", "android", "flutter", "react native"]),
+    ("Frontend Developer", ["frontend", "front-end", "front end", "ui developer", "web developer"]),
+    ("Backend Developer", ["backend", "back-end", "back end", "api developer"]),
+    ("Data Engineer", ["data engineer", "etl", "big data"]),
+    ("Machine Learning Engineer", ["machine learning", "ml engineer", "ai engineer", "deep learning"]),
+    ("Data Scientist", ["data scien"]),
+    ("Data Analyst", ["analyst", "business intelligence", "bi developer"]),
+    ("DevOps Engineer", ["devops", "sre", "site reliability", "platform engineer", "cloud engineer", "infrastructure"]),
+    ("QA Engineer", ["qa", "quality assurance", "test engineer", "sdet"]),
+    ("Product Manager", ["product manager", "product owner", "product lead"]),
+    ("Project Manager", ["project manager", "program manager", "scrum master", "delivery manager"]),
+    ("Designer", ["designer", "ux", "ui/ux"]),
+    ("Software Engineer", ["developer", "engineer", "programmer"]),
+]
+
+class Skill(NamedTuple):
+    name: str
+    category: str
+    assessable: bool = False  # a language or framework a coding assessment can be written in
+
+    @property
+    def is_technology(self) -> bool:
+        return self.category in TECHNOLOGY_CATEGORIES
+
+def normalize(raw: str) -> str:
+    """Lowercase and drop separators, so 'React.js', 'ReactJS' and 'react js' agree"""
+    return re.sub(r"[\s._\-/]+", "", str(raw).strip().lower())
+
+class SkillTaxonomy:
+    """Maps raw skill strings to canonical skills through a hash of normalized aliases.
+
+    A lookup normalizes the string once and does a dictionary probe, so it
+    costs O(length) regardless of the taxonomy size.
+    """
+
+    def __init__(self, taxonomy: Dict[str, tuple] = None):
+        self._index: Dict[str, Skill] = {}
+        self.aliases: Dict[str, str] = {}
+        for name, (category, aliases) in (taxonomy or TAXONOMY).items():
+            skill = Skill(name, category, category in CODING_CATEGORIES and name not in NOT_ASSESSABLE)
+            for alias in [name] + aliases:
+                self._index.setdefault(normalize(alias), skill)
+                self.aliases.setdefault(alias, name)
+
+    def lookup(self, raw: str) -> Optional[Skill]:
+        key = normalize(raw)
+        skill = self._index.get(key)
+        if skill is None:
+            # 'Python 3.11', 'Angular 15', 'Vue3'
+            base = VERSION_SUFFIX.sub("", key)
+            if len(base) >= 2 and base != key:
+                skill = self._index.get(base)
+        return skill
+
+    def canonicalize(self, raws: Iterable[str]) -> List[str]:
+        """Canonical names in first-seen order, without duplicates; unknown entries are kept as written"""
+        seen, result = set(), []
+        for raw in raws or []:
+            if not isinstance(raw, str) or not raw.strip():
+                continue
+            skill = self.lookup(raw)
+            name = skill.name if skill else raw.strip()
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                result.append(name)
+        return result
+
+    def categorize(self, raws: Iterable[str]) -> Dict[str, List[str]]:
+        """Canonical names grouped by category; unknown entries go under 'other'"""
+        categories: Dict[str, List[str]] = {}
+        for name in self.canonicalize(raws):
+            skill = self.lookup(name)
+            categories.setdefault(skill.category if skill else "other", []).append(name)
+        return categories
+
+    def canonical_role(self, role: str) -> str:
+        """Role family of a free-text role, e.g. 'Senior React Frontend Developer' -> 'Frontend Developer'"""
+        lowered = f" {str(role or '').lower()} "
+        for family, keywords in ROLE_FAMILIES:
+            if any(re.search(rf"(?<![a-z]){re.escape(keyword)}", lowered) for keyword in keywords):
+                return family
+        return "General"
+
+    def primary_coding_technology(self, raws: Iterable[str]) -> Optional[str]:
+        """The first listed language or framework a coding assessment can be written in"""
+        for name in self.canonicalize(raws):
+            skill = self.lookup(name)
+            if skill and skill.assessable:
+                return skill.name
+        return None
+
+skill_taxonomy = SkillTaxonomy()
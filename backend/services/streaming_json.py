@@ -0,0 +1,102 @@
+import json
+from typing import Any, Dict, List
+
+class _IncrementalJSONContainer:
+    """Splits a streamed top-level JSON container into members as they complete.
+
+    Only string/bracket nesting is tracked while scanning; each member is
+    decoded with json.loads once the comma or closing bracket after it arrives,
+    so the total work stays linear in the length of the text.
+    """
+
+    OPEN = ""
+
+    def __init__(self):
+        self.complete = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._member_start = 0
+
+    def _scan(self, text: str) -> List[str]:
+        """Add streamed text and return the raw text of the members completed by it"""
+        self._buffer += text
+        members = []
+
+        while self._pos < len(self._buffer) and not self.complete:
+            ch = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif not self._started:
+                # Skip anything before the container, e.g. a markdown code fence
+                if ch == self.OPEN:
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    members.append(self._buffer[self._member_start:self._pos])
+                    self.complete = True
+            elif ch == "," and self._depth == 1:
+                members.append(self._buffer[self._member_start:self._pos])
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        return [member.strip() for member in members if member.strip()]
+
+class IncrementalJSONObject(_IncrementalJSONContainer):
+    """Parses the top-level members of a JSON object as its text streams in"""
+
+    OPEN = "{"
+
+    def __init__(self):
+        super().__init__()
+        self.fields: Dict[str, Any] = {}
+
+    def feed(self, text: str) -> Dict[str, Any]:
+        """Add streamed text and return the members completed by it"""
+        completed: Dict[str, Any] = {}
+        for member in self._scan(text):
+            try:
+                parsed = json.loads("{" + member + "}")
+            except json.JSONDecodeError:
+                continue
+            self.fields.update(parsed)
+            completed.update(parsed)
+        return completed
+
+class IncrementalJSONArray(_IncrementalJSONContainer):
+    """Parses the top-level elements of a JSON array as its text streams in"""
+
+    OPEN = "["
+
+    def __init__(self):
+        super().__init__()
+        self.items: List[Any] = []
+
+    def feed(self, text: str) -> List[Any]:
+        """Add streamed text and return the elements completed by it"""
+        completed = []
+        for member in self._scan(text):
+            try:
+                parsed = json.loads(member)
+            except json.JSONDecodeError:
+                continue
+            self.items.append(parsed)
+            completed.append(parsed)
+        return completed
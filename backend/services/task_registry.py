@@ -0,0 +1,57 @@
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+from services.tracing import span
+
+class SessionTaskRegistry:
+    """Background work grouped by session, so later requests can wait on it"""
+
+    def __init__(self):
+        self._tasks: Dict[str, Dict[str, asyncio.Task]] = {}
+
+    def spawn(self, session_id: str, name: str, coro: Awaitable[Any]) -> asyncio.Task:
+        """Run coro in the background under a per-session name"""
+        task = asyncio.create_task(self._run(session_id, name, coro))
+        self._tasks.setdefault(session_id, {})[name] = task
+        task.add_done_callback(lambda done: self._forget(session_id, name, done))
+        return task
+
+    def get(self, session_id: str, name: str) -> Optional[asyncio.Task]:
+        return self._tasks.get(session_id, {}).get(name)
+
+    async def wait(self, session_id: str, prefix: str = ""):
+        """Wait for every in-flight task of a session whose name starts with prefix"""
+        tasks = [
+            task for name, task in self._tasks.get(session_id, {}).items()
+            if name.startswith(prefix)
+        ]
+        if tasks:
+            # Shielded so a dropped request does not cancel work other requests rely on
+            with span(f"wait:{prefix.rstrip(':') or 'tasks'}"):
+                await asyncio.gather(*[asyncio.shield(task) for task in tasks], return_exceptions=True)
+
+    def discard(self, session_id: str):
+        """Cancel a session's outstanding work"""
+        for task in self._tasks.pop(session_id, {}).values():
+            task.cancel()
+
+    def close(self):
+        for session_id in list(self._tasks):
+            self.discard(session_id)
+
+    async def _run(self, session_id: str, name: str, coro: Awaitable[Any]) -> Any:
+        try:
+            return await coro
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Background task {name} failed for session {session_id}: {str(e)}")
+            raise
+
+    def _forget(self, session_id: str, name: str, task: asyncio.Task):
+        if not task.cancelled():
+            task.exception()  # already logged in _run; mark it as retrieved
+        tasks = self._tasks.get(session_id)
+        if tasks and tasks.get(name) is task:
+            del tasks[name]
+            if not tasks:
+                del self._tasks[session_id]
@@ -0,0 +1,167 @@
+from config import config
+import re
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+
+class Span:
+    """One timed stage of a request, with the stages it ran nested inside it"""
+
+    def __init__(self, name: str, parent: "Span" = None):
+        self.name = name
+        self.parent = parent
+        self.root: "Span" = parent.root if parent else self
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration_ms(self) -> Optional[float]:
+        if self.end is None:
+            return None
+        return (self.end - self.start) * 1000
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    def walk(self):
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "offset_ms": round((self.start - self.root.start) * 1000, 2),
+            "duration_ms": round(self.duration_ms, 2) if self.end is not None else None,
+            "children": [child.to_dict() for child in list(self.children)]
+        }
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+@contextmanager
+def span(name: str):
+    """Time a stage under the current request's span.
+
+    Outside a request, or once the request has been answered, this does
+    nothing: background work that outlives its request (enrichment, audio
+    synthesis, batch jobs) is detached from that request's trace instead of
+    growing it after the fact.
+    """
+    parent = _current_span.get()
+    if parent is None or parent.root.end is not None:
+        yield None
+        return
+
+    child = Span(name, parent)
+    parent.children.append(child)
+    token = _current_span.set(child)
+    try:
+        yield child
+    finally:
+        child.finish()
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # An async generator closed from another task; that context is gone anyway
+            pass
+
+def server_timing(root: Span) -> str:
+    """Server-Timing header value: finished stages summed by name, then the total so far"""
+    totals: Dict[str, float] = {}
+    for stage in root.walk():
+        if stage is not root and stage.end is not None:
+            totals[stage.name] = totals.get(stage.name, 0.0) + stage.duration_ms
+
+    entries = [
+        # Metric names are HTTP tokens, so 'llm:cv' goes out as 'llm-cv' with the original as its description
+        f'{re.sub(r"[^A-Za-z0-9_.-]", "-", name)};desc="{name}";dur={duration:.1f}'
+        for name, duration in totals.items()
+    ]
+    entries.append(f"total;dur={(time.perf_counter() - root.start) * 1000:.1f}")
+    return ", ".join(entries)
+
+class SlowRequestLog:
+    """Ring buffer of the most recent requests slower than the threshold, with their span trees"""
+
+    def __init__(self, threshold_ms: float = None, size: int = None):
+        self.threshold_ms = config.SLOW_REQUEST_THRESHOLD_MS if threshold_ms is None else threshold_ms
+        self._entries: Deque[Dict[str, Any]] = deque(maxlen=size or config.SLOW_REQUEST_LOG_SIZE)
+
+    def record(self, method: str, path: str, status: Optional[int], root: Span):
+        if root.duration_ms < self.threshold_ms:
+            return
+        self._entries.append({
+            "method": method,
+            "path": path,
+            "status": status,
+            "duration_ms": round(root.duration_ms, 2),
+            "finished_at": time.time(),
+            "spans": root.to_dict()
+        })
+
+    def entries(self, limit: int = None) -> List[Dict[str, Any]]:
+        """Recorded requests, newest first"""
+        entries = list(reversed(self._entries))
+        return entries[:limit] if limit else entries
+
+    def clear(self):
+        self._entries.clear()
+
+slow_requests = SlowRequestLog()
+
+@contextmanager
+def background_trace(name: str, log: SlowRequestLog = None):
+    """Root span for background work that runs outside any request, such as write-behind flushes.
+
+    Stages inside it are timed like a request's, and a slow run goes to the
+    slow-request log with method BACKGROUND and the name as its path.
+    """
+    root = Span(name)
+    token = _current_span.set(root)
+    try:
+        yield root
+    finally:
+        root.finish()
+        _current_span.reset(token)
+        (log or slow_requests).record("BACKGROUND", name, None, root)
+
+class ServerTimingMiddleware:
+    """ASGI middleware that opens a root span per HTTP request.
+
+    The Server-Timing header carries the stages finished by the time the
+    response starts, which for ordinary responses is all of them.
+    Requests over the slow threshold go to the slow-request log once the
+    response body is complete.
+    """
+
+    def __init__(self, app, log: SlowRequestLog = None):
+        self.app = app
+        self.log = log or slow_requests
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        root = Span(f"{scope['method']} {scope['path']}")
+        token = _current_span.set(root)
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(root).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            root.finish()
+            _current_span.reset(token)
+            self.log.record(scope["method"], scope["path"], status, root)
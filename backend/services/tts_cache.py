@@ -0,0 +1,124 @@
+from config import config
+import os
+import re
+import json
+import uuid
+import asyncio
+import hashlib
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+class TTSAudioCache:
+    """Size-bounded on-disk LRU of synthesized audio clips.
+
+    Hits are returned as file paths so responses can stream straight from
+    disk. Recency survives restarts through file modification times.
+    """
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = None):
+        self.cache_dir = cache_dir or config.TTS_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else config.TTS_CACHE_MAX_BYTES
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def key(self, voice_id: str, model_id: str, voice_settings: Dict[str, Any], text: str) -> str:
+        payload = json.dumps(
+            [voice_id, model_id, voice_settings, self.normalize_text(text)],
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Return the clip path on a hit and mark it most recently used"""
+        path = self._path(key)
+        if key not in self._index or not os.path.exists(path):
+            self._forget(key)
+            self.misses += 1
+            return None
+
+        self._index.move_to_end(key)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return path
+
+    async def put(self, key: str, content: bytes):
+        """Store a clip and evict least recently used clips past the size bound"""
+        if len(content) > self.max_bytes:
+            return
+        try:
+            await asyncio.to_thread(self._write, key, content)
+        except OSError as e:
+            print(f"TTS cache write error: {str(e)}")
+            return
+        self._add(key, len(content))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._index),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def _add(self, key: str, size: int):
+        self._forget(key)
+        self._index[key] = size
+        self.total_bytes += size
+        self._evict()
+
+    def _forget(self, key: str):
+        size = self._index.pop(key, None)
+        if size is not None:
+            self.total_bytes -= size
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".mp3"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            entries.append((stat.st_mtime, name[:-len(".mp3")], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _write(self, key: str, content: bytes):
+        path = self._path(key)
+        # Unique per writer, so concurrent writes of one key never share a temp file
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -1,14 +1,31 @@
-import openai
-import requests
+import httpx
 from config import config
+from services.llm_gateway import llm_gateway
+from services.tts_cache import TTSAudioCache
+from services.metrics import track_call, tts_characters
 import io
-from typing import BinaryIO
+from typing import AsyncIterator, List, Optional
 
 class VoiceService:
     def __init__(self):
-        self.openai_client = openai.OpenAI(api_key=config.OPENAI_API_KEY)
+        self.llm = llm_gateway
         self.elevenlabs_url = "https://api.elevenlabs.io/v1"
         self.voice_id = config.ELEVENLABS_VOICE_ID
+        self.model_id = "eleven_monolingual_v1"
+        self.voice_settings = {
+            "stability": 0.5,
+            "similarity_boost": 0.5
+        }
+        self.cache = TTSAudioCache()
+        # Kept-alive connections to ElevenLabs, shared by every request
+        self.http = httpx.AsyncClient(
+            base_url=self.elevenlabs_url,
+            timeout=httpx.Timeout(config.TTS_TIMEOUT, connect=5.0),
+            limits=httpx.Limits(
+                max_connections=config.TTS_MAX_CONNECTIONS,
+                max_keepalive_connections=config.TTS_MAX_CONNECTIONS
+            )
+        )
     
     async def speech_to_text(self, audio_content: bytes) -> str:
         """Convert speech to text using OpenAI Whisper"""
@@ -18,8 +35,10 @@ class VoiceService:
             audio_file.name = "audio.webm"  # Set a filename for the API
             
             # Use OpenAI Whisper API
-            response = self.openai_client.audio.transcriptions.create(
+            response = await self.llm.transcribe(
                 model="whisper-1",
+                operation="voice.speech_to_text",
+                stage="stt",
                 file=audio_file,
                 response_format="text"
             )
@@ -29,11 +48,32 @@ class VoiceService:
         except Exception as e:
             raise Exception(f"Speech to text conversion failed: {str(e)}")
     
-    async def text_to_speech(self, text: str) -> BinaryIO:
-        """Convert text to speech using ElevenLabs"""
+    def _cache_key(self, text: str) -> str:
+        return self.cache.key(self.voice_id, self.model_id, self.voice_settings, text)
+    
+    def cached_audio_path(self, text: str) -> Optional[str]:
+        """Path of a previously synthesized clip for this text, if any"""
+        return self.cache.get_path(self._cache_key(text))
+    
+    async def prewarm(self, phrases: List[str]):
+        """Synthesize phrases that are not cached yet"""
+        for phrase in dict.fromkeys(phrases):
+            if self.cached_audio_path(phrase) is None:
+                await self.synthesize_to_cache(phrase)
+    
+    async def synthesize_to_cache(self, text: str) -> Optional[str]:
+        """Synthesize the full clip into the cache and return its path"""
+        audio_stream = await self.text_to_speech(text)
+        if audio_stream is None:
+            return None
+        
+        async for _ in audio_stream:
+            pass
+        return self.cache.get_path(self._cache_key(text))
+    
+    async def text_to_speech(self, text: str) -> Optional[AsyncIterator[bytes]]:
+        """Stream speech for text from ElevenLabs as it is synthesized"""
         try:
-            url = f"{self.elevenlabs_url}/text-to-speech/{self.voice_id}"
-            
             headers = {
                 "Accept": "audio/mpeg",
                 "Content-Type": "application/json",
@@ -42,26 +82,25 @@ class VoiceService:
             
             data = {
                 "text": text,
-                "model_id": "eleven_monolingual_v1",
-                "voice_settings": {
-                    "stability": 0.5,
-                    "similarity_boost": 0.5
-                }
+                "model_id": self.model_id,
+                "voice_settings": self.voice_settings
             }
             
-            # Run the synchronous request in a thread pool
-            import asyncio
-            loop = asyncio.get_event_loop()
-            
-            def make_request():
-                response = requests.post(url, json=data, headers=headers, timeout=30)
-                if response.status_code == 200:
-                    return response.content
-                else:
-                    raise Exception(f"ElevenLabs API error: {response.status_code} - {response.text}")
+            request = self.http.build_request(
+                "POST", f"/text-to-speech/{self.voice_id}/stream", json=data, headers=headers
+            )
+            # Timed up to the response headers, i.e. the wait before audio starts
+            async with track_call("elevenlabs", "voice.text_to_speech", self.model_id, "tts"):
+                tts_characters.inc(len(text), model=self.model_id)
+                response = await self.http.send(request, stream=True)
+                
+                # Fail before any audio is forwarded so the endpoint can still report it
+                if response.status_code != 200:
+                    error_body = await response.aread()
+                    await response.aclose()
+                    raise Exception(f"ElevenLabs API error: {response.status_code} - {error_body[:500].decode(errors='replace')}")
             
-            content = await loop.run_in_executor(None, make_request)
-            return io.BytesIO(content)
+            return self._relay_audio(response, self._cache_key(text))
                 
         except Exception as e:
             # Log the error for debugging
@@ -71,6 +110,24 @@ class VoiceService:
             # Frontend will handle gracefully
             return None
     
+    async def _relay_audio(self, response: httpx.Response, cache_key: str) -> AsyncIterator[bytes]:
+        """Forward audio chunks as they arrive and cache the clip once complete"""
+        chunks = []
+        complete = False
+        try:
+            async for chunk in response.aiter_bytes():
+                chunks.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            await response.aclose()
+        
+        if complete:
+            await self.cache.put(cache_key, b"".join(chunks))
+    
+    async def close(self):
+        await self.http.aclose()
+    
     def get_supported_audio_formats(self) -> list:
         """Return list of supported audio formats"""
         return ["webm", "mp3", "wav", "m4a", "ogg"]
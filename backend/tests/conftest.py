@@ -0,0 +1,24 @@
+"""
+Shared setup for the backend unit tests
+Run from backend/ with: python -m pytest tests
+"""
+
+import os
+import sys
+import tempfile
+
+# Provider clients are created at import time; the tests never reach the real services
+_scratch = tempfile.mkdtemp(prefix="recruiter-tests-")
+for name, value in {
+    "OPENAI_API_KEY": "sk-test",
+    "ELEVENLABS_API_KEY": "test",
+    "SUPABASE_URL": "https://example.supabase.co",
+    "SUPABASE_KEY": "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJyb2xlIjoiYW5vbiJ9.test",
+    "CV_CACHE_DIR": os.path.join(_scratch, "cv_parse"),
+    "TTS_CACHE_DIR": os.path.join(_scratch, "tts"),
+    "ASSESSMENT_BANK_PATH": os.path.join(_scratch, "assessment_bank.json"),
+    "TTS_PREWARM": "false",
+}.items():
+    os.environ.setdefault(name, value)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
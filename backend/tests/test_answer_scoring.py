@@ -0,0 +1,71 @@
+"""
+Tests for per-answer scoring during the interview and its aggregation in the report
+"""
+
+import asyncio
+
+from models.session import InterviewSession
+from services.report import ReportService
+
+def _evaluation(score, failed=False):
+    evaluation = {dimension: score for dimension in ReportService.MERIT_DIMENSIONS}
+    evaluation["overall_notes"] = f"scored {score}"
+    if failed:
+        evaluation["evaluation_failed"] = True
+    return evaluation
+
+def test_report_averages_answer_scores_and_skips_failed_evaluations():
+    service = ReportService()
+    synthesized = {}
+
+    async def synthesize(scores, evaluations, cv_data):
+        synthesized["notes"] = [ev["overall_notes"] for ev in evaluations]
+        return {"communication": "Clear"}
+
+    service._synthesize_interview_feedback = synthesize
+    answers = [
+        {"answer": "a", "evaluation": _evaluation(4)},
+        {"answer": "b", "evaluation": _evaluation(2)},
+        {"answer": "c", "evaluation": _evaluation(3, failed=True)},
+        {"answer": "d"},
+    ]
+
+    scores = asyncio.run(service._evaluate_interview_performance(answers, {}))
+
+    assert scores["technical_score"] == 3.0
+    assert scores["overall_interview_score"] == 3.0
+    assert scores["detailed_feedback"] == {"communication": "Clear"}
+    assert synthesized["notes"] == ["scored 4", "scored 2"]
+
+def test_answers_are_scored_in_the_background_and_gaps_filled_before_the_report(monkeypatch):
+    import app
+
+    scored = []
+
+    async def evaluate_answer(question, answer, cv_data):
+        scored.append(question)
+        await asyncio.sleep(0.01)
+        return _evaluation(len(scored))
+
+    monkeypatch.setattr(app.interview_service, "evaluate_answer", evaluate_answer)
+
+    async def scenario():
+        session = InterviewSession(session_id="scoring", questions=["Q1", "Q2", "Q3"], status="cv_uploaded")
+        await app.session_store.save(session)
+        long_answer = "I profiled the service, found the slow query and added an index to fix it for good."
+        for _ in range(2):
+            await app.submit_answer(session.session_id, {"answer": long_answer})
+
+        # An answer recorded without scoring, e.g. by a worker that went away
+        def add_unscored(latest):
+            latest.answers.append({"question": "Q3", "answer": long_answer})
+        await app.update_session(session.session_id, add_unscored)
+
+        session = await app.ensure_answers_scored(session.session_id)
+        await app.session_store.delete(session.session_id)
+        return session
+
+    session = asyncio.run(scenario())
+    assert sorted(scored) == ["Q1", "Q2", "Q3"]
+    assert all("evaluation" in answer for answer in session.answers)
+    assert session.section_versions["interview"] == session.version
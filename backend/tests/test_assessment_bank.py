@@ -0,0 +1,62 @@
+"""
+Tests for the pre-generated assessment bank
+"""
+
+import asyncio
+import json
+
+from services.assessment_bank import AssessmentBank, difficulty_for
+
+def _coding(title):
+    return {
+        "type": "coding",
+        "title": title,
+        "description": "Implement it",
+        "requirements": ["Tests pass"],
+        "language": "python"
+    }
+
+def test_difficulty_from_seniority_words_then_experience():
+    assert difficulty_for("Senior Backend Developer") == "senior"
+    assert difficulty_for("Jr. Data Analyst", [{}, {}, {}, {}]) == "junior"
+    assert difficulty_for("Backend Developer", [{}]) == "junior"
+    assert difficulty_for("Backend Developer", [{}, {}]) == "mid"
+    assert difficulty_for("Backend Developer", [{}] * 5) == "senior"
+
+def test_added_items_rotate_and_survive_a_reload(tmp_path):
+    path = str(tmp_path / "bank.json")
+    bank = AssessmentBank(path=path, max_per_key=2)
+
+    async def fill():
+        return [
+            await bank.add("Backend Developer", "Python", "mid", _coding("Rate limiter")),
+            await bank.add("Backend Developer", "Python", "mid", _coding("rate limiter ")),
+            await bank.add("Backend Developer", "Python", "mid", {"type": "coding", "title": "No details"}),
+            await bank.add("Backend Developer", "Python", "mid", _coding("LRU cache")),
+            await bank.add("Backend Developer", "Python", "mid", _coding("Job queue")),
+        ]
+
+    assert asyncio.run(fill()) == [True, False, False, True, False]
+
+    reloaded = AssessmentBank(path=path)
+    titles = [reloaded.select("Backend Developer", "Python", "mid")["title"] for _ in range(3)]
+    assert titles == ["Rate limiter", "LRU cache", "Rate limiter"]
+    assert reloaded.select("Backend Developer", None, "mid") is None
+    assert reloaded.stats() == {"keys": 1, "items": 2, "hits": 3, "misses": 1}
+
+def test_selected_items_are_copies(tmp_path):
+    bank = AssessmentBank(path=str(tmp_path / "bank.json"))
+    asyncio.run(bank.add("Data Analyst", None, "junior", _coding("Deduplicate rows")))
+
+    bank.select("Data Analyst", None, "junior")["title"] = "Changed"
+    assert bank.select("Data Analyst", None, "junior")["title"] == "Deduplicate rows"
+
+def test_invalid_items_and_unknown_formats_are_ignored_on_load(tmp_path):
+    path = tmp_path / "bank.json"
+    path.write_text(json.dumps({"format": 1, "items": {"Backend Developer|-|mid": [
+        _coding("Valid"), {"type": "coding", "title": "Missing fields"}
+    ]}}))
+    assert len(AssessmentBank(path=str(path))) == 1
+
+    path.write_text(json.dumps({"format": 99, "items": {"Backend Developer|-|mid": [_coding("Valid")]}}))
+    assert len(AssessmentBank(path=str(path))) == 0
@@ -0,0 +1,88 @@
+"""
+Tests for background pre-synthesis of interview question audio
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from services.audio_store import SessionAudioStore
+from services.tts_cache import TTSAudioCache
+
+class FakeVoice:
+    def __init__(self, tmp_path, delay: float = 0.01, fail: bool = False):
+        self.tmp_path = tmp_path
+        self.delay = delay
+        self.fail = fail
+        self.cache = SimpleNamespace(normalize_text=TTSAudioCache.normalize_text)
+        self.cached = {}
+        self.synthesized = []
+        self.active = 0
+        self.peak = 0
+
+    def cached_audio_path(self, text):
+        return self.cached.get(TTSAudioCache.normalize_text(text))
+
+    async def synthesize_to_cache(self, text):
+        self.synthesized.append(text)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.fail:
+            return None
+        path = self.tmp_path / f"{len(self.synthesized)}.mp3"
+        path.write_bytes(b"audio")
+        self.cached[TTSAudioCache.normalize_text(text)] = str(path)
+        return str(path)
+
+def test_lookup_waits_for_in_flight_synthesis_shared_across_sessions(tmp_path):
+    voice = FakeVoice(tmp_path)
+    store = SessionAudioStore(voice, concurrency=4)
+
+    async def scenario():
+        store.schedule("a", ["Tell me about yourself.", "Why this role?"])
+        store.schedule("b", ["Tell me  about yourself."])
+        return await store.lookup("a", "Tell me about yourself."), await store.lookup("b", "Tell me  about yourself.")
+
+    first, second = asyncio.run(scenario())
+    assert first == second
+    assert sorted(voice.synthesized) == ["Tell me about yourself.", "Why this role?"]
+
+def test_synthesis_concurrency_is_bounded(tmp_path):
+    voice = FakeVoice(tmp_path)
+    store = SessionAudioStore(voice, concurrency=2)
+
+    async def scenario():
+        texts = [f"Question {i}?" for i in range(6)]
+        store.schedule("s", texts)
+        return [await store.lookup("s", text) for text in texts]
+
+    assert all(asyncio.run(scenario()))
+    assert voice.peak == 2
+
+def test_cached_text_is_not_synthesized_again(tmp_path):
+    voice = FakeVoice(tmp_path)
+    voice.cached["Hello"] = str(tmp_path / "hello.mp3")
+    (tmp_path / "hello.mp3").write_bytes(b"audio")
+    store = SessionAudioStore(voice)
+
+    async def scenario():
+        store.schedule("s", ["Hello"])
+        return await store.lookup("s", "Hello")
+
+    assert asyncio.run(scenario()) == str(tmp_path / "hello.mp3")
+    assert voice.synthesized == []
+
+def test_unscheduled_failed_and_discarded_clips_are_misses(tmp_path):
+    store = SessionAudioStore(FakeVoice(tmp_path, fail=True))
+
+    async def scenario():
+        store.schedule("s", ["Hello"])
+        failed = await store.lookup("s", "Hello")
+        unscheduled = await store.lookup("s", "Goodbye")
+        store.discard("s")
+        return failed, unscheduled, await store.lookup("s", "Hello")
+
+    assert asyncio.run(scenario()) == (None, None, None)
@@ -0,0 +1,75 @@
+"""
+Tests for preparing the assessment in the background during the interview
+"""
+
+import asyncio
+
+import pytest
+
+from models.session import InterviewSession
+
+PREPARED = {"type": "coding", "title": "Rate limiter"}
+GENERATED = {"type": "coding", "title": "Generated on demand"}
+
+@pytest.fixture
+def generated(monkeypatch):
+    """Assessments generated on demand, i.e. without background preparation"""
+    import app
+
+    calls = []
+
+    async def generate_assessment(cv_data):
+        calls.append(cv_data)
+        return GENERATED
+
+    monkeypatch.setattr(app.assessment_service, "generate_assessment", generate_assessment)
+    return calls
+
+def _start(session, prepare=None):
+    import app
+
+    async def scenario():
+        await app.session_store.save(session)
+        if prepare:
+            app.background_tasks.spawn(session.session_id, "assessment", prepare(session.session_id))
+        response = await app.start_assessment(session.session_id)
+        stored = await app.session_store.get(session.session_id)
+        await app.session_store.delete(session.session_id)
+        return response, stored
+
+    return asyncio.run(scenario())
+
+def test_prepared_assessment_is_served_without_generating(generated):
+    session = InterviewSession(session_id="prepared", cv_data={"role_fit": "Backend"}, assessment=PREPARED)
+    response, stored = _start(session)
+
+    assert response == {"assessment": PREPARED}
+    assert stored.status == "assessment_active"
+    assert generated == []
+
+def test_start_waits_for_assessment_still_being_prepared(generated):
+    import app
+
+    async def prepare(session_id):
+        await asyncio.sleep(0.05)
+
+        def store(session):
+            session.assessment = PREPARED
+        await app.update_session(session_id, store)
+
+    session = InterviewSession(session_id="in-flight", cv_data={"role_fit": "Backend"})
+    response, stored = _start(session, prepare)
+
+    assert response == {"assessment": PREPARED}
+    assert generated == []
+
+def test_assessment_is_generated_when_preparation_failed(generated):
+    async def prepare(session_id):
+        raise RuntimeError("model unavailable")
+
+    session = InterviewSession(session_id="failed", cv_data={"role_fit": "Backend"})
+    response, stored = _start(session, prepare)
+
+    assert response == {"assessment": GENERATED}
+    assert stored.assessment == GENERATED
+    assert generated == [{"role_fit": "Backend"}]
@@ -0,0 +1,105 @@
+"""
+Tests for the staged bulk CV ingestion pipeline
+"""
+
+import asyncio
+import io
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+
+from services.batch_ingest import BatchIngestService
+from services.cv_cache import CVParseCache
+from services.cv_parser import PROMPT_VERSION, CVParser
+from services.near_duplicates import NearDuplicateIndex
+
+CV_TEXT = (
+    "Jane Doe, backend developer with six years of experience building payment APIs in Python "
+    "and Go. Led the migration of a monolith to event driven services, introduced contract tests "
+    "and cut the p99 latency of the checkout flow in half. Comfortable with PostgreSQL, Redis, "
+    "Kafka and Kubernetes, and mentors two junior engineers."
+)
+
+class FakeInterviewService:
+    async def generate_questions(self, cv_data):
+        return [f"Tell me about {cv_data['original_filename']}"]
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """A batch service over a real parser whose model call is replaced"""
+    parser = CVParser()
+    parser.cache = CVParseCache(PROMPT_VERSION, cache_dir=str(tmp_path))
+    parser.duplicates = NearDuplicateIndex()
+    analyzed = []
+
+    async def analyze_text(text_content, filename, cache_key=None, progress=None):
+        analyzed.append(filename)
+        cv_data = {"candidate_name": filename, "original_filename": filename}
+        await parser.cache.put(cache_key, cv_data)
+        return cv_data
+
+    parser.analyze_text = analyze_text
+    sessions = {}
+
+    async def create_session(cv_data, questions):
+        session_id = f"session-{len(sessions)}"
+        sessions[session_id] = (cv_data["original_filename"], questions)
+        return session_id
+
+    service = BatchIngestService(parser, FakeInterviewService(), create_session)
+    return SimpleNamespace(service=service, analyzed=analyzed, sessions=sessions)
+
+def _upload(filename, content):
+    return SimpleNamespace(filename=filename, file=io.BytesIO(content))
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+def _ingest(service, uploads):
+    async def scenario():
+        job = await service.submit(uploads)
+        while job.status != "completed":
+            await asyncio.sleep(0.01)
+        return job.to_dict()
+
+    return asyncio.run(scenario())
+
+def test_zip_members_become_sessions_and_unsupported_files_fail(pipeline):
+    archive = _zip({
+        "cvs/jane.txt": CV_TEXT,
+        "cvs/john.txt": "John Roe, designer who ships accessible design systems in Figma.",
+        "cvs/notes.docx": "not a CV",
+        "__MACOSX/cvs/._jane.txt": "resource fork",
+    })
+    status = _ingest(pipeline.service, [_upload("cvs.zip", archive), _upload("ann.txt", b"Ann Poe, data engineer.")])
+
+    files = {entry["filename"]: entry for entry in status["files"]}
+    assert sorted(files) == ["ann.txt", "jane.txt", "john.txt", "notes.docx"]
+    assert status["status_counts"] == {"done": 3, "failed": 1}
+    assert files["notes.docx"]["error"] == "unsupported file type"
+    assert sorted(name for name, _ in pipeline.sessions.values()) == ["ann.txt", "jane.txt", "john.txt"]
+    assert pipeline.sessions[files["jane.txt"]["session_id"]] == ("jane.txt", ["Tell me about jane.txt"])
+
+def test_near_duplicates_within_one_batch_find_each_other(pipeline):
+    edited = CV_TEXT.replace("two junior engineers", "three junior engineers")
+    status = _ingest(pipeline.service, [_upload("jane.txt", CV_TEXT.encode()), _upload("jane_v2.txt", edited.encode())])
+
+    first, second = status["files"]
+    assert status["status_counts"] == {"done": 2}
+    assert first["near_duplicates"] == []
+    assert [match["original_filename"] for match in second["near_duplicates"]] == ["jane.txt"]
+
+def test_resubmitted_cv_reuses_the_stored_parse(pipeline):
+    _ingest(pipeline.service, [_upload("jane.txt", CV_TEXT.encode())])
+    status = _ingest(pipeline.service, [_upload("jane_again.txt", CV_TEXT.encode())])
+
+    entry = status["files"][0]
+    assert entry["status"] == "done"
+    assert entry["cache_hit"]
+    assert pipeline.analyzed == ["jane.txt"]
+    assert pipeline.sessions[entry["session_id"]] == ("jane_again.txt", ["Tell me about jane_again.txt"])
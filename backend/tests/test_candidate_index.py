@@ -0,0 +1,93 @@
+"""
+Tests for candidate search
+"""
+
+import re
+import asyncio
+
+import pytest
+
+from models.session import InterviewSession
+from database.session_store import InMemorySessionStore
+from services.candidate_index import CandidateIndex
+
+def _cv(name, role, skills=(), technologies=(), companies=(), summary=""):
+    return {
+        "candidate_name": name,
+        "role_fit": role,
+        "skills": list(skills),
+        "technologies": list(technologies),
+        "experience": [{"company": company} for company in companies],
+        "summary": summary,
+    }
+
+@pytest.fixture
+def index():
+    index = CandidateIndex()
+    index.add("ana", _cv("Ana", "Backend Developer", ["Leadership"], ["Python", "PostgreSQL"], ["Acme Corp"]))
+    index.add("ben", _cv("Ben", "Frontend Developer", ["Communication"], ["ReactJS", "TypeScript"], ["Globex"]))
+    index.add("cai", _cv("Cai", "Full Stack Developer", ["Leadership"], ["React", "Python"], ["Initech"],
+                         summary="Led the move from Django to FastAPI"))
+    return index
+
+def _ids(results):
+    return [result["session_id"] for result in results["results"]]
+
+def test_ranked_search_puts_the_best_match_first(index):
+    results = index.search("python react")
+    assert results["total"] == 3
+    assert _ids(results)[0] == "cai"
+
+def test_aliases_match_the_canonical_skill(index):
+    assert set(_ids(index.search("react.js"))) == {"ben", "cai"}
+
+def test_boolean_operators_and_grouping(index):
+    assert set(_ids(index.search("python AND react", mode="boolean"))) == {"cai"}
+    assert set(_ids(index.search("python NOT react", mode="boolean"))) == {"ana"}
+    assert set(_ids(index.search("(typescript OR postgresql) leadership", mode="boolean"))) == {"ana"}
+    assert set(_ids(index.search("NOT python", mode="boolean"))) == {"ben"}
+
+def test_field_prefixes(index):
+    assert _ids(index.search('company:"Acme Corp"', mode="boolean")) == ["ana"]
+    assert _ids(index.search("skill:leadership tech:typescript", mode="boolean")) == []
+    assert set(_ids(index.search("skills:leadership", mode="boolean"))) == {"ana", "cai"}
+
+@pytest.mark.parametrize("query, message", [
+    ("python AND", "ends unexpectedly"),
+    ("(python OR react", "Missing closing parenthesis"),
+    ("python )", "Unexpected ')'"),
+    ("salary:100k", "Unknown search field"),
+])
+def test_malformed_boolean_queries_raise(index, query, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        index.search(query, mode="boolean")
+
+def test_unknown_mode_raises(index):
+    with pytest.raises(ValueError, match="Unknown search mode"):
+        index.search("python", mode="fuzzy")
+
+def test_removed_and_replaced_documents(index):
+    index.remove("cai")
+    assert set(_ids(index.search("python"))) == {"ana"}
+    assert index.stats()["documents"] == 2
+
+    index.add("ana", _cv("Ana", "Data Scientist", technologies=["Pandas"]))
+    assert _ids(index.search("python")) == []
+    assert _ids(index.search("pandas")) == ["ana"]
+
+def test_evicted_session_drops_out_of_search():
+    import app
+
+    store = InMemorySessionStore(max_sessions=1, on_evict=app.forget_session)
+
+    async def scenario():
+        for session_id, technology in (("evicted", "Elixir"), ("kept", "Haskell")):
+            await store.save(InterviewSession(session_id=session_id))
+            app.candidate_index.add(session_id, _cv(session_id, "Backend Developer", technologies=[technology]))
+
+    try:
+        asyncio.run(scenario())
+        assert _ids(app.candidate_index.search("elixir")) == []
+        assert _ids(app.candidate_index.search("haskell")) == ["kept"]
+    finally:
+        app.candidate_index.remove("kept")
@@ -0,0 +1,46 @@
+"""
+Tests for process-pool document extraction and its CPU limit
+"""
+
+import asyncio
+import sys
+import time
+
+import pytest
+
+from services.document_extractor import CPUBudgetExceeded, DocumentExtractor
+
+def _burn_cpu(seconds: float) -> str:
+    """Stands in for a pathological document: spins for `seconds` of CPU time"""
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+    return "done"
+
+def test_text_files_are_decoded_without_the_pool():
+    extractor = DocumentExtractor(max_workers=1)
+    assert asyncio.run(extractor.extract_text("Jane Doe\nPython".encode("utf-8"), "cv.txt")) == "Jane Doe\nPython"
+    assert extractor._pool is None
+
+@pytest.mark.skipif(sys.platform == "win32", reason="RLIMIT_CPU is not available on Windows")
+def test_slow_task_is_stopped_in_the_worker_and_the_pool_survives():
+    extractor = DocumentExtractor(max_workers=1, cpu_timeout=1, timeout=60)
+
+    async def scenario():
+        started = time.monotonic()
+        with pytest.raises(CPUBudgetExceeded):
+            await extractor.run(_burn_cpu, 30)
+        stopped_after = time.monotonic() - started
+
+        # The same single worker is free again and takes the next task straight away
+        started = time.monotonic()
+        assert await extractor.run(_burn_cpu, 0.1) == "done"
+        return stopped_after, time.monotonic() - started
+
+    try:
+        stopped_after, next_task = asyncio.run(scenario())
+    finally:
+        extractor.shutdown()
+
+    assert stopped_after < 10
+    assert next_task < 5
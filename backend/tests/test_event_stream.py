@@ -0,0 +1,100 @@
+"""
+Tests for relaying background work as Server-Sent Events
+"""
+
+import asyncio
+import json
+
+from fastapi import HTTPException
+
+from models.session import InterviewSession
+from services.event_stream import EventStream
+
+def _parse(chunks):
+    """Split raw SSE chunks into comments and (event, data) pairs"""
+    comments, events = [], []
+    for chunk in chunks:
+        if chunk.startswith(":"):
+            comments.append(chunk[1:].strip())
+            continue
+        lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return comments, events
+
+async def _collect(body):
+    return [chunk async for chunk in body]
+
+def test_events_are_framed_and_heartbeats_fill_idle_gaps():
+    async def scenario():
+        stream = EventStream(heartbeat=0.02)
+
+        async def produce():
+            stream.send("cv_field", {"role_fit": "Backend"})
+            await asyncio.sleep(0.05)
+            stream.send("complete", {"ok": True})
+            stream.close()
+
+        producer = asyncio.create_task(produce())
+        chunks = await _collect(stream.events())
+        await producer
+        return chunks
+
+    chunks = asyncio.run(scenario())
+    comments, events = _parse(chunks)
+
+    assert chunks[0] == ": stream opened\n\n"
+    assert chunks[1] == 'event: cv_field\ndata: {"role_fit": "Backend"}\n\n'
+    assert "keep-alive" in comments
+    assert events == [("cv_field", {"role_fit": "Backend"}), ("complete", {"ok": True})]
+
+def test_stream_ends_with_complete_or_error():
+    import app
+
+    async def work(send):
+        send("progress", {"step": 1})
+        return {"done": True}
+
+    async def failing(send):
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def scenario():
+        ok = await _collect(app.stream_events("sse", "ok", work, "Work failed").body_iterator)
+        failed = await _collect(app.stream_events("sse", "failed", failing, "Work failed").body_iterator)
+        return ok, failed
+
+    ok, failed = asyncio.run(scenario())
+
+    assert _parse(ok)[1] == [("progress", {"step": 1}), ("complete", {"done": True})]
+    assert _parse(failed)[1] == [("error", {"detail": "Work failed: Session not found"})]
+
+def test_report_stream_emits_each_section_before_completing(monkeypatch):
+    import app
+
+    async def generate_report(session, previous_report, on_section):
+        report = {"session_metadata": {"session_id": session.session_id}, "report_meta": {"fallback_sections": []}}
+        for name in ("candidate_info", "recommendation"):
+            report[name] = {"name": name}
+            on_section(name, report[name])
+        return report
+
+    async def save_report(session_id, report):
+        return True
+
+    monkeypatch.setattr(app.report_service, "generate_report", generate_report)
+    monkeypatch.setattr(app.db, "save_report", save_report)
+
+    async def scenario():
+        await app.session_store.save(InterviewSession(session_id="sse-report", status="interview_completed"))
+        response = await app.generate_report_stream("sse-report")
+        chunks = await _collect(response.body_iterator)
+        await app.background_tasks.wait("sse-report")
+        await app.session_store.delete("sse-report")
+        return response, chunks
+
+    response, chunks = asyncio.run(scenario())
+    _, events = _parse(chunks)
+
+    assert response.media_type == "text/event-stream"
+    assert [event for event, _ in events] == ["report_section", "report_section", "complete"]
+    assert [data["name"] for _, data in events[:2]] == ["candidate_info", "recommendation"]
+    assert events[-1][1]["session_metadata"] == {"session_id": "sse-report"}
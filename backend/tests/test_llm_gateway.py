@@ -0,0 +1,97 @@
+"""
+Tests for the shared LLM gateway
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services.llm_gateway import LLMGateway
+
+class FakeCompletions:
+    def __init__(self, delay: float = 0.0, chunks=("Hel", "lo")):
+        self.delay = delay
+        self.chunks = list(chunks)
+        self.active = 0
+        self.peak = 0
+
+    async def create(self, model, messages, stream=False, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if stream:
+            return FakeStream(self.chunks)
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="answer"))], usage=usage)
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        delta = SimpleNamespace(content=self.chunks.pop(0))
+        return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+    async def close(self):
+        self.closed = True
+
+def _gateway(completions: FakeCompletions, limit: int = 2) -> LLMGateway:
+    gateway = LLMGateway()
+    gateway.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    gateway._limits = {"gpt-4": limit}
+    return gateway
+
+def test_chat_returns_message_content():
+    gateway = _gateway(FakeCompletions())
+    assert asyncio.run(gateway.chat([{"role": "user", "content": "hi"}], operation="test.chat")) == "answer"
+
+def test_concurrency_is_bounded_per_model():
+    completions = FakeCompletions(delay=0.02)
+    gateway = _gateway(completions, limit=2)
+
+    async def scenario():
+        return await asyncio.gather(*[
+            gateway.chat([{"role": "user", "content": str(i)}]) for i in range(6)
+        ])
+
+    assert asyncio.run(scenario()) == ["answer"] * 6
+    assert completions.peak == 2
+
+def test_timeout_includes_time_spent_queueing():
+    gateway = _gateway(FakeCompletions(delay=0.3), limit=1)
+
+    async def scenario():
+        slow = asyncio.create_task(gateway.chat([{"role": "user", "content": "first"}]))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await gateway.chat([{"role": "user", "content": "queued"}], timeout=0.05)
+        return await slow
+
+    assert asyncio.run(scenario()) == "answer"
+
+def test_stream_yields_deltas_and_frees_the_slot_when_closed_early():
+    gateway = _gateway(FakeCompletions(chunks=["a", "b", "c"]), limit=1)
+
+    async def scenario():
+        received = []
+        stream = gateway.stream_chat([{"role": "user", "content": "hi"}])
+        async for delta in stream:
+            received.append(delta)
+            if len(received) == 2:
+                break
+        await stream.aclose()
+        # The single slot is free again
+        whole = [delta async for delta in gateway.stream_chat([{"role": "user", "content": "again"}])]
+        return received, whole
+
+    assert asyncio.run(scenario()) == (["a", "b"], ["a", "b", "c"])
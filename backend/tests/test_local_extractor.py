@@ -0,0 +1,40 @@
+"""
+Tests for deterministic CV field extraction
+"""
+
+from services.local_extractor import LocalCVExtractor
+
+CV = """JANE DOE | jane.doe@example.com | +44 20 7946 0958
+Curriculum Vitae
+Acme Corp, Senior Engineer  Jan 2019 - Present
+Initech, Developer 2015 to 2018
+BSc Computer Science, University of Leeds 2011 - 2015
+Built REST APIs in Python and Go with PostgreSQL, React Native apps, and some react.
+Will go to the shell. Leadership of a team of five."""
+
+def test_contact_details_experience_and_education():
+    profile = LocalCVExtractor().extract(CV)
+
+    assert profile["candidate_name"] == "Jane Doe"
+    assert profile["email"] == "jane.doe@example.com"
+    assert profile["phone"] == "+44 20 7946 0958"
+    assert profile["experience"] == [
+        {"duration": "Jan 2019 - Present", "description": "Acme Corp, Senior Engineer"},
+        {"duration": "2015 - 2018", "description": "Initech, Developer"},
+    ]
+    assert [(entry["degree"], entry["year"]) for entry in profile["education"]] == [("BSc", "2015")]
+
+def test_terms_are_canonical_ordered_and_case_aware():
+    skills, technologies = LocalCVExtractor().match_terms(CV)
+
+    # "React Native" wins over "React"; lowercase "go" and "shell" are everyday words here
+    assert technologies == ["REST", "Python", "Go", "PostgreSQL", "React Native", "React"]
+    assert skills == ["Leadership"]
+
+def test_missing_fields_get_placeholders():
+    profile = LocalCVExtractor().extract("worked on some things\n2020")
+
+    assert profile["candidate_name"] == "Unknown"
+    assert profile["email"] == "unknown@example.com"
+    assert profile["phone"] == ""
+    assert profile["experience"] == [] and profile["technologies"] == []
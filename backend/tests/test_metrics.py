@@ -0,0 +1,76 @@
+"""
+Tests for the Prometheus metrics registry and provider call tracking
+"""
+
+import asyncio
+
+import pytest
+
+from services.metrics import MetricsRegistry, provider_in_flight, provider_requests, track_call
+
+def test_registry_renders_the_text_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("path",))
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    requests.inc(path='/say "hi"')
+    requests.inc(2, path="/a")
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests",
+        "# TYPE requests_total counter",
+        'requests_total{path="/a"} 2',
+        'requests_total{path="/say \\"hi\\""} 1',
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+
+def test_labels_and_names_are_checked():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "Calls", ("provider",))
+
+    with pytest.raises(ValueError):
+        counter.inc(model="gpt")
+    with pytest.raises(ValueError):
+        registry.gauge("calls_total", "Calls again")
+
+def test_a_failing_collector_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    size = registry.gauge("size", "Size")
+    registry.add_collector(lambda: 1 / 0)
+    registry.add_collector(lambda: size.set(7))
+
+    assert "size 7" in registry.render()
+
+def test_track_call_counts_outcomes_and_restores_in_flight():
+    labels = {"provider": "test", "method": "track_call", "model": "m"}
+
+    async def scenario():
+        async with track_call(**labels):
+            assert provider_in_flight.value(**labels) == 1
+        with pytest.raises(RuntimeError):
+            async with track_call(**labels):
+                raise RuntimeError("provider down")
+
+    asyncio.run(scenario())
+
+    assert provider_requests.value(**labels, status="ok") == 1
+    assert provider_requests.value(**labels, status="error") == 1
+    assert provider_in_flight.value(**labels) == 0
+
+def test_metrics_endpoint_includes_service_gauges():
+    import app
+
+    response = asyncio.run(app.get_metrics())
+    body = response.body.decode()
+
+    assert response.media_type.startswith("text/plain")
+    assert "# TYPE provider_request_duration_seconds histogram" in body
+    assert 'cache_lookups{cache="question_set",outcome="hit"}' in body
+    assert 'index_documents{index="near_duplicates"}' in body
@@ -0,0 +1,55 @@
+"""
+Tests for MinHash/LSH near-duplicate CV detection
+"""
+
+from services.near_duplicates import NearDuplicateIndex, shingles
+
+WORDS = [f"word{i}" for i in range(300)]
+BASE = " ".join(WORDS)
+
+def _edited(every):
+    """BASE with every n-th word changed"""
+    return " ".join(f"edited{word}" if i % every == 0 else word for i, word in enumerate(WORDS))
+
+def _jaccard(a, b):
+    a, b = shingles(a), shingles(b)
+    return len(a & b) / len(a | b)
+
+def test_only_documents_above_the_threshold_are_reported():
+    index = NearDuplicateIndex(threshold=0.8, num_perm=128)
+    light, heavy = _edited(100), _edited(6)
+    assert _jaccard(BASE, light) > 0.9 and _jaccard(BASE, heavy) < 0.5
+
+    index.add("light", index.signature(light), {"original_filename": "light.pdf"})
+    index.add("heavy", index.signature(heavy), {"original_filename": "heavy.pdf"})
+    matches = index.query(index.signature(BASE))
+
+    assert [match["document_id"] for match in matches] == ["light"]
+    assert matches[0]["original_filename"] == "light.pdf"
+    assert abs(matches[0]["similarity"] - _jaccard(BASE, light)) < 0.1
+
+def test_reformatting_does_not_change_the_signature():
+    index = NearDuplicateIndex()
+    reformatted = "\n\n".join(word.upper() + "," for word in WORDS)
+
+    assert index.signature(reformatted) == index.signature(BASE)
+
+def test_exclude_remove_and_capacity():
+    index = NearDuplicateIndex(max_documents=2)
+    signature = index.signature(BASE)
+    for document_id in ("a", "b", "c"):
+        index.add(document_id, signature)
+
+    assert len(index) == 2 and index.get("a") is None
+    assert [match["document_id"] for match in index.query(signature, exclude="b")] == ["c"]
+
+    index.remove("c")
+    assert index.query(signature, exclude="b") == []
+    assert all("c" not in ids for buckets in index._buckets for ids in buckets.values())
+
+def test_bands_catch_pairs_at_the_threshold():
+    index = NearDuplicateIndex(threshold=0.8, num_perm=128)
+    stats = index.stats()
+
+    assert stats["bands"] * stats["rows"] == 128
+    assert 1 - (1 - 0.8 ** stats["rows"]) ** stats["bands"] >= 0.95
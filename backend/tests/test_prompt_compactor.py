@@ -0,0 +1,25 @@
+"""
+Tests for CV prompt compaction
+"""
+
+from services.prompt_compactor import PromptCompactor, estimate_tokens
+
+def test_cv_within_budget_is_unchanged():
+    text = "Jane Doe\njane@example.com\n\nExperience\nAcme Corp, Engineer 2019 - 2023\n\nSkills\nPython, SQL"
+    result = PromptCompactor().compact_cv(text, budget_tokens=500)
+    assert result.text == text
+
+def test_long_single_line_section_is_cut_to_budget():
+    # PDF extraction often yields a whole section as one line
+    experience = " ".join(f"Delivered project {i} for a client in retail and logistics." for i in range(400))
+    text = f"Jane Doe\njane@example.com\n\nExperience\n{experience}\n\nSkills\n{'Python, ' * 300}SQL"
+    budget = 200
+
+    result = PromptCompactor().compact_cv(text, budget_tokens=budget)
+
+    assert len(result.text) <= budget * 4
+    assert result.tokens <= budget
+    assert result.text.startswith("Jane Doe\njane@example.com")
+    assert "Experience\nDelivered project 0" in result.text
+    assert "Skills\nPython" in result.text
+    assert estimate_tokens(text) > result.tokens
@@ -0,0 +1,82 @@
+"""
+Tests for sharing generated question sets between similar candidates
+"""
+
+import random
+
+from services import question_cache as question_cache_module
+from services.question_cache import QuestionSetCache
+
+QUESTIONS = ["How do you design an idempotent API?", "How would you shard a growing table?"]
+
+class FixedRandom(random.Random):
+    """random() always returns the same value, so reuse decisions are predictable"""
+
+    def __init__(self, value):
+        super().__init__(0)
+        self.value = value
+
+    def random(self):
+        return self.value
+
+def test_signature_ignores_wording_order_and_minor_skills():
+    cache = QuestionSetCache(top_skills=4)
+    first = cache.signature({
+        "role_fit": "Senior Backend Engineer",
+        "technologies": ["python", "Postgres", "Docker"],
+        "skills": ["Leadership", "K8s"]
+    })
+    second = cache.signature({
+        "role_fit": "Backend Developer",
+        "technologies": ["Docker", "PostgreSQL", "Python"],
+        "skills": ["leadership"]
+    })
+
+    assert first == second == "Backend Developer|docker,leadership,postgresql,python"
+
+def test_reuse_ratio_decides_between_reuse_and_regeneration():
+    reusing = QuestionSetCache(reuse_ratio=0.8, rng=FixedRandom(0.5))
+    regenerating = QuestionSetCache(reuse_ratio=0.8, rng=FixedRandom(0.9))
+    for cache in (reusing, regenerating):
+        assert cache.get("sig") is None
+        cache.put("sig", QUESTIONS)
+
+    assert reusing.get("sig") == QUESTIONS
+    assert regenerating.get("sig") is None
+    assert reusing.stats()["hits"] == 1 and reusing.stats()["misses"] == 1
+    assert regenerating.stats()["regenerations"] == 1 and regenerating.stats()["hit_rate"] == 0.0
+
+def test_variants_are_capped_and_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(question_cache_module.time, "time", lambda: now[0])
+    cache = QuestionSetCache(ttl=60, variants=2, reuse_ratio=1.0)
+    for i in range(3):
+        cache.put("sig", [f"Question {i}"])
+        now[0] += 10
+
+    seen = {tuple(cache.get("sig")) for _ in range(50)}
+    assert seen == {("Question 1",), ("Question 2",)}
+
+    now[0] += 60
+    assert cache.get("sig") is None
+    assert cache.stats()["signatures"] == 0
+
+def test_least_recently_used_signatures_are_evicted():
+    cache = QuestionSetCache(max_entries=2, reuse_ratio=1.0)
+    cache.put("a", QUESTIONS)
+    cache.put("b", QUESTIONS)
+    cache.get("a")
+    cache.put("c", QUESTIONS)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == QUESTIONS and cache.get("c") == QUESTIONS
+
+def test_sets_naming_the_candidate_are_not_shared():
+    cache = QuestionSetCache()
+    cv_data = {"candidate_name": "Jane Doe", "experience": [{"company": "Acme"}]}
+    cache.put("sig", ["Why did you leave Acme?"], cv_data)
+    cache.put("sig", ["Jane, what drew you to backend work?"], cv_data)
+
+    assert cache.stats()["signatures"] == 0
+    cache.put("sig", ["What drew you to backend work?"], cv_data)
+    assert cache.stats()["signatures"] == 1
@@ -0,0 +1,61 @@
+"""
+Tests for the concurrent report evaluation branches
+"""
+
+import asyncio
+import time
+
+from models.session import InterviewSession
+from services.report import ReportService
+
+def _session() -> InterviewSession:
+    return InterviewSession(
+        session_id="branches",
+        cv_data={"candidate_name": "Jane Doe", "role_fit": "Backend Developer"},
+        answers=[{"question": "Q1", "answer": "A1"}],
+        assessment={"type": "coding"},
+        assessment_result={"type": "coding", "solution": "def f(): pass"}
+    )
+
+def test_branches_run_concurrently_and_sections_are_emitted():
+    service = ReportService()
+
+    async def interview(answers, cv_data):
+        await asyncio.sleep(0.2)
+        return {"overall_interview_score": 4.0}
+
+    async def assessment(assessment, assessment_result):
+        await asyncio.sleep(0.2)
+        return {"completed": True, "overall_score": 4}
+
+    service._evaluate_interview_performance = interview
+    service._evaluate_assessment = assessment
+    emitted = []
+
+    started = time.perf_counter()
+    report = asyncio.run(service.generate_report(_session(), on_section=lambda name, section: emitted.append(name)))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.35
+    assert report["overall_evaluation"]["overall_score"] == 4.0
+    assert emitted[:2] == ["candidate_info", "cv_analysis"]
+    assert sorted(emitted[2:4]) == ["assessment_evaluation", "interview_evaluation"]
+    assert emitted[4:] == ["overall_evaluation", "recommendation", "next_steps"]
+
+def test_a_failing_branch_falls_back_without_affecting_the_other():
+    service = ReportService()
+
+    async def interview(answers, cv_data):
+        return {"overall_interview_score": 5.0}
+
+    async def assessment(assessment, assessment_result):
+        raise RuntimeError("evaluation provider down")
+
+    service._evaluate_interview_performance = interview
+    service._evaluate_assessment = assessment
+
+    report = asyncio.run(service.generate_report(_session()))
+
+    assert report["interview_evaluation"]["scores"]["overall_interview_score"] == 5.0
+    assert report["assessment_evaluation"]["scores"]["feedback"].startswith("Assessment evaluation timed out")
+    assert report["report_meta"]["fallback_sections"] == ["assessment_evaluation"]
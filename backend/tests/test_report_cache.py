@@ -0,0 +1,64 @@
+"""
+Tests for report reuse across regenerations
+"""
+
+import asyncio
+
+from models.session import InterviewSession
+from services.report import ReportService
+
+def _session() -> InterviewSession:
+    session = InterviewSession(
+        session_id="report-test",
+        cv_data={"candidate_name": "Jane Doe", "role_fit": "Backend Developer", "skills": ["Python"]},
+        answers=[{"question": "Q1", "answer": "A1"}],
+        assessment_result={"correctness_score": 4, "quality_score": 4, "efficiency_score": 4}
+    )
+    session.touch("cv", "interview", "assessment")
+    return session
+
+def _service(interview_branch) -> ReportService:
+    service = ReportService()
+    service._evaluate_interview_performance = interview_branch
+    return service
+
+async def _scores(answers, cv_data):
+    return {"communication_score": 4, "overall_interview_score": 4.0}
+
+async def _broken(answers, cv_data):
+    raise RuntimeError("provider unavailable")
+
+def test_unchanged_report_is_current_and_reused():
+    session = _session()
+    service = _service(_scores)
+    report = asyncio.run(service.generate_report(session))
+
+    assert report["report_meta"]["fallback_sections"] == []
+    assert service.is_current(report, session)
+    assert service._reusable_sections(session, report) == {"interview_evaluation", "assessment_evaluation"}
+
+def test_fallback_section_is_retried_on_next_report():
+    session = _session()
+    degraded = asyncio.run(_service(_broken).generate_report(session))
+
+    assert degraded["report_meta"]["fallback_sections"] == ["interview_evaluation"]
+    assert degraded["interview_evaluation"]["scores"]["overall_interview_score"] == 3.0
+
+    service = _service(_scores)
+    assert not service.is_current(degraded, session)
+    assert service._reusable_sections(session, degraded) == {"assessment_evaluation"}
+
+    recovered = asyncio.run(service.generate_report(session, degraded))
+    assert recovered["interview_evaluation"]["scores"]["overall_interview_score"] == 4.0
+    assert recovered["report_meta"]["reused_sections"] == ["assessment_evaluation"]
+    assert service.is_current(recovered, session)
+
+def test_timed_out_branch_counts_as_fallback():
+    async def slow(answers, cv_data):
+        await asyncio.sleep(1)
+
+    service = _service(slow)
+    service.branch_timeout = 0.01
+    report = asyncio.run(service.generate_report(_session()))
+
+    assert report["report_meta"]["fallback_sections"] == ["interview_evaluation"]
@@ -0,0 +1,217 @@
+"""
+Tests for the session stores and for request handlers writing through update()
+"""
+
+import asyncio
+import time
+
+import pytest
+from redis.exceptions import WatchError
+
+from models.session import InterviewSession
+from database.session_store import InMemorySessionStore, RedisSessionStore
+
+class FakeRedis:
+    """The slice of redis.asyncio the store uses, with WATCH conflicts on concurrent writes"""
+
+    def __init__(self):
+        self.data = {}
+        self.versions = {}
+        self.on_watched_read = None  # simulates another worker writing between WATCH and EXEC
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.versions[key] = self.versions.get(key, 0) + 1
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def aclose(self):
+        pass
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queue = []
+        self.watched = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.reset()
+
+    async def watch(self, key):
+        self.watched[key] = self.redis.versions.get(key, 0)
+
+    def get(self, key):
+        if self.watched:
+            return self._read(key)
+        self.queue.append(("get", key))
+
+    async def _read(self, key):
+        if self.redis.on_watched_read:
+            await self.redis.on_watched_read(key)
+        return self.redis.data.get(key)
+
+    def multi(self):
+        pass
+
+    def set(self, key, value, ex=None):
+        self.queue.append(("set", key, value))
+
+    def expire(self, key, seconds):
+        self.queue.append(("expire", key))
+
+    def exists(self, key):
+        self.queue.append(("exists", key))
+
+    async def execute(self):
+        if any(self.redis.versions.get(key, 0) != version for key, version in self.watched.items()):
+            raise WatchError()
+        results = []
+        for operation, key, *value in self.queue:
+            if operation == "set":
+                await self.redis.set(key, value[0])
+            results.append({
+                "get": lambda: self.redis.data.get(key),
+                "exists": lambda: int(key in self.redis.data),
+            }.get(operation, lambda: True)())
+        self.queue = []
+        return results
+
+    async def reset(self):
+        self.queue = []
+        self.watched = {}
+
+def _redis_store(**kwargs) -> RedisSessionStore:
+    store = RedisSessionStore(url="redis://localhost:6379/0", idle_ttl=60, **kwargs)
+    store.redis = FakeRedis()
+    return store
+
+def test_memory_store_evicts_least_recently_used():
+    evicted = []
+    store = InMemorySessionStore(max_sessions=2, on_evict=evicted.append)
+
+    async def scenario():
+        for session_id in ("a", "b"):
+            await store.save(InterviewSession(session_id=session_id))
+        await store.get("a")
+        await store.save(InterviewSession(session_id="c"))
+        return [await store.get(session_id) is not None for session_id in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == [True, False, True]
+    assert evicted == ["b"]
+
+def test_memory_store_expires_idle_sessions():
+    evicted = []
+    store = InMemorySessionStore(idle_ttl=0.05, on_evict=evicted.append)
+
+    async def scenario():
+        await store.save(InterviewSession(session_id="idle"))
+        await store.save(InterviewSession(session_id="read"))
+        time.sleep(0.1)
+        missing = await store.get("read")
+        return missing, store.sweep()
+
+    assert asyncio.run(scenario()) == (None, 1)
+    assert sorted(evicted) == ["idle", "read"]
+    assert len(store) == 0
+
+def test_memory_store_update_skips_write_when_mutation_declines():
+    store = InMemorySessionStore()
+
+    async def scenario():
+        await store.save(InterviewSession(session_id="s", status="cv_uploaded"))
+        skipped = (await store.update("s", lambda session: False)).status
+        changed = (await store.update("s", lambda session: setattr(session, "status", "interview_active"))).status
+        return skipped, changed, await store.update("missing", lambda session: None)
+
+    assert asyncio.run(scenario()) == ("cv_uploaded", "interview_active", None)
+
+def test_redis_update_retries_on_a_concurrent_write():
+    store = _redis_store()
+    conflicts = {"left": 2}
+
+    async def another_worker_answers(key):
+        if conflicts["left"]:
+            conflicts["left"] -= 1
+            session = InterviewSession.model_validate_json(store.redis.data[key])
+            session.answers = (session.answers or []) + [{"answer": f"from elsewhere {conflicts['left']}"}]
+            await store.redis.set(key, session.model_dump_json())
+
+    def mark_active(session):
+        session.status = "interview_active"
+
+    async def scenario():
+        await store.save(InterviewSession(session_id="s"))
+        store.redis.on_watched_read = another_worker_answers
+        await store.update("s", mark_active)
+        return await store.get("s")
+
+    session = asyncio.run(scenario())
+    assert session.status == "interview_active"
+    assert [answer["answer"] for answer in session.answers] == ["from elsewhere 1", "from elsewhere 0"]
+
+def test_redis_update_gives_up_when_the_session_keeps_changing():
+    store = _redis_store()
+
+    async def always_conflict(key):
+        await store.redis.set(key, store.redis.data[key])
+
+    async def scenario():
+        await store.save(InterviewSession(session_id="s"))
+        store.redis.on_watched_read = always_conflict
+        await store.update("s", lambda session: None)
+
+    with pytest.raises(RuntimeError, match="kept changing"):
+        asyncio.run(scenario())
+
+def test_redis_sweep_reports_expired_sessions():
+    evicted = []
+    store = _redis_store(on_evict=evicted.append)
+
+    async def scenario():
+        for session_id in ("gone", "live"):
+            await store.save(InterviewSession(session_id=session_id))
+        del store.redis.data["session:gone"]
+        return await store.sweep(), await store.sweep()
+
+    assert asyncio.run(scenario()) == (1, 0)
+    assert evicted == ["gone"]
+
+@pytest.mark.parametrize("answer_arrives", [False, True])
+def test_report_is_stored_only_if_the_session_did_not_change(monkeypatch, answer_arrives):
+    import app
+
+    async def generate_report(session, previous_report=None, on_section=None):
+        built_from = session.version
+        if answer_arrives:
+            await app.update_session(session.session_id, lambda latest: latest.touch("interview"))
+        return {"report_meta": {"session_version": built_from}}
+
+    async def save_report(session_id, report):
+        return report
+
+    monkeypatch.setattr(app.report_service, "generate_report", generate_report)
+    monkeypatch.setattr(app.db, "save_report", save_report)
+
+    async def scenario():
+        session = InterviewSession(session_id=f"report-{answer_arrives}", status="assessment_complete")
+        await app.session_store.save(session)
+        report = await app.build_report(session.session_id)
+        stored = await app.session_store.get(session.session_id)
+        await app.session_store.delete(session.session_id)
+        return report, stored
+
+    report, stored = asyncio.run(scenario())
+    assert report["report_meta"]["session_version"] == 0
+    if answer_arrives:
+        assert stored.final_report is None
+        assert stored.status == "assessment_complete"
+    else:
+        assert stored.final_report == report
+        assert stored.status == "completed"
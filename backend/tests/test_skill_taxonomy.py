@@ -0,0 +1,43 @@
+"""
+Tests for the canonical skill taxonomy
+"""
+
+import pytest
+
+from services.skill_taxonomy import skill_taxonomy
+
+def test_aliases_and_versions_resolve_to_one_skill():
+    assert skill_taxonomy.canonicalize(["ReactJS", "react.js", "React 18", "golang", "Python 3.11"]) == [
+        "React", "Go", "Python"
+    ]
+
+def test_unknown_entries_are_kept_as_written():
+    assert skill_taxonomy.canonicalize(["Cobol-ish DSL", "", None, "python"]) == ["Cobol-ish DSL", "Python"]
+    assert skill_taxonomy.categorize(["Docker", "Haskell-like DSL"]) == {
+        "devops": ["Docker"], "other": ["Haskell-like DSL"]
+    }
+
+def test_canonical_role():
+    assert skill_taxonomy.canonical_role("Senior React Frontend Developer") == "Frontend Developer"
+    assert skill_taxonomy.canonical_role("Full-Stack Engineer") == "Full Stack Developer"
+    assert skill_taxonomy.canonical_role("Chief Happiness Officer") == "General"
+
+@pytest.mark.parametrize("technologies", [
+    ["SQL", "Jira", "REST APIs"],      # product manager
+    ["Excel", "Tableau", "SQL"],       # analyst
+    ["Figma", "HTML", "CSS"],          # designer
+    ["HTML"],
+    ["GraphQL", "iOS", "Android"],
+    [],
+])
+def test_non_coding_profiles_get_no_coding_technology(technologies):
+    assert skill_taxonomy.primary_coding_technology(technologies) is None
+
+@pytest.mark.parametrize("technologies, expected", [
+    (["HTML", "CSS", "React"], "React"),
+    (["REST APIs", "SQL", "python3"], "Python"),
+    (["Jira", "Spring Boot"], "Spring"),
+    (["Kotlin", "Android"], "Kotlin"),
+])
+def test_first_language_or_framework_is_chosen(technologies, expected):
+    assert skill_taxonomy.primary_coding_technology(technologies) == expected
@@ -0,0 +1,78 @@
+"""
+Tests for parsing streamed model output before it is complete
+"""
+
+import asyncio
+import json
+
+from services.cv_parser import CVParseProgress
+from services.streaming_json import IncrementalJSONArray, IncrementalJSONObject
+
+CV_JSON = json.dumps({
+    "role_fit": "Backend Developer",
+    "skills": ["Python", "System Design"],
+    "summary": "Built {fast}, [reliable] APIs, \"at scale\", with a \\ backslash",
+    "experience": [{"company": "Acme, Inc.", "years": 3}],
+})
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def test_object_members_complete_as_their_text_arrives():
+    parser = IncrementalJSONObject()
+    arrivals = []
+    for chunk in _chunks("```json\n" + CV_JSON + "\n```", 5):
+        completed = parser.feed(chunk)
+        if completed:
+            arrivals.append(list(completed))
+
+    assert arrivals == [["role_fit"], ["skills"], ["summary"], ["experience"]]
+    assert parser.complete
+    assert parser.fields == json.loads(CV_JSON)
+
+def test_member_is_not_reported_before_its_separator():
+    parser = IncrementalJSONObject()
+    assert parser.feed('{"role_fit": "Backend Developer"') == {}
+    assert parser.feed(', "skills": ["Py') == {"role_fit": "Backend Developer"}
+    assert parser.feed('thon"]}') == {"skills": ["Python"]}
+
+def test_array_elements_complete_one_by_one():
+    parser = IncrementalJSONArray()
+    questions = ["Tell me, briefly, about [yourself].", "Why \"this\" role?", "What {excites} you?"]
+    seen = []
+    for chunk in _chunks(json.dumps(questions), 3):
+        seen.extend(parser.feed(chunk))
+
+    assert seen == questions
+    assert parser.complete
+
+def test_malformed_member_is_skipped():
+    parser = IncrementalJSONArray()
+    assert parser.feed('["ok", nope, "also ok"]') == ["ok", "also ok"]
+
+def test_progress_releases_waiters_as_soon_as_their_fields_arrive():
+    async def scenario():
+        progress = CVParseProgress()
+        waiter = asyncio.create_task(progress.wait_for("role_fit", "skills"))
+        await progress.update({"role_fit": "Backend Developer"})
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        await progress.update({"skills": ["Python"]})
+        fields = await asyncio.wait_for(waiter, timeout=1)
+        assert not progress.done
+        return fields
+
+    assert asyncio.run(scenario()) == {"role_fit": "Backend Developer", "skills": ["Python"]}
+
+def test_progress_releases_waiters_when_the_parse_ends_without_their_fields():
+    events = []
+
+    async def scenario():
+        progress = CVParseProgress(on_event=lambda event, data: events.append(event))
+        waiter = asyncio.create_task(progress.wait_for("technologies"))
+        await progress.update({"role_fit": "Designer"})
+        await progress.finish({"role_fit": "Designer", "error": "model output was not JSON"})
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(scenario())["error"] == "model output was not JSON"
+    assert events == ["cv_field"]
@@ -0,0 +1,55 @@
+"""
+Tests for per-session background task tracking
+"""
+
+import asyncio
+
+from services.task_registry import SessionTaskRegistry
+
+def test_wait_covers_only_matching_tasks_and_survives_failures():
+    registry = SessionTaskRegistry()
+    finished = []
+
+    async def work(name, delay, fail=False):
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError(name)
+        finished.append(name)
+
+    async def scenario():
+        registry.spawn("s", "score:0", work("score:0", 0.01))
+        registry.spawn("s", "score:1", work("score:1", 0.02, fail=True))
+        slow = registry.spawn("s", "assessment", work("assessment", 0.5))
+        await registry.wait("s", prefix="score:")
+        waited_for = list(finished)
+        assert not slow.done()
+        registry.discard("s")
+        await asyncio.sleep(0)
+        return waited_for, slow.cancelled()
+
+    assert asyncio.run(scenario()) == (["score:0"], True)
+
+def test_finished_tasks_are_forgotten_and_a_respawn_replaces_the_old_one():
+    registry = SessionTaskRegistry()
+
+    async def scenario():
+        first = registry.spawn("s", "enrich", asyncio.sleep(0.05))
+        second = registry.spawn("s", "enrich", asyncio.sleep(0))
+        assert registry.get("s", "enrich") is second
+        await second
+        await first
+        return registry.get("s", "enrich")
+
+    assert asyncio.run(scenario()) is None
+
+def test_a_dropped_waiter_does_not_cancel_the_shared_task():
+    registry = SessionTaskRegistry()
+
+    async def scenario():
+        task = registry.spawn("s", "enrich", asyncio.sleep(0.05, result="profile"))
+        waiter = asyncio.create_task(registry.wait("s", prefix="enrich"))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        return await task
+
+    assert asyncio.run(scenario()) == "profile"
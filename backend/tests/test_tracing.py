@@ -0,0 +1,57 @@
+"""
+Tests for request stage tracing and the slow-request log
+"""
+
+import asyncio
+
+from models.session import InterviewSession
+from database.write_behind import WriteBehindPersister
+from services.metrics import track_call
+from services.tracing import SlowRequestLog, Span, _current_span, server_timing, span
+
+def test_server_timing_sums_stages_by_name():
+    root = Span("GET /report")
+    token = _current_span.set(root)
+    try:
+        for _ in range(2):
+            with span("llm:report"):
+                pass
+        with span("session:save"):
+            pass
+    finally:
+        _current_span.reset(token)
+
+    header = server_timing(root)
+    assert header.startswith('llm-report;desc="llm:report";dur=')
+    assert 'session-save;desc="session:save"' in header
+    assert header.count("llm-report") == 1
+    assert ", total;dur=" in header
+
+def test_spans_after_the_response_are_detached():
+    root = Span("POST /upload-cv")
+    root.finish()
+    token = _current_span.set(root)
+    try:
+        with span("llm:cv") as stage:
+            assert stage is None
+    finally:
+        _current_span.reset(token)
+    assert root.children == []
+
+def test_write_behind_flush_db_stages_reach_the_slow_log(monkeypatch):
+    log = SlowRequestLog(threshold_ms=0, size=10)
+    monkeypatch.setattr("services.tracing.slow_requests", log)
+
+    class Database:
+        async def update_session(self, session_id, session_data, raise_errors=False):
+            async with track_call("supabase", "db.update_session", "interview_sessions", "db:update"):
+                await asyncio.sleep(0)
+
+    persister = WriteBehindPersister(Database(), flush_interval=60)
+    persister.mark_dirty(InterviewSession(session_id="a"))
+    persister.mark_dirty(InterviewSession(session_id="b"))
+    asyncio.run(persister.flush())
+
+    [entry] = log.entries()
+    assert (entry["method"], entry["path"]) == ("BACKGROUND", "write-behind flush")
+    assert [child["name"] for child in entry["spans"]["children"]] == ["db:update", "db:update"]
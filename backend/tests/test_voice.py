@@ -0,0 +1,73 @@
+"""
+Tests for streaming text-to-speech through the pooled ElevenLabs client
+"""
+
+import asyncio
+
+import httpx
+
+from services.tts_cache import TTSAudioCache
+from services.voice import VoiceService
+
+AUDIO = [b"ID3", b"frame-1", b"frame-2"]
+
+def _service(tmp_path, handler) -> VoiceService:
+    service = VoiceService()
+    service.cache = TTSAudioCache(cache_dir=str(tmp_path), max_bytes=1024 * 1024)
+    service.http = httpx.AsyncClient(base_url=service.elevenlabs_url, transport=httpx.MockTransport(handler))
+    return service
+
+def _streaming(requests):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=_chunks(), headers={"Content-Type": "audio/mpeg"})
+
+    async def _chunks():
+        for chunk in AUDIO:
+            yield chunk
+
+    return handler
+
+def test_audio_is_relayed_in_chunks_and_cached_once_complete(tmp_path):
+    requests = []
+    service = _service(tmp_path, _streaming(requests))
+
+    async def scenario():
+        stream = await service.text_to_speech("Tell me about yourself.")
+        received = [chunk async for chunk in stream]
+        await service.close()
+        return received
+
+    assert asyncio.run(scenario()) == AUDIO
+    assert requests[0].url.path == f"/v1/text-to-speech/{service.voice_id}/stream"
+
+    path = service.cached_audio_path("Tell me  about yourself. ")
+    with open(path, "rb") as f:
+        assert f.read() == b"".join(AUDIO)
+
+def test_abandoned_stream_is_not_cached(tmp_path):
+    service = _service(tmp_path, _streaming([]))
+
+    async def scenario():
+        stream = await service.text_to_speech("Why this role?")
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await service.close()
+
+    asyncio.run(scenario())
+    assert service.cached_audio_path("Why this role?") is None
+
+def test_provider_error_is_reported_before_any_audio(tmp_path):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(401, json={"detail": "invalid api key"})
+
+    service = _service(tmp_path, handler)
+
+    async def scenario():
+        stream = await service.text_to_speech("Hello")
+        await service.close()
+        return stream
+
+    assert asyncio.run(scenario()) is None
+    assert service.cached_audio_path("Hello") is None
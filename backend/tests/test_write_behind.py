@@ -0,0 +1,111 @@
+"""
+Tests for the write-behind session persister
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from models.session import InterviewSession
+from database.supabase_client import SupabaseClient
+from database.write_behind import WriteBehindPersister
+
+class FakeDatabase:
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.calls = []
+        self.in_flight = None  # awaited inside a write, to mark sessions while it runs
+
+    async def create_session(self, session_data, raise_errors=False):
+        await self._call("create", session_data)
+
+    async def update_session(self, session_id, session_data, raise_errors=False):
+        await self._call("update", session_data)
+
+    async def _call(self, operation, session_data):
+        if self.in_flight:
+            await self.in_flight()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.calls.append((operation, session_data["session_id"], session_data["status"]))
+
+def _session(status="initialized", version=0) -> InterviewSession:
+    return InterviewSession(session_id="s", status=status, version=version)
+
+def test_mutations_in_one_interval_cost_one_write():
+    db = FakeDatabase()
+    persister = WriteBehindPersister(db, flush_interval=60)
+    persister.mark_new(_session())
+    persister.mark_dirty(_session("cv_uploaded", 1))
+    persister.mark_dirty(_session("interview_active", 2))
+
+    asyncio.run(persister.flush())
+
+    assert db.calls == [("create", "s", "interview_active")]
+    assert persister.coalesced == 2
+
+def test_failed_insert_is_retried_as_an_insert():
+    db = FakeDatabase(failures=1)
+    persister = WriteBehindPersister(db, flush_interval=60)
+    persister.mark_new(_session())
+
+    async def scenario():
+        await persister.flush()
+        assert db.calls == []
+        await persister.flush()
+        await persister.flush()
+
+    asyncio.run(scenario())
+    assert db.calls == [("create", "s", "initialized")]
+    assert persister.failures == 1
+
+def test_failed_update_keeps_a_newer_copy_marked_during_the_write():
+    db = FakeDatabase(failures=1)
+    persister = WriteBehindPersister(db, flush_interval=60)
+    persister.mark_dirty(_session("cv_uploaded", 1))
+
+    async def answer_arrives():
+        db.in_flight = None
+        persister.mark_dirty(_session("interview_active", 2))
+
+    db.in_flight = answer_arrives
+
+    async def scenario():
+        await persister.flush()
+        await persister.flush()
+
+    asyncio.run(scenario())
+    assert db.calls == [("update", "s", "interview_active")]
+
+def test_older_copy_never_replaces_a_newer_one():
+    db = FakeDatabase()
+    persister = WriteBehindPersister(db, flush_interval=60)
+    persister.mark_dirty(_session("interview_active", 3))
+    persister.mark_dirty(_session("cv_uploaded", 2))
+
+    asyncio.run(persister.flush())
+    assert db.calls == [("update", "s", "interview_active")]
+
+def test_database_update_is_conditional_on_version():
+    filters = []
+
+    class Query:
+        def update(self, values):
+            return self
+
+        def eq(self, column, value):
+            filters.append(("eq", column, value))
+            return self
+
+        def lte(self, column, value):
+            filters.append(("lte", column, value))
+            return self
+
+        def execute(self):
+            return SimpleNamespace(data=[])
+
+    client = SupabaseClient()
+    client.client = SimpleNamespace(table=lambda name: Query())
+
+    asyncio.run(client.update_session("s", _session("interview_active", 4).model_dump()))
+    assert filters == [("eq", "session_id", "s"), ("lte", "version", 4)]
@@ -22,10 +22,18 @@ const Interview = ({ sessionId, cvData, onInterviewComplete }) => {
   }, []);
 
   const loadFirstQuestion = async () => {
+    let pending = false;
     try {
       setLoading(true);
       const response = await apiClient.getCurrentQuestion(sessionId);
       
+      if (response.status === 'pending') {
+        // Questions are still being generated from the CV; check again shortly
+        pending = true;
+        setTimeout(loadFirstQuestion, 1500);
+        return;
+      }
+      
       if (response.status === 'interview_complete') {
         setInterviewComplete(true);
         onInterviewComplete({ answers, totalAnswers: answers.length });
@@ -49,7 +57,9 @@ const Interview = ({ sessionId, cvData, onInterviewComplete }) => {
       setError('Failed to load questions. Please try again.');
       console.error('Question loading error:', err);
     } finally {
-      setLoading(false);
+      if (!pending) {
+        setLoading(false);
+      }
     }
   };
 